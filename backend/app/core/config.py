@@ -24,6 +24,9 @@ class AppConfig(BaseModel):
     upload_dir: Path = Field(default_factory=lambda: Path("uploads"))
     images_dir: Path = Field(default_factory=lambda: Path("output/immagini"))
     output_dir: Path = Field(default_factory=lambda: Path("output/testo_wiki"))
+    cache_dir: Path = Field(default_factory=lambda: Path("output/cache"))
+    profiles_dir: Path = Field(default_factory=lambda: Path("output/profiles"))
+    progress_dir: Path = Field(default_factory=lambda: Path("output/progress"))
 
     # File restrictions
     allowed_extensions: set[str] = Field(default={".pdf", ".docx", ".odt", ".rtf"})
@@ -36,6 +39,57 @@ class AppConfig(BaseModel):
     api_prefix: str = Field(default="/api")
     cors_origins: list[str] = Field(default=["*"])
 
+    # Execution backend
+    # "pool": I/O steps run in a thread pool, extraction/rendering in a process pool
+    # "sync": everything runs inline on the event loop (debugging only)
+    execution_mode: Literal["pool", "sync"] = Field(default="pool")
+    io_pool_workers: int = Field(default=8, ge=1)
+    cpu_pool_workers: int = Field(default=2, ge=1)
+
+    # Import the extractors (PyMuPDF, python-docx, lxml, striprtf) at start-up
+    # instead of on the first conversion of each format
+    preload_extractors: bool = Field(default=False)
+
+    # DOCX engine: "stream" parses word/document.xml once in body order,
+    # "python-docx" loads the whole object model (tables after the text)
+    docx_engine: Literal["stream", "python-docx"] = Field(default="stream")
+
+    # Page-parallel PDF extraction (1 disables it)
+    pdf_parallel_workers: int = Field(default=2, ge=1)
+    pdf_min_pages_per_shard: int = Field(default=50, ge=1)
+    # Pages outside a page selection sampled for the base font size
+    pdf_font_sample_pages: int = Field(default=20, ge=0)
+
+    # Asynchronous job queue
+    job_workers: int = Field(default=2, ge=1)
+    job_queue_size: int = Field(default=100, ge=1)
+    job_history_size: int = Field(default=1000, ge=1)
+    # Minimum time between two progress updates of a job
+    progress_interval_ms: int = Field(default=500, ge=10)
+
+    # Conversion cache (keyed by upload content hash)
+    cache_enabled: bool = Field(default=True)
+    cache_max_mb: int = Field(default=1024, ge=1)
+    cache_max_entries: int = Field(default=1000, ge=1)
+
+    # Retention of extracted images and MediaWiki outputs (0 disables a policy)
+    retention_max_age_hours: int = Field(default=0, ge=0)
+    retention_max_mb: int = Field(default=0, ge=0)
+    retention_interval_seconds: int = Field(default=600, ge=1)
+    retention_batch_size: int = Field(default=50, ge=1)
+
+    # Batch conversion (many files or one ZIP archive per request)
+    batch_max_files: int = Field(default=50, ge=1)
+    batch_max_total_mb: int = Field(default=200, ge=1)
+    batch_concurrency: int = Field(default=2, ge=1)
+
+    # Per-request profiling of /api/convert (off: no overhead)
+    # A request is profiled when profiling_enabled is set, or when it carries
+    # an X-Profile-Token header equal to profiling_token
+    profiling_enabled: bool = Field(default=False)
+    profiling_token: str | None = Field(default=None)
+    profile_top_functions: int = Field(default=30, ge=1)
+
     def get_absolute_path(self, relative_path: Path) -> Path:
         """Convert relative path to absolute based on base_dir.
 
@@ -64,8 +118,13 @@ class AppConfig(BaseModel):
         upload_path = self.get_absolute_path(self.upload_dir)
         upload_path.mkdir(parents=True, exist_ok=True)
 
-        # Images and output dirs are relative to project root
-        for dir_path in [self.images_dir, self.output_dir]:
+        # Images, output, cache and profile dirs are relative to project root
+        for dir_path in [
+            self.images_dir,
+            self.output_dir,
+            self.cache_dir,
+            self.profiles_dir,
+        ]:
             abs_path = self.get_project_path(dir_path)
             abs_path.mkdir(parents=True, exist_ok=True)
 
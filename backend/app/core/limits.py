@@ -0,0 +1,106 @@
+"""Request body size limits for upload endpoints.
+
+Uploads are rejected with 413 before the multipart body is parsed: requests
+announcing a larger ``Content-Length`` are refused without reading the body,
+and chunked requests are cut off as soon as the received bytes exceed the
+limit. A cut-off request is always answered with the 413 by the middleware,
+whether the app responded to the truncated body or failed on it.
+"""
+
+import json
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Allowance for multipart boundaries and part headers around the file content
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """ASGI middleware enforcing per-path request body limits on POST."""
+
+    def __init__(self, app: ASGIApp, limits: dict[str, int]) -> None:
+        """Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            limits: Mapping of request path to maximum body size in bytes
+        """
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process a request, rejecting bodies above the path's limit."""
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.limits.get(scope["path"].rstrip("/"))
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    too_large = int(value) > limit
+                except ValueError:
+                    too_large = False
+                if too_large:
+                    await _send_too_large(send, limit)
+                    return
+
+        received = 0
+        exceeded = False
+        rejected = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Stop feeding the body; the app sees a disconnect
+                    exceeded = True
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal rejected
+            if not exceeded:
+                await send(message)
+            elif not rejected and message["type"] == "http.response.start":
+                # Replace whatever the app answered with a 413
+                rejected = True
+                await _send_too_large(send, limit)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            # The app may fail on the cut-off body (e.g. ClientDisconnect)
+            if not exceeded:
+                raise
+        if exceeded and not rejected:
+            await _send_too_large(send, limit)
+
+
+async def _send_too_large(send: Send, limit: int) -> None:
+    """Send a 413 JSON response.
+
+    Args:
+        send: ASGI send callable
+        limit: Body size limit in bytes
+    """
+    max_mb = limit // (1024 * 1024)
+    body = json.dumps({"detail": f"File too large. Maximum size: {max_mb}MB"}).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
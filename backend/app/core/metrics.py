@@ -0,0 +1,300 @@
+"""Prometheus-style metrics.
+
+A minimal in-process registry of counters, gauges and histograms rendered
+in the Prometheus text exposition format by ``GET /api/metrics``. Updates
+are a dictionary lookup and an addition under a lock, so instrumenting the
+request path and the conversion pipeline costs next to nothing.
+
+Conversions run in worker processes: they time their own stages and hand
+the figures back with their result (see ``ConversionStats``), and the
+pipeline records them here, in the server process.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Default histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_lock = threading.Lock()
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    """Render a label set as ``{name="value",...}`` (empty without labels)."""
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values, strict=True):
+        escaped = value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value, without a trailing ``.0`` for whole numbers."""
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if value == int(value) else repr(value)
+
+
+class _Metric:
+    """Base class of the metric types: name, help text and label names."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        """Initialize and register the metric.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labels: Label names, passed as keyword arguments on update
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        REGISTRY.append(self)
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        """Return the label values in declaration order."""
+        return tuple(labels[name] for name in self.labels)
+
+    def samples(self) -> list[str]:
+        """Return the exposition lines of the metric samples."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Return the metric in the Prometheus text format."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing value."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        """Initialize the counter (see ``_Metric``)."""
+        super().__init__(name, documentation, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Add ``amount`` to the counter of the given label values."""
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> list[str]:
+        """Return one line per label set."""
+        with _lock:
+            values = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        """Initialize the gauge (see ``_Metric``)."""
+        super().__init__(name, documentation, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the gauge of the given label values."""
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Add ``amount`` (possibly negative) to the gauge."""
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        """Subtract ``amount`` from the gauge."""
+        self.inc(-amount, **labels)
+
+    samples = Counter.samples
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        """Initialize the histogram.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labels: Label names, passed as keyword arguments on update
+            buckets: Sorted bucket upper bounds (``+Inf`` is implicit)
+        """
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+        # Per label set: [count per bucket (+Inf last), sum]
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation for the given label values."""
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with _lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def samples(self) -> list[str]:
+        """Return the cumulative buckets, sum and count of each label set."""
+        with _lock:
+            values = [
+                (key, list(counts), total[0])
+                for key, (counts, total) in self._values.items()
+            ]
+
+        lines = []
+        bounds = (*self.buckets, float("inf"))
+        for key, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(bounds, counts, strict=True):
+                cumulative += count
+                bucket_labels = _format_labels(
+                    (*self.labels, "le"), (*key, _format_value(bound))
+                )
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+# All metrics, in exposition order
+REGISTRY: list[_Metric] = []
+
+# HTTP layer
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency until the response is fully sent",
+    ("method", "route", "status"),
+)
+
+# Conversion pipeline
+CONVERSIONS = Counter(
+    "conversions_total",
+    "Finished conversions by outcome (done, cached or error)",
+    ("format", "outcome"),
+)
+EXTRACT_SECONDS = Histogram(
+    "conversion_extract_seconds",
+    "Time spent in the document extractor per conversion",
+    ("format",),
+)
+RENDER_SECONDS = Histogram(
+    "conversion_render_seconds",
+    "Time spent rendering and writing MediaWiki text per conversion",
+    ("format",),
+)
+PAGES = Counter("conversion_pages_total", "PDF pages processed", ("format",))
+IMAGES = Counter("conversion_images_total", "Images extracted", ("format",))
+INPUT_BYTES = Counter(
+    "conversion_input_bytes_total", "Uploaded document bytes converted", ("format",)
+)
+OUTPUT_BYTES = Counter(
+    "conversion_output_bytes_total", "MediaWiki text bytes produced", ("format",)
+)
+IMAGE_WRITES_SAVED = Counter(
+    "conversion_image_writes_saved_total",
+    "Image writes avoided by reusing an already saved PDF image (xref memo)",
+    ("format",),
+)
+IMAGE_BYTES_SAVED = Counter(
+    "conversion_image_bytes_saved_total",
+    "Image bytes not written thanks to the PDF xref memo",
+    ("format",),
+)
+IN_PROGRESS = Gauge("conversions_in_progress", "Conversions currently running")
+
+# Job queue, sampled when the metrics are scraped
+JOB_QUEUE_DEPTH = Gauge("job_queue_depth", "Jobs waiting for a worker")
+JOBS_RUNNING = Gauge("jobs_running", "Jobs being converted by a worker")
+
+# Retention of images and outputs
+RETENTION_FREED_BYTES = Counter(
+    "retention_freed_bytes_total",
+    "Bytes freed by retention sweeps (images, output or profile)",
+    ("kind",),
+)
+
+
+def render_metrics() -> str:
+    """Return all registered metrics in the Prometheus text format.
+
+    Returns:
+        Exposition text, terminated by a newline
+    """
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware observing the latency of every HTTP request.
+
+    Requests are labelled with the route template (e.g. ``/api/jobs/{job_id}``)
+    rather than the raw path, so the number of label sets stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI application
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process a request and record its duration."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def recording_send(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, recording_send)
+        finally:
+            route = scope.get("route")
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status),
+            )
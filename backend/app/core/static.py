@@ -0,0 +1,29 @@
+"""Static file helpers.
+
+Provides a StaticFiles variant for content-addressed files that never
+change once written, so browsers and proxies can cache them indefinitely.
+"""
+
+import os
+
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """StaticFiles that marks every served file as immutable."""
+
+    cache_control = "public, max-age=31536000, immutable"
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike[str],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        """Serve a file with a long-lived immutable Cache-Control header."""
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers["Cache-Control"] = self.cache_control
+        return response
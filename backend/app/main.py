@@ -3,8 +3,9 @@
 This is the entry point for the PDF/Word to MediaWiki conversion API.
 """
 
-import os
 import sys
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -13,7 +14,14 @@ from fastapi.responses import FileResponse, HTMLResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.core.config import config
-from app.routers import convert, files, health
+from app.core.limits import MULTIPART_OVERHEAD_BYTES, UploadSizeLimitMiddleware
+from app.core.metrics import RequestMetricsMiddleware
+from app.core.static import ImmutableStaticFiles
+from app.routers import admin, convert, files, health, jobs, metrics
+from app.services.executor import shutdown_executors
+from app.services.jobs import job_manager
+from app.services.pipeline import warm_up_extractors
+from app.services.retention import retention_manager
 
 
 def get_base_path() -> Path:
@@ -34,6 +42,22 @@ def get_base_path() -> Path:
         return Path(__file__).parent.parent.parent
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Application lifespan: warm-up and retention, then stop workers on shutdown.
+
+    Args:
+        app: FastAPI application instance
+    """
+    if config.preload_extractors:
+        await warm_up_extractors()
+    retention_manager.start()
+    yield
+    await retention_manager.shutdown()
+    await job_manager.shutdown()
+    shutdown_executors()
+
+
 # Create FastAPI application
 app = FastAPI(
     title="PDF/Word → MediaWiki API",
@@ -41,6 +65,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",  # Swagger UI
     redoc_url="/redoc",  # ReDoc
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -52,50 +77,51 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Reject oversized uploads before their body is read
+upload_limit = config.max_file_size_mb * 1024 * 1024 + MULTIPART_OVERHEAD_BYTES
+batch_limit = (
+    config.batch_max_total_mb * 1024 * 1024
+    + MULTIPART_OVERHEAD_BYTES * config.batch_max_files
+)
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    limits={
+        f"{config.api_prefix}/convert": upload_limit,
+        f"{config.api_prefix}/convert/batch": batch_limit,
+        f"{config.api_prefix}/jobs": upload_limit,
+    },
+)
+
+# Observe the latency of every request, including rejected uploads
+app.add_middleware(RequestMetricsMiddleware)
+
 # Include routers
 app.include_router(health.router, prefix=config.api_prefix)
 app.include_router(convert.router, prefix=config.api_prefix)
 app.include_router(files.router, prefix=config.api_prefix)
+app.include_router(jobs.router, prefix=config.api_prefix)
+app.include_router(admin.router, prefix=config.api_prefix)
+app.include_router(metrics.router, prefix=config.api_prefix)
 
 # Mount static files for images (in project root)
+# Image names contain their content hash, so they can be cached forever
 images_path = str(config.get_project_path(config.images_dir))
-app.mount("/immagini", StaticFiles(directory=images_path), name="immagini")
+app.mount("/immagini", ImmutableStaticFiles(directory=images_path), name="immagini")
 
 # Get path to Angular frontend build (for production/exe mode)
 # Use get_base_path() to handle both normal and PyInstaller execution
 base_path = get_base_path()
 frontend_build_path = base_path / "frontend" / "dist" / "pdf-word-mediawiki" / "browser"
 
-# Debug logging for frontend path
-print(f"[STARTUP] Base path: {base_path}")
-print(f"[STARTUP] Frontend path: {frontend_build_path}")
-print(f"[STARTUP] Frontend exists: {frontend_build_path.exists()}")
-
-if frontend_build_path.exists():
-    # List files in frontend directory
-    try:
-        files = list(frontend_build_path.iterdir())
-        print(f"[STARTUP] Files in frontend dir: {len(files)} files")
-        for f in files[:5]:  # Print first 5 files
-            print(f"[STARTUP]   - {f.name}")
-    except Exception as e:
-        print(f"[STARTUP] Error listing files: {e}")
-
 # Mount Angular frontend static files if build exists
 if frontend_build_path.exists():
-    print("[STARTUP] Mounting frontend static files...")
-
     # Mount assets folder
     assets_path = frontend_build_path / "assets"
     if assets_path.exists():
         app.mount("/assets", StaticFiles(directory=str(assets_path)), name="assets")
-        print("[STARTUP] [OK] Mounted /assets")
 
     # Mount other static files (js, css, etc.)
     app.mount("/static", StaticFiles(directory=str(frontend_build_path)), name="static")
-    print("[STARTUP] [OK] Mounted /static")
-else:
-    print("[STARTUP] [WARN] Frontend build directory NOT FOUND!")
 
 
 @app.get("/", include_in_schema=False)
@@ -0,0 +1,177 @@
+"""Block intermediate representation shared by extractors and the renderer.
+
+Extractors describe a document as a sequence of blocks (headings,
+paragraphs, list items, tables, ...) whose text is held in inline runs.
+The wikitext renderer consumes the blocks directly, so no formatting is
+encoded into, and parsed back out of, the text itself.
+
+The classes use ``__slots__`` instead of Pydantic models: documents
+produce one object per line and per run, and these are created and
+consumed on the hot path of every conversion.
+"""
+
+
+class Run:
+    """Inline text with uniform formatting.
+
+    Attributes:
+        text: Text of the run
+        bold: Whether the run is bold
+        italic: Whether the run is italic
+    """
+
+    __slots__ = ("bold", "italic", "text")
+
+    def __init__(self, text: str, bold: bool = False, italic: bool = False) -> None:
+        self.text = text
+        self.bold = bold
+        self.italic = italic
+
+    def __repr__(self) -> str:
+        return f"Run({self.text!r}, bold={self.bold}, italic={self.italic})"
+
+
+class InlineImage:
+    """Image placed in the flow of a paragraph.
+
+    Attributes:
+        url: Public URL of the saved image (``/immagini/...``)
+    """
+
+    __slots__ = ("url",)
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+
+    def __repr__(self) -> str:
+        return f"InlineImage({self.url!r})"
+
+
+Inline = Run | InlineImage
+
+
+class Heading:
+    """Section heading.
+
+    Attributes:
+        level: Heading level (1 = top level)
+        text: Heading text
+    """
+
+    __slots__ = ("level", "text")
+
+    def __init__(self, level: int, text: str) -> None:
+        self.level = level
+        self.text = text
+
+    def __repr__(self) -> str:
+        return f"Heading({self.level}, {self.text!r})"
+
+
+class Paragraph:
+    """Paragraph of inline runs and images.
+
+    Attributes:
+        inlines: Runs and images in reading order
+    """
+
+    __slots__ = ("inlines",)
+
+    def __init__(self, inlines: list[Inline]) -> None:
+        self.inlines = inlines
+
+    def __repr__(self) -> str:
+        return f"Paragraph({self.inlines!r})"
+
+
+class ListItem:
+    """Item of a bulleted or numbered list.
+
+    Attributes:
+        inlines: Runs and images in reading order
+        ordered: True for numbered lists, False for bullets
+        level: Nesting depth (1 = top level)
+    """
+
+    __slots__ = ("inlines", "level", "ordered")
+
+    def __init__(
+        self, inlines: list[Inline], ordered: bool = False, level: int = 1
+    ) -> None:
+        self.inlines = inlines
+        self.ordered = ordered
+        self.level = level
+
+    def __repr__(self) -> str:
+        return f"ListItem({self.inlines!r}, ordered={self.ordered}, level={self.level})"
+
+
+class TableCell:
+    """Table cell spanning several columns or rows.
+
+    Attributes:
+        text: Cell text
+        colspan: Number of grid columns covered
+        rowspan: Number of rows covered
+    """
+
+    __slots__ = ("colspan", "rowspan", "text")
+
+    def __init__(self, text: str, colspan: int = 1, rowspan: int = 1) -> None:
+        self.text = text
+        self.colspan = colspan
+        self.rowspan = rowspan
+
+    def __repr__(self) -> str:
+        return (
+            f"TableCell({self.text!r}, colspan={self.colspan}, rowspan={self.rowspan})"
+        )
+
+
+class Table:
+    """Table of plain text cells.
+
+    Cells are plain strings; only merged cells are ``TableCell`` objects.
+    As in MediaWiki markup, the grid positions covered by a merged cell are
+    left out of the rows, so rows may hold fewer cells than the grid has
+    columns.
+
+    Attributes:
+        rows: Cells, row by row
+    """
+
+    __slots__ = ("rows",)
+
+    def __init__(self, rows: list[list[str | TableCell]]) -> None:
+        self.rows = rows
+
+    def __repr__(self) -> str:
+        return f"Table({self.rows!r})"
+
+
+class Spacer:
+    """Blank line in the source layout."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "Spacer()"
+
+
+class PageBreak:
+    """Start of a page in paginated sources (PDF); not rendered.
+
+    Attributes:
+        page_num: 1-based page number
+    """
+
+    __slots__ = ("page_num",)
+
+    def __init__(self, page_num: int) -> None:
+        self.page_num = page_num
+
+    def __repr__(self) -> str:
+        return f"PageBreak({self.page_num})"
+
+
+Block = Heading | Paragraph | ListItem | Table | Spacer | PageBreak
@@ -4,9 +4,13 @@ This module defines all Pydantic models used for request/response handling
 in the API endpoints.
 """
 
+from collections.abc import Iterator
+from pathlib import Path
 from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.models.blocks import Block
 
 
 class ConvertResponse(BaseModel):
@@ -30,11 +34,32 @@ class ConvertResponse(BaseModel):
 
 
 class JobStatus(BaseModel):
-    """Status model for async job tracking (future use).
+    """Status model for async job tracking.
+
+    Attributes:
+        id: Unique job identifier
+        status: Current job status
+        error: Error message if status is ERROR
+    """
+
+    id: str = Field(..., description="Job identifier")
+    status: Literal["PENDING", "RUNNING", "DONE", "ERROR"] = Field(
+        ..., description="Current job status"
+    )
+    error: str | None = Field(default=None, description="Error message if job failed")
+
+
+class JobProgress(BaseModel):
+    """Progress event of an async job.
 
     Attributes:
         id: Unique job identifier
         status: Current job status
+        unit: What ``done`` and ``total`` count ("pages", "blocks" or "bytes")
+        done: Units processed so far
+        total: Units in the document, 0 until extraction starts
+        images: Images saved so far
+        elapsed_seconds: Time since the job started running
         error: Error message if status is ERROR
     """
 
@@ -42,9 +67,46 @@ class JobStatus(BaseModel):
     status: Literal["PENDING", "RUNNING", "DONE", "ERROR"] = Field(
         ..., description="Current job status"
     )
+    unit: str = Field(default="", description="Counted unit (pages, blocks or bytes)")
+    done: int = Field(default=0, description="Units processed")
+    total: int = Field(default=0, description="Units in the document")
+    images: int = Field(default=0, description="Images saved")
+    elapsed_seconds: float = Field(default=0.0, description="Running time")
     error: str | None = Field(default=None, description="Error message if job failed")
 
 
+class BatchItemResult(BaseModel):
+    """Outcome of one file of a batch conversion.
+
+    Attributes:
+        filename: Filename of the uploaded file or archive member
+        status: DONE if the file was converted, ERROR otherwise
+        result: Conversion result when DONE
+        error: Error message when ERROR
+    """
+
+    filename: str = Field(..., description="Uploaded filename or archive member")
+    status: Literal["DONE", "ERROR"] = Field(..., description="Item outcome")
+    result: ConvertResponse | None = Field(
+        default=None, description="Conversion result"
+    )
+    error: str | None = Field(default=None, description="Error message if failed")
+
+
+class BatchConvertResponse(BaseModel):
+    """Response model for the batch conversion endpoint.
+
+    Attributes:
+        items: Per-file outcomes, in upload (or archive) order
+        succeeded: Number of converted files
+        failed: Number of files that could not be converted
+    """
+
+    items: list[BatchItemResult] = Field(..., description="Per-file outcomes")
+    succeeded: int = Field(..., description="Number of converted files")
+    failed: int = Field(..., description="Number of failed files")
+
+
 class HealthResponse(BaseModel):
     """Health check response model.
 
@@ -55,19 +117,200 @@ class HealthResponse(BaseModel):
     status: str = Field(default="ok", description="Health status")
 
 
+class CacheStats(BaseModel):
+    """Conversion cache statistics.
+
+    Attributes:
+        hits: Number of lookups answered from the cache
+        misses: Number of lookups that required a full conversion
+        evictions: Number of entries evicted by the LRU policy
+        entries: Current number of cached conversions
+        bytes: Current size of the entries and the images they reference
+        max_entries: Configured entry limit
+        max_bytes: Configured size limit
+    """
+
+    hits: int = Field(default=0, description="Cache hits")
+    misses: int = Field(default=0, description="Cache misses")
+    evictions: int = Field(default=0, description="LRU evictions")
+    entries: int = Field(default=0, description="Cached conversions")
+    bytes: int = Field(default=0, description="Cached bytes (entries + images)")
+    max_entries: int = Field(..., description="Entry limit")
+    max_bytes: int = Field(..., description="Size limit in bytes")
+
+
+class RetentionStats(BaseModel):
+    """Retention sweep statistics.
+
+    Attributes:
+        sweeps: Number of sweeps run since start-up
+        running: Whether a sweep is in progress
+        last_sweep_at: Unix time the last sweep finished
+        last_sweep_seconds: Duration of the last sweep
+        last_jobs_removed: Job image directories removed by the last sweep
+        last_outputs_removed: Outputs and profiles removed by the last sweep
+        last_bytes_freed: Bytes freed by the last sweep
+        jobs_removed: Job image directories removed since start-up
+        outputs_removed: Outputs and profiles removed since start-up
+        bytes_freed: Bytes freed since start-up
+        bytes: Size of images, outputs and profiles after the last sweep
+        max_age_hours: Configured age limit (0: disabled)
+        max_bytes: Configured size limit (0: disabled)
+    """
+
+    sweeps: int = Field(default=0, description="Sweeps run")
+    running: bool = Field(default=False, description="Sweep in progress")
+    last_sweep_at: float | None = Field(
+        default=None, description="Unix time of the last sweep"
+    )
+    last_sweep_seconds: float = Field(default=0.0, description="Last sweep duration")
+    last_jobs_removed: int = Field(default=0, description="Jobs removed last sweep")
+    last_outputs_removed: int = Field(
+        default=0, description="Outputs removed last sweep"
+    )
+    last_bytes_freed: int = Field(default=0, description="Bytes freed last sweep")
+    jobs_removed: int = Field(default=0, description="Job image directories removed")
+    outputs_removed: int = Field(default=0, description="Outputs/profiles removed")
+    bytes_freed: int = Field(default=0, description="Bytes freed")
+    bytes: int = Field(default=0, description="Images, outputs and profiles size")
+    max_age_hours: int = Field(..., description="Age limit in hours")
+    max_bytes: int = Field(..., description="Size limit in bytes")
+
+
+class ProfileFunction(BaseModel):
+    """Profiled function with its aggregated timings.
+
+    Attributes:
+        function: Function name
+        location: Source file and line of the function
+        calls: Number of calls
+        total_seconds: Time spent in the function itself
+        cumulative_seconds: Time spent in the function and its callees
+    """
+
+    function: str = Field(..., description="Function name")
+    location: str = Field(..., description="Source file and line")
+    calls: int = Field(..., description="Number of calls")
+    total_seconds: float = Field(..., description="Own time in seconds")
+    cumulative_seconds: float = Field(..., description="Time including callees")
+
+
+class ProfileSummary(BaseModel):
+    """Hot functions of a profiled conversion.
+
+    Attributes:
+        id: Job identifier of the profiled conversion
+        total_seconds: Profiled wall time of the conversion
+        hot_functions: Functions with the highest own time
+        conversion_functions: Extractor and rendering functions, aggregated by name
+    """
+
+    id: str = Field(..., description="Job identifier")
+    total_seconds: float = Field(..., description="Profiled conversion time")
+    hot_functions: list[ProfileFunction] = Field(
+        default_factory=list, description="Functions by own time"
+    )
+    conversion_functions: list[ProfileFunction] = Field(
+        default_factory=list, description="Extractor and rendering functions"
+    )
+
+
+class StoredUpload(BaseModel):
+    """Internal model for an upload persisted to the upload directory.
+
+    Attributes:
+        path: Absolute path of the stored file
+        size: File size in bytes
+        sha256: SHA-256 hex digest of the file content
+    """
+
+    path: Path = Field(..., description="Stored upload path")
+    size: int = Field(..., description="Upload size in bytes")
+    sha256: str = Field(..., description="SHA-256 of the upload content")
+
+
+class ConversionStats(BaseModel):
+    """Internal model for the figures a conversion reports to the metrics.
+
+    Attributes:
+        extract_seconds: Time spent in the extractor
+        render_seconds: Time spent rendering and writing the output
+        pages: Number of PDF pages processed
+        images: Number of extracted images
+        output_bytes: Size of the MediaWiki text in bytes
+        image_writes_saved: Image references served from the PDF xref memo
+        image_bytes_saved: Image bytes not written thanks to the memo
+    """
+
+    extract_seconds: float = Field(default=0.0, description="Extraction time")
+    render_seconds: float = Field(default=0.0, description="Rendering time")
+    pages: int = Field(default=0, description="PDF pages processed")
+    images: int = Field(default=0, description="Extracted images")
+    output_bytes: int = Field(default=0, description="MediaWiki text size")
+    image_writes_saved: int = Field(default=0, description="Image writes avoided")
+    image_bytes_saved: int = Field(default=0, description="Image bytes not written")
+
+
 class ExtractedData(BaseModel):
     """Internal model for extracted document data.
 
     Attributes:
-        text: Extracted plain text from document
+        blocks: Extracted document content as IR blocks
         images: List of saved image filenames
         metadata: Document metadata (title, author, etc.)
     """
 
-    text: str = Field(..., description="Extracted text content")
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    blocks: list[Block] = Field(..., description="Extracted content blocks")
     images: list[str] = Field(
         default_factory=list, description="List of extracted image filenames"
     )
     metadata: dict[str, str] = Field(
         default_factory=dict, description="Document metadata"
     )
+
+
+class ExtractedStream:
+    """Streaming counterpart of ExtractedData.
+
+    Extractors return this instead of building the whole document in memory:
+    ``blocks`` yields IR blocks as the document is walked. ``images`` and
+    ``metadata`` are complete once ``blocks`` is exhausted, and so are
+    ``counters``, figures the extractor reports to the conversion statistics
+    (e.g. ``image_writes_saved``). This is a plain
+    class because it holds a live generator, which Pydantic cannot
+    validate without consuming it.
+    """
+
+    __slots__ = ("blocks", "counters", "images", "metadata")
+
+    def __init__(
+        self,
+        blocks: Iterator[Block],
+        images: list[str] | None = None,
+        metadata: dict[str, str] | None = None,
+        counters: dict[str, int] | None = None,
+    ) -> None:
+        """Initialize the stream.
+
+        Args:
+            blocks: Iterator of extracted blocks
+            images: List of saved image URLs, possibly filled while iterating
+            metadata: Document metadata
+            counters: Extractor figures for the ``ConversionStats`` fields
+        """
+        self.blocks = blocks
+        self.images = images if images is not None else []
+        self.metadata = metadata if metadata is not None else {}
+        self.counters = counters if counters is not None else {}
+
+    def collect(self) -> ExtractedData:
+        """Consume the stream into a fully materialized ExtractedData.
+
+        Returns:
+            ExtractedData with the blocks, images and metadata
+        """
+        return ExtractedData.model_construct(
+            blocks=list(self.blocks), images=self.images, metadata=self.metadata
+        )
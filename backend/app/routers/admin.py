@@ -0,0 +1,149 @@
+"""Administration router.
+
+Exposes operational statistics of the conversion backend, retention sweeps
+and the profiles of profiled conversions. Profiles contain internal paths
+and a sweep scans the whole storage, so those endpoints require the
+``X-Profile-Token`` header.
+"""
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse
+
+from app.models.dto import CacheStats, ProfileSummary, RetentionStats
+from app.services.cache import conversion_cache
+from app.services.executor import run_io
+from app.services.profiling import load_profile_summary, profile_paths, token_matches
+from app.services.retention import retention_manager
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def require_admin_token(x_profile_token: str | None = Header(default=None)) -> None:
+    """Reject requests without the configured profiling token.
+
+    Args:
+        x_profile_token: Value of the ``X-Profile-Token`` header
+
+    Raises:
+        HTTPException: 403 if the token is missing or does not match
+    """
+    if not token_matches(x_profile_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@router.get(
+    "/cache",
+    response_model=CacheStats,
+    summary="Conversion cache statistics",
+)
+async def cache_stats() -> CacheStats:
+    """Return hit/miss counters and occupancy of the conversion cache.
+
+    Returns:
+        CacheStats snapshot
+    """
+    return await run_io(conversion_cache.stats)
+
+
+@router.get(
+    "/retention",
+    response_model=RetentionStats,
+    summary="Retention sweep statistics",
+)
+async def retention_stats() -> RetentionStats:
+    """Return the retention sweep counters and the last measured disk usage.
+
+    Returns:
+        RetentionStats snapshot
+    """
+    return retention_manager.stats()
+
+
+@router.post(
+    "/retention/sweep",
+    response_model=RetentionStats,
+    summary="Run a retention sweep now",
+    dependencies=[Depends(require_admin_token)],
+)
+async def retention_sweep() -> RetentionStats:
+    """Remove expired images and outputs, then enforce the size limit.
+
+    Runs even when the scheduler is disabled; with no policy configured it
+    only measures the disk usage.
+
+    Returns:
+        RetentionStats including the outcome of this sweep
+
+    Raises:
+        HTTPException: If the admin token is missing or invalid
+    """
+    return await retention_manager.sweep()
+
+
+def _check_job_id(job_id: str) -> None:
+    """Reject job ids that could escape the profiles directory.
+
+    Raises:
+        HTTPException: If the job id is not alphanumeric (dashes allowed)
+    """
+    if not job_id.replace("-", "").isalnum():
+        raise HTTPException(status_code=400, detail="Invalid job ID")
+
+
+@router.get(
+    "/profiles/{job_id}",
+    response_model=ProfileSummary,
+    summary="Hot functions of a profiled conversion",
+    dependencies=[Depends(require_admin_token)],
+)
+async def profile_summary(job_id: str) -> ProfileSummary:
+    """Return the hot functions of a profiled conversion.
+
+    Args:
+        job_id: Id returned by the profiled ``/api/convert`` call
+
+    Returns:
+        ProfileSummary of the conversion
+
+    Raises:
+        HTTPException: If the token or the job id is invalid or the job was
+            not profiled
+    """
+    _check_job_id(job_id)
+    summary = await run_io(load_profile_summary, job_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return summary
+
+
+@router.get(
+    "/profiles/{job_id}/download",
+    response_class=FileResponse,
+    summary="Download the raw profile of a profiled conversion",
+    dependencies=[Depends(require_admin_token)],
+)
+async def download_profile(job_id: str) -> FileResponse:
+    """Download the ``cProfile`` output of a profiled conversion.
+
+    The file can be loaded with ``pstats`` or a viewer such as snakeviz.
+
+    Args:
+        job_id: Id returned by the profiled ``/api/convert`` call
+
+    Returns:
+        FileResponse with the .prof file
+
+    Raises:
+        HTTPException: If the token or the job id is invalid or the job was
+            not profiled
+    """
+    _check_job_id(job_id)
+    prof_path, _ = profile_paths(job_id)
+    if not prof_path.exists():
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    return FileResponse(
+        path=str(prof_path),
+        filename=f"{job_id}.prof",
+        media_type="application/octet-stream",
+    )
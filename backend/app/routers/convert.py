@@ -3,21 +3,18 @@
 Handles PDF/DOCX/ODT/RTF upload and conversion to MediaWiki format.
 """
 
-from fastapi import APIRouter, File, HTTPException, UploadFile
-
-from app.core.config import config
-from app.models.dto import ConvertResponse
-from app.services.convert_wikitext import to_wikitext
-from app.services.extract_docx import extract_docx
-from app.services.extract_odt import extract_odt
-from app.services.extract_pdf import extract_pdf
-from app.services.extract_rtf import extract_rtf
-from app.services.storage import (
-    cleanup_upload,
-    generate_job_id,
-    save_output,
-    save_upload,
+from fastapi import APIRouter, File, Header, HTTPException, Query, UploadFile
+
+from app.models.dto import BatchConvertResponse, ConvertResponse
+from app.services.batch import convert_batch, store_batch
+from app.services.pipeline import (
+    convert_stored_upload,
+    parse_pages,
+    store_upload,
+    validate_upload,
 )
+from app.services.profiling import InvalidProfileTokenError, profile_requested
+from app.services.storage import generate_job_id
 
 router = APIRouter(tags=["convert"])
 
@@ -28,7 +25,14 @@ router = APIRouter(tags=["convert"])
     summary="Convert PDF/DOCX/ODT/RTF to MediaWiki markup",
     description="Upload a PDF, DOCX, ODT, or RTF file and receive MediaWiki formatted text with extracted images",
 )
-async def convert_file(file: UploadFile = File(...)) -> ConvertResponse:
+async def convert_file(
+    file: UploadFile = File(...),
+    pages: str | None = Query(
+        default=None,
+        description="PDF pages to convert, e.g. 120-180 or 1,5,10- (default: all)",
+    ),
+    x_profile_token: str | None = Header(default=None),
+) -> ConvertResponse:
     """Convert uploaded document file to MediaWiki format.
 
     Supported formats:
@@ -37,90 +41,67 @@ async def convert_file(file: UploadFile = File(...)) -> ConvertResponse:
     - ODT: Full text and image extraction (OpenDocument Text)
     - RTF: Text extraction only (images not supported)
 
+    When profiling is enabled in the configuration, or the request carries
+    a valid ``X-Profile-Token`` header, the conversion is profiled and the
+    profile is available under the returned id at ``/api/admin/profiles``.
+
+    For PDFs, ``pages`` restricts the conversion to a page selection: only
+    those pages are loaded, analyzed and image-extracted.
+
     Args:
         file: Uploaded document file (PDF, DOCX, ODT, or RTF)
+        pages: Optional PDF page selection (comma-separated pages and ranges)
+        x_profile_token: Optional profiling token
 
     Returns:
         ConvertResponse with converted text, images, and warnings
 
     Raises:
-        HTTPException: If file format is unsupported or processing fails
+        HTTPException: If file format is unsupported, the page selection or
+            the profiling token is invalid or processing fails
     """
-    # Validate file extension
-    if not file.filename:
-        raise HTTPException(status_code=400, detail="Filename is required")
-
-    ext = file.filename.lower().rsplit(".", 1)[-1]
-    if f".{ext}" not in config.allowed_extensions:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Unsupported file type. Allowed: {', '.join(config.allowed_extensions)}",
-        )
-
-    # Check file size (basic check)
-    # Note: FastAPI has max_upload_size, but we can add custom validation here
-    file.file.seek(0, 2)  # Seek to end
-    file_size = file.file.tell()
-    file.file.seek(0)  # Reset to start
-
-    if file_size > config.max_file_size_mb * 1024 * 1024:
-        raise HTTPException(
-            status_code=413,
-            detail=f"File too large. Maximum size: {config.max_file_size_mb}MB",
-        )
+    ext = validate_upload(file)
+    page_ranges = parse_pages(pages, ext)
+
+    try:
+        profile = profile_requested(x_profile_token)
+    except InvalidProfileTokenError as e:
+        raise HTTPException(status_code=403, detail=str(e)) from e
 
     # Generate job_id BEFORE extraction to organize images by job
     job_id = generate_job_id()
 
-    # Save uploaded file
-    try:
-        upload_path = save_upload(file)
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Failed to save upload: {str(e)}"
-        ) from e
+    upload = await store_upload(file)
 
-    # Extract content based on file type (pass job_id to organize images)
-    try:
-        if ext == "pdf":
-            extracted = extract_pdf(upload_path, job_id)
-        elif ext == "docx":
-            extracted = extract_docx(upload_path, job_id)
-        elif ext == "odt":
-            extracted = extract_odt(upload_path, job_id)
-        elif ext == "rtf":
-            extracted = extract_rtf(upload_path, job_id)
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file type")
-    except Exception as e:
-        cleanup_upload(upload_path)
-        raise HTTPException(
-            status_code=500, detail=f"Extraction failed: {str(e)}"
-        ) from e
-
-    # Convert to MediaWiki format
-    try:
-        wikitext, warnings = to_wikitext(extracted)
-    except Exception as e:
-        cleanup_upload(upload_path)
-        raise HTTPException(
-            status_code=500, detail=f"Conversion failed: {str(e)}"
-        ) from e
-
-    # Save output with original filename
-    try:
-        save_output(file.filename, wikitext)
-    except Exception as e:
-        # Not critical - we can still return the result
-        warnings.append(f"Failed to save output file: {str(e)}")
-
-    # Clean up uploaded file
-    cleanup_upload(upload_path)
-
-    return ConvertResponse(
-        id=job_id,
-        filename=file.filename,
-        mediawiki_text=wikitext,
-        images=extracted.images,
-        warnings=warnings,
+    return await convert_stored_upload(
+        upload, file.filename, ext, job_id, profile, pages=page_ranges
     )
+
+
+@router.post(
+    "/convert/batch",
+    response_model=BatchConvertResponse,
+    summary="Convert many documents, or a ZIP archive of documents, in one request",
+    description="Upload several PDF/DOCX/ODT/RTF files (or a single ZIP archive containing them) and receive one conversion result or error per file",
+)
+async def convert_batch_files(
+    files: list[UploadFile] = File(...),
+) -> BatchConvertResponse:
+    """Convert a batch of uploaded documents.
+
+    Files are converted concurrently (up to ``batch_concurrency`` at a time).
+    A file that fails is reported as an ERROR item; the other files are
+    still converted.
+
+    Args:
+        files: Uploaded document files, or a single ZIP archive
+
+    Returns:
+        BatchConvertResponse with per-file results and errors
+
+    Raises:
+        HTTPException: If the batch has too many files or the archive is invalid
+    """
+    entries = await store_batch(files)
+
+    return await convert_batch(entries)
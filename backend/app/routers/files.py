@@ -3,14 +3,15 @@
 Handles serving of output files and image downloads.
 """
 
-import io
-import zipfile
+from collections.abc import AsyncIterator, Generator
 from pathlib import Path
 
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import FileResponse, StreamingResponse
 
 from app.core.config import config
+from app.services.executor import run_io
+from app.services.zipstream import iter_zip
 
 router = APIRouter(tags=["files"])
 
@@ -72,32 +73,53 @@ async def download_all_images(job_id: str) -> StreamingResponse:
     # Get images directory for this job (use get_project_path like save_image does)
     images_dir = config.get_project_path(config.images_dir) / job_id
 
-    if not images_dir.exists():
+    # List the images off the event loop
+    image_files = await run_io(_list_images, images_dir)
+    if image_files is None:
         raise HTTPException(status_code=404, detail="Images directory not found")
 
-    # Get all image files
-    image_files = []
-    for ext in ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.bmp"]:
-        image_files.extend(images_dir.glob(ext))
-
     if not image_files:
         raise HTTPException(status_code=404, detail="No images found for this job")
 
-    # Create ZIP file in memory
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(
-        zip_buffer, mode="w", compression=zipfile.ZIP_DEFLATED
-    ) as zip_file:
-        for image_file in image_files:
-            # Add file to zip with its name (without full path)
-            zip_file.write(image_file, arcname=image_file.name)
-
-    # Seek to beginning of buffer
-    zip_buffer.seek(0)
-
-    # Return as streaming response
+    # Build the ZIP while it is sent, off the event loop
     return StreamingResponse(
-        zip_buffer,
+        _stream_in_worker(iter_zip(image_files)),
         media_type="application/zip",
         headers={"Content-Disposition": f"attachment; filename={job_id}_images.zip"},
     )
+
+
+def _list_images(images_dir: Path) -> list[Path] | None:
+    """List the image files of a job directory.
+
+    Args:
+        images_dir: Images directory of the job
+
+    Returns:
+        Image file paths, or None if the directory does not exist
+    """
+    if not images_dir.is_dir():
+        return None
+    image_files = []
+    for ext in ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.bmp"]:
+        image_files.extend(images_dir.glob(ext))
+    return image_files
+
+
+async def _stream_in_worker(
+    chunks: Generator[bytes, None, None],
+) -> AsyncIterator[bytes]:
+    """Advance a blocking chunk generator in the I/O pool.
+
+    Args:
+        chunks: Generator doing blocking work for each chunk
+
+    Yields:
+        The generator's chunks
+    """
+    try:
+        while (chunk := await run_io(next, chunks, None)) is not None:
+            yield chunk
+    finally:
+        # Client disconnected or archive done: release open files
+        await run_io(chunks.close)
@@ -0,0 +1,204 @@
+"""Asynchronous conversion job router.
+
+Lets clients submit an upload, poll its status and fetch the result later,
+so long conversions never exceed proxy or load balancer timeouts, or
+follow its progress as server-sent events.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
+
+from app.core.config import config
+from app.models.dto import ConvertResponse, JobProgress, JobStatus
+from app.services.executor import run_io
+from app.services.jobs import JobQueueFullError, JobRecord, job_manager
+from app.services.pipeline import store_upload, validate_upload
+from app.services.progress import ProgressCounts, read_progress
+from app.services.storage import cleanup_upload, generate_job_id
+
+router = APIRouter(tags=["jobs"])
+
+# Seconds without events after which a comment is sent to keep proxies from
+# closing the stream
+KEEP_ALIVE_SECONDS = 15.0
+
+
+@router.post(
+    "/jobs",
+    response_model=JobStatus,
+    status_code=202,
+    summary="Submit a document for asynchronous conversion",
+)
+async def submit_job(file: UploadFile = File(...)) -> JobStatus:
+    """Store the upload and queue it for conversion.
+
+    Args:
+        file: Uploaded document file (PDF, DOCX, ODT, or RTF)
+
+    Returns:
+        JobStatus with the new job id and status PENDING
+
+    Raises:
+        HTTPException: If the file is invalid or the queue is full
+    """
+    ext = validate_upload(file)
+    job_id = generate_job_id()
+    upload = await store_upload(file)
+
+    try:
+        return job_manager.submit(upload, file.filename, ext, job_id)
+    except JobQueueFullError as e:
+        await run_io(cleanup_upload, upload.path)
+        raise HTTPException(
+            status_code=503, detail="Too many pending jobs, retry later"
+        ) from e
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobStatus,
+    summary="Get the status of a conversion job",
+)
+async def get_job_status(job_id: str) -> JobStatus:
+    """Return the current status of a job.
+
+    Args:
+        job_id: Job identifier returned by POST /jobs
+
+    Returns:
+        JobStatus of the job
+
+    Raises:
+        HTTPException: If the job is unknown
+    """
+    record = job_manager.get(job_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return record.status
+
+
+def _job_progress(
+    job_id: str, record: JobRecord, counts: ProgressCounts | None
+) -> JobProgress:
+    """Build the progress event of a job from its record and progress counts."""
+    elapsed = 0.0
+    if record.started_at is not None:
+        end = record.finished_at if record.finished_at is not None else time.monotonic()
+        elapsed = end - record.started_at
+    progress = JobProgress(
+        id=job_id,
+        status=record.status.status,
+        elapsed_seconds=round(elapsed, 3),
+        error=record.status.error,
+    )
+    if counts is not None:
+        progress.unit = counts.unit
+        progress.done = counts.done
+        progress.total = counts.total
+        progress.images = counts.images
+    return progress
+
+
+async def _progress_events(job_id: str, record: JobRecord) -> AsyncIterator[str]:
+    """Yield server-sent events with the progress of a job until it finishes.
+
+    Args:
+        job_id: Job identifier
+        record: Record of the job
+
+    Yields:
+        ``progress`` events whenever the progress changes, then one ``done``
+        or ``error`` event, with keep-alive comments in between
+    """
+    counts: ProgressCounts | None = None
+    last_data = None
+    last_sent = time.monotonic()
+    while True:
+        finished = record.status.status in ("DONE", "ERROR")
+        counts = await run_io(read_progress, job_id) or counts
+        progress = _job_progress(job_id, record, counts)
+        if finished:
+            if progress.status == "DONE":
+                # Progress files are removed with the upload: report completion
+                progress.done = progress.total
+                if record.result is not None:
+                    progress.images = len(record.result.images)
+            event = "done" if progress.status == "DONE" else "error"
+            yield f"event: {event}\ndata: {progress.model_dump_json()}\n\n"
+            return
+
+        data = progress.model_dump_json(exclude={"elapsed_seconds"})
+        now = time.monotonic()
+        if data != last_data:
+            last_data = data
+            last_sent = now
+            yield f"event: progress\ndata: {progress.model_dump_json()}\n\n"
+        elif now - last_sent >= KEEP_ALIVE_SECONDS:
+            last_sent = now
+            yield ": keep-alive\n\n"
+        await asyncio.sleep(config.progress_interval_ms / 1000)
+
+
+@router.get(
+    "/jobs/{job_id}/events",
+    summary="Stream the progress of a conversion job",
+    response_class=StreamingResponse,
+)
+async def stream_job_events(job_id: str) -> StreamingResponse:
+    """Stream the progress of a job as server-sent events.
+
+    Each ``progress`` event carries the units (PDF pages, DOCX bytes parsed,
+    or paragraphs and tables) done and total, the images saved and the
+    elapsed time. The stream ends with a ``done`` or ``error`` event.
+
+    Args:
+        job_id: Job identifier returned by POST /jobs
+
+    Returns:
+        StreamingResponse with media type text/event-stream
+
+    Raises:
+        HTTPException: If the job is unknown
+    """
+    record = job_manager.get(job_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return StreamingResponse(
+        _progress_events(job_id, record),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get(
+    "/jobs/{job_id}/result",
+    response_model=ConvertResponse,
+    summary="Get the result of a finished conversion job",
+)
+async def get_job_result(job_id: str) -> ConvertResponse:
+    """Return the conversion result of a finished job.
+
+    Args:
+        job_id: Job identifier returned by POST /jobs
+
+    Returns:
+        ConvertResponse identical to the one returned by POST /convert
+
+    Raises:
+        HTTPException: If the job is unknown, not finished yet, or failed
+    """
+    record = job_manager.get(job_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if record.status.status == "ERROR":
+        raise HTTPException(status_code=500, detail=record.status.error)
+    if record.result is None:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Job not finished yet (status: {record.status.status})",
+        )
+    return record.result
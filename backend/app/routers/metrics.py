@@ -0,0 +1,31 @@
+"""Metrics router.
+
+Exposes the Prometheus metrics of the conversion backend.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core import metrics
+from app.services.jobs import job_manager
+
+router = APIRouter(tags=["metrics"])
+
+# Content type of the Prometheus text exposition format
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Prometheus metrics",
+)
+async def get_metrics() -> PlainTextResponse:
+    """Return request, conversion and job queue metrics.
+
+    Returns:
+        Metrics in the Prometheus text exposition format
+    """
+    metrics.JOB_QUEUE_DEPTH.set(job_manager.queue_depth)
+    metrics.JOBS_RUNNING.set(job_manager.running)
+    return PlainTextResponse(metrics.render_metrics(), media_type=METRICS_CONTENT_TYPE)
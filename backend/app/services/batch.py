@@ -0,0 +1,230 @@
+"""Batch conversion of many files or a ZIP archive.
+
+A batch is stored first (uploads are read sequentially from the request
+body, archive members are unpacked one by one), then its files are
+converted concurrently through the regular pipeline, bounded by
+``config.batch_concurrency``. A file that cannot be stored or converted is
+reported as an ERROR item; it does not fail the rest of the batch.
+"""
+
+import asyncio
+import zipfile
+from pathlib import Path, PurePosixPath
+
+from fastapi import HTTPException, UploadFile
+from pydantic import BaseModel
+
+from app.core.config import config
+from app.models.dto import BatchConvertResponse, BatchItemResult, StoredUpload
+from app.services.executor import run_io
+from app.services.pipeline import convert_stored_upload, store_upload, validate_upload
+from app.services.storage import (
+    UploadTooLargeError,
+    cleanup_upload,
+    generate_job_id,
+    save_stream,
+)
+
+
+class BatchEntry(BaseModel):
+    """File of a batch, either stored for conversion or already failed.
+
+    Attributes:
+        filename: Filename of the uploaded file or archive member
+        ext: Lowercase file extension without the leading dot
+        upload: Stored upload, if the file was accepted
+        error: Error message, if the file was rejected
+    """
+
+    filename: str
+    ext: str = ""
+    upload: StoredUpload | None = None
+    error: str | None = None
+
+
+def is_zip_batch(files: list[UploadFile]) -> bool:
+    """Return True if the batch is a single ZIP archive.
+
+    Args:
+        files: Uploaded files
+
+    Returns:
+        Whether the files should be unpacked from an archive
+    """
+    return len(files) == 1 and (files[0].filename or "").lower().endswith(".zip")
+
+
+def _member_ext(name: str) -> str:
+    """Return the lowercase extension of a filename without the dot."""
+    return name.lower().rsplit(".", 1)[-1] if "." in name else ""
+
+
+def unpack_zip(archive_path: Path) -> list[BatchEntry]:
+    """Store the supported documents of a ZIP archive as uploads.
+
+    Members are copied in chunks with the per-file size limit enforced on
+    the uncompressed bytes actually read, and the total uncompressed size
+    is capped at ``config.batch_max_total_mb``. Directories and hidden
+    entries (``__MACOSX/``, dotfiles) are skipped.
+
+    Args:
+        archive_path: Path of the stored archive
+
+    Returns:
+        Batch entries in archive order
+
+    Raises:
+        ValueError: If the file is not a valid ZIP archive or holds too many files
+    """
+    max_member_bytes = config.max_file_size_mb * 1024 * 1024
+    remaining_bytes = config.batch_max_total_mb * 1024 * 1024
+    entries: list[BatchEntry] = []
+
+    try:
+        archive = zipfile.ZipFile(archive_path)
+    except zipfile.BadZipFile as e:
+        raise ValueError("Invalid ZIP archive") from e
+
+    with archive:
+        members = [
+            member
+            for member in archive.infolist()
+            if not member.is_dir()
+            and not any(
+                part.startswith((".", "__MACOSX"))
+                for part in PurePosixPath(member.filename).parts
+            )
+        ]
+        if len(members) > config.batch_max_files:
+            raise ValueError(f"Too many files. Maximum: {config.batch_max_files}")
+
+        for member in members:
+            name = PurePosixPath(member.filename).name
+            ext = _member_ext(name)
+            if f".{ext}" not in config.allowed_extensions:
+                entries.append(BatchEntry(filename=name, error="Unsupported file type"))
+                continue
+
+            try:
+                with archive.open(member) as source:
+                    upload = save_stream(
+                        source, name, min(max_member_bytes, remaining_bytes)
+                    )
+            except UploadTooLargeError:
+                if remaining_bytes < max_member_bytes:
+                    error = (
+                        f"Batch too large. Maximum size: {config.batch_max_total_mb}MB"
+                    )
+                else:
+                    error = f"File too large. Maximum size: {config.max_file_size_mb}MB"
+                entries.append(BatchEntry(filename=name, error=error))
+                continue
+            except (
+                zipfile.BadZipFile,
+                OSError,
+                RuntimeError,
+                NotImplementedError,
+            ) as e:
+                # Corrupt, encrypted or unsupported compression
+                entries.append(
+                    BatchEntry(
+                        filename=name, error=f"Failed to read archive member: {e}"
+                    )
+                )
+                continue
+
+            remaining_bytes -= upload.size
+            entries.append(BatchEntry(filename=name, ext=ext, upload=upload))
+
+    return entries
+
+
+async def store_batch(files: list[UploadFile]) -> list[BatchEntry]:
+    """Store the files of a batch request.
+
+    Args:
+        files: Uploaded files, or a single ZIP archive
+
+    Returns:
+        Batch entries in upload (or archive) order
+
+    Raises:
+        HTTPException: If the batch as a whole is invalid
+    """
+    if is_zip_batch(files):
+        archive = await store_upload(files[0], config.batch_max_total_mb)
+        try:
+            return await run_io(unpack_zip, archive.path)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        finally:
+            await run_io(cleanup_upload, archive.path)
+
+    if len(files) > config.batch_max_files:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files. Maximum: {config.batch_max_files}",
+        )
+
+    entries = []
+    try:
+        for file in files:
+            filename = file.filename or "upload"
+            try:
+                ext = validate_upload(file)
+                upload = await store_upload(file)
+            except HTTPException as e:
+                entries.append(BatchEntry(filename=filename, error=str(e.detail)))
+                continue
+            entries.append(BatchEntry(filename=filename, ext=ext, upload=upload))
+    except BaseException:
+        # Request cancelled while storing: drop what was stored so far
+        for entry in entries:
+            if entry.upload is not None:
+                cleanup_upload(entry.upload.path)
+        raise
+    return entries
+
+
+async def convert_batch(entries: list[BatchEntry]) -> BatchConvertResponse:
+    """Convert stored batch entries concurrently.
+
+    At most ``config.batch_concurrency`` files are converted at a time;
+    each gets its own job id. Uploads are removed once converted, or when
+    the batch is cancelled before their turn.
+
+    Args:
+        entries: Entries returned by ``store_batch``
+
+    Returns:
+        BatchConvertResponse with one item per entry, in order
+    """
+    semaphore = asyncio.Semaphore(config.batch_concurrency)
+
+    async def convert_entry(entry: BatchEntry) -> BatchItemResult:
+        if entry.upload is None:
+            return BatchItemResult(
+                filename=entry.filename, status="ERROR", error=entry.error
+            )
+
+        started = False
+        try:
+            async with semaphore:
+                started = True
+                result = await convert_stored_upload(
+                    entry.upload, entry.filename, entry.ext, generate_job_id()
+                )
+        except Exception as e:
+            error = str(e.detail) if isinstance(e, HTTPException) else str(e)
+            return BatchItemResult(filename=entry.filename, status="ERROR", error=error)
+        finally:
+            if not started:
+                cleanup_upload(entry.upload.path)
+
+        return BatchItemResult(filename=entry.filename, status="DONE", result=result)
+
+    items = await asyncio.gather(*(convert_entry(entry) for entry in entries))
+    succeeded = sum(1 for item in items if item.status == "DONE")
+    return BatchConvertResponse(
+        items=list(items), succeeded=succeeded, failed=len(items) - succeeded
+    )
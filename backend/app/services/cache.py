@@ -0,0 +1,207 @@
+"""Persistent conversion cache keyed by upload content.
+
+Repeated uploads of the same document skip extraction and rendering: the
+``ConvertResponse`` of the first conversion is stored on disk under a key
+derived from the SHA-256 of the upload bytes, the converter version and the
+conversion options. Entries are evicted least-recently-used first once the
+configured entry count or byte budget is exceeded.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from app.core.config import config
+from app.models.dto import CacheStats, ConvertResponse
+from app.services.storage import image_url_to_path
+
+# Bump whenever extraction or rendering output changes so stale entries miss
+CONVERTER_VERSION = "6"
+
+
+def cache_key(
+    content_hash: str, ext: str, options: dict[str, Any] | None = None
+) -> str:
+    """Build the cache key for an upload.
+
+    Args:
+        content_hash: SHA-256 hex digest of the upload bytes
+        ext: Lowercase file extension without the leading dot
+        options: Conversion options that influence the output
+
+    Returns:
+        Hex digest identifying the conversion
+    """
+    options_json = json.dumps(options or {}, sort_keys=True)
+    material = f"{CONVERTER_VERSION}\0{ext}\0{options_json}\0{content_hash}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ConversionCache:
+    """On-disk LRU cache of conversion results.
+
+    Each entry is a JSON file named after its key. The in-memory index keeps
+    entries in least-recently-used order and is rebuilt from file mtimes on
+    first use, so recency survives restarts. The byte size of an entry
+    includes the images it references, since they must be kept for a hit.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, max_entries: int) -> None:
+        """Initialize the cache.
+
+        Args:
+            directory: Directory holding the cache entries
+            max_bytes: Maximum total size of the entries and their images
+            max_entries: Maximum number of entries
+        """
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._max_entries = max_entries
+        self._index: OrderedDict[str, int] | None = None
+        self._total_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def _entry_path(self, key: str) -> Path:
+        """Return the file path of a cache entry."""
+        return self._directory / f"{key}.json"
+
+    def _load_index(self) -> OrderedDict[str, int]:
+        """Build the LRU index from the entries on disk (oldest first).
+
+        Returns:
+            Mapping of key to entry size in bytes
+        """
+        if self._index is None:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            entries = []
+            for path in self._directory.glob("*.json"):
+                try:
+                    data = json.loads(path.read_text(encoding="utf-8"))
+                    stat = path.stat()
+                    entries.append(
+                        (stat.st_mtime, path.stem, stat.st_size + data["image_bytes"])
+                    )
+                except (OSError, ValueError, KeyError):
+                    path.unlink(missing_ok=True)
+            entries.sort()
+            self._index = OrderedDict((key, size) for _, key, size in entries)
+            self._total_bytes = sum(self._index.values())
+        return self._index
+
+    def _remove(self, key: str) -> None:
+        """Drop an entry from the index and from disk."""
+        index = self._load_index()
+        self._total_bytes -= index.pop(key, 0)
+        self._entry_path(key).unlink(missing_ok=True)
+
+    def get(self, key: str) -> ConvertResponse | None:
+        """Return the cached response for a key, if still valid.
+
+        An entry whose images no longer exist on disk is dropped and counted
+        as a miss.
+
+        Args:
+            key: Cache key from ``cache_key``
+
+        Returns:
+            Cached ConvertResponse, or None on a miss
+        """
+        with self._lock:
+            index = self._load_index()
+            if key not in index:
+                self._misses += 1
+                return None
+
+            path = self._entry_path(key)
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                response = ConvertResponse.model_validate(data["response"])
+            except (OSError, ValueError, KeyError):
+                response = None
+
+            if response is None or not all(
+                image_url_to_path(url).exists() for url in response.images
+            ):
+                self._remove(key)
+                self._misses += 1
+                return None
+
+            index.move_to_end(key)
+            os.utime(path)
+            self._hits += 1
+            return response
+
+    def put(self, key: str, response: ConvertResponse) -> None:
+        """Store a conversion result and evict old entries if needed.
+
+        Args:
+            key: Cache key from ``cache_key``
+            response: Response to cache
+        """
+        image_bytes = 0
+        for url in response.images:
+            try:
+                image_bytes += image_url_to_path(url).stat().st_size
+            except OSError:
+                return  # Incomplete result, don't cache it
+
+        payload = json.dumps(
+            {"response": response.model_dump(), "image_bytes": image_bytes}
+        )
+
+        with self._lock:
+            index = self._load_index()
+            if key in index:
+                self._remove(key)
+
+            path = self._entry_path(key)
+            tmp_path = path.with_suffix(".tmp")
+            try:
+                tmp_path.write_text(payload, encoding="utf-8")
+                tmp_path.replace(path)
+                size = path.stat().st_size + image_bytes
+            except OSError:
+                tmp_path.unlink(missing_ok=True)
+                return  # Caching is best effort
+            index[key] = size
+            self._total_bytes += size
+
+            while index and (
+                len(index) > self._max_entries or self._total_bytes > self._max_bytes
+            ):
+                oldest = next(iter(index))
+                self._remove(oldest)
+                self._evictions += 1
+
+    def stats(self) -> CacheStats:
+        """Return hit/miss counters and current cache occupancy.
+
+        Returns:
+            CacheStats snapshot
+        """
+        with self._lock:
+            index = self._load_index()
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(index),
+                bytes=self._total_bytes,
+                max_entries=self._max_entries,
+                max_bytes=self._max_bytes,
+            )
+
+
+# Global conversion cache instance
+conversion_cache = ConversionCache(
+    directory=config.get_project_path(config.cache_dir),
+    max_bytes=config.cache_max_mb * 1024 * 1024,
+    max_entries=config.cache_max_entries,
+)
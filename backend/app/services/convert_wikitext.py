@@ -1,185 +1,161 @@
 """MediaWiki text conversion service.
 
-This module converts extracted text to MediaWiki markup format.
+This module converts extracted IR blocks to MediaWiki markup format.
 """
 
 import re
-
+from collections.abc import Iterable, Iterator
+
+from app.models.blocks import (
+    Block,
+    Heading,
+    Inline,
+    InlineImage,
+    ListItem,
+    PageBreak,
+    Paragraph,
+    Spacer,
+    Table,
+    TableCell,
+)
 from app.models.dto import ExtractedData
 
 
 def to_wikitext(extracted: ExtractedData) -> tuple[str, list[str]]:
-    """Convert extracted text to MediaWiki markup.
+    """Convert extracted blocks to MediaWiki markup.
 
     Args:
-        extracted: ExtractedData containing text and images
+        extracted: ExtractedData containing blocks and images
 
     Returns:
         Tuple of (wikitext, warnings)
     """
-    warnings = []
-    lines = extracted.text.split("\n")
-    wiki_lines = []
-
-    # Track if we're inside a table
-    in_table = False
-
-    for line in lines:
-        line = line.strip()
+    warnings: list[str] = []
+    wikitext = "\n".join(iter_wikitext(extracted.blocks, warnings))
+    return wikitext, warnings
 
-        # Skip empty lines outside tables
-        if not line:
-            if not in_table:
-                wiki_lines.append("")
-            continue
 
-        # Handle headings (DOCX style markers)
-        if line.startswith("HEADING"):
-            match = re.match(r"HEADING(\d):(.+)", line)
-            if match:
-                level = int(match.group(1))
-                text = match.group(2).strip()
-                equals = "=" * (level + 1)  # MediaWiki uses more = for lower levels
-                wiki_lines.append(f"{equals} {text} {equals}")
-                wiki_lines.append("")
-                continue
-
-        # Handle bullet lists
-        if line.startswith("LIST_BULLET:"):
-            text = line[12:].strip()  # Remove "LIST_BULLET:" prefix
-            formatted = _convert_formatting(text)
-            wiki_lines.append(f"* {formatted}")
-            continue
+def iter_wikitext(blocks: Iterable[Block], warnings: list[str]) -> Iterator[str]:
+    """Convert extracted blocks to MediaWiki markup one line at a time.
 
-        # Handle numbered lists
-        if line.startswith("LIST_NUMBER:"):
-            text = line[12:].strip()  # Remove "LIST_NUMBER:" prefix
-            formatted = _convert_formatting(text)
-            wiki_lines.append(f"# {formatted}")
-            continue
+    Warnings are appended to ``warnings`` once the input is exhausted.
 
-        # Handle tables
-        if line == "TABLE_START":
-            in_table = True
-            wiki_lines.append('{| class="wikitable"')
-            continue
-        elif line == "TABLE_END":
-            in_table = False
-            wiki_lines.append("|}")
-            wiki_lines.append("")
-            continue
-        elif line.startswith("ROW:"):
-            cells = line[4:].split(" | ")
-            wiki_lines.append("|-")
-            for cell in cells:
-                wiki_lines.append(f"| {cell.strip()}")
-            continue
+    Args:
+        blocks: Extracted IR blocks
+        warnings: List receiving conversion warnings
 
-        # Handle PDF page markers (optional: remove or convert)
-        if line.startswith("# Page "):
-            # Skip page markers or convert to comments
+    Yields:
+        MediaWiki lines (without trailing newlines)
+    """
+    has_content = False
+    # Markers of the last list item, reused by nested items below it
+    list_prefix = ""
+
+    for block in blocks:
+        block_type = type(block)
+        if block_type is not ListItem:
+            list_prefix = ""
+
+        if block_type is Paragraph:
+            has_content = True
+            yield _convert_formatting(block.inlines).strip()
+
+        elif block_type is Heading:
+            text = block.text.strip()
+            if text:
+                has_content = True
+                equals = "=" * (
+                    block.level + 1
+                )  # MediaWiki uses more = for lower levels
+                yield f"{equals} {text} {equals}"
+                yield ""
+
+        elif block_type is Spacer:
+            yield ""
+
+        elif block_type is ListItem:
+            has_content = True
+            bullet = "#" if block.ordered else "*"
+            parents = list_prefix[: block.level - 1]
+            list_prefix = parents.ljust(block.level - 1, bullet) + bullet
+            yield f"{list_prefix} {_convert_formatting(block.inlines).strip()}"
+
+        elif block_type is Table:
+            has_content = True
+            yield '{| class="wikitable"'
+            for row in block.rows:
+                yield "|-"
+                for cell in row:
+                    if type(cell) is TableCell:
+                        attributes = _cell_attributes(cell)
+                        if attributes:
+                            yield f"| {attributes} | {cell.text.strip()}"
+                        else:
+                            yield f"| {cell.text.strip()}"
+                    else:
+                        yield f"| {cell.strip()}"
+            yield "|}"
+            yield ""
+
+        elif block_type is PageBreak:
+            # Page boundaries are not rendered
             continue
 
-        # Convert bold/italic and images (basic pattern matching)
-        line = _convert_formatting(line)
-
-        # Convert URLs to MediaWiki format
-        line = _convert_urls(line)
+    # Generate warnings if needed
+    if not has_content:
+        warnings.append("No text content extracted from document")
 
-        wiki_lines.append(line)
 
-    wikitext = "\n".join(wiki_lines)
+def _cell_attributes(cell: TableCell) -> str:
+    """Return the MediaWiki attributes of a merged table cell.
 
-    # Generate warnings if needed
-    if not extracted.text.strip():
-        warnings.append("No text content extracted from document")
+    Args:
+        cell: Merged cell
 
-    return wikitext, warnings
+    Returns:
+        colspan/rowspan attributes, e.g. 'colspan="2" rowspan="3"', or an
+        empty string if the cell covers a single grid position
+    """
+    attributes = []
+    if cell.colspan > 1:
+        attributes.append(f'colspan="{cell.colspan}"')
+    if cell.rowspan > 1:
+        attributes.append(f'rowspan="{cell.rowspan}"')
+    return " ".join(attributes)
 
 
-def _convert_formatting(text: str) -> str:
-    """Convert formatting markers to MediaWiki markup.
+def _convert_formatting(inlines: Iterable[Inline]) -> str:
+    """Convert inline runs and images to MediaWiki markup.
 
     Args:
-        text: Text with formatting markers (BOLD:, ITALIC:, BOLDITALIC:)
+        inlines: Runs and inline images of a paragraph or list item
 
     Returns:
-        Text with MediaWiki formatting (''', '', etc.)
+        Text with MediaWiki formatting (''', '', links and images)
     """
-    # Process text sequentially to handle markers correctly
     result = []
-    i = 0
-    while i < len(text):
-        # Check for IMAGE marker
-        if text[i:].startswith("IMAGE:"):
-            i += 6  # len("IMAGE:")
-            # Find the end of the filename (next marker or end)
-            end = i
-            while end < len(text):
-                if (
-                    text[end:].startswith("BOLD:")
-                    or text[end:].startswith("ITALIC:")
-                    or text[end:].startswith("BOLDITALIC:")
-                    or text[end:].startswith("IMAGE:")
-                ):
-                    break
-                end += 1
-            filename = text[i:end]
-            # Extract just the filename without the /immagini/ prefix
-            clean_filename = filename.split("/")[-1] if "/" in filename else filename
+    for inline in inlines:
+        if type(inline) is InlineImage:
+            # Keep just the filename without the /immagini/ prefix
+            clean_filename = inline.url.rsplit("/", 1)[-1]
             result.append(
                 f'<div class="img_container">[[Immagine:{clean_filename}]]</div>'
             )
-            i = end
-        # Check for BOLDITALIC marker
-        elif text[i:].startswith("BOLDITALIC:"):
-            i += 11  # len("BOLDITALIC:")
-            # Find the end of this formatted section (next marker or end)
-            end = i
-            while end < len(text):
-                if (
-                    text[end:].startswith("BOLD:")
-                    or text[end:].startswith("ITALIC:")
-                    or text[end:].startswith("BOLDITALIC:")
-                    or text[end:].startswith("IMAGE:")
-                ):
-                    break
-                end += 1
-            result.append(f"'''''{text[i:end]}'''''")
-            i = end
-        # Check for BOLD marker
-        elif text[i:].startswith("BOLD:"):
-            i += 5  # len("BOLD:")
-            end = i
-            while end < len(text):
-                if (
-                    text[end:].startswith("BOLD:")
-                    or text[end:].startswith("ITALIC:")
-                    or text[end:].startswith("BOLDITALIC:")
-                    or text[end:].startswith("IMAGE:")
-                ):
-                    break
-                end += 1
-            result.append(f"'''{text[i:end]}'''")
-            i = end
-        # Check for ITALIC marker
-        elif text[i:].startswith("ITALIC:"):
-            i += 7  # len("ITALIC:")
-            end = i
-            while end < len(text):
-                if (
-                    text[end:].startswith("BOLD:")
-                    or text[end:].startswith("ITALIC:")
-                    or text[end:].startswith("BOLDITALIC:")
-                    or text[end:].startswith("IMAGE:")
-                ):
-                    break
-                end += 1
-            result.append(f"''{text[i:end]}''")
-            i = end
+            continue
+
+        text = inline.text
+        if "http" in text:
+            # Convert URLs to MediaWiki format
+            text = _convert_urls(text)
+
+        if inline.bold and inline.italic:
+            result.append(f"'''''{text}'''''")
+        elif inline.bold:
+            result.append(f"'''{text}'''")
+        elif inline.italic:
+            result.append(f"''{text}''")
         else:
-            result.append(text[i])
-            i += 1
+            result.append(text)
 
     return "".join(result)
 
@@ -0,0 +1,759 @@
+"""Streaming DOCX reader over ``word/document.xml``.
+
+python-docx builds the object model of the whole document before the first
+paragraph can be read, and lists paragraphs and tables separately, so every
+table ends up after the text. This reader iterparses the main document part
+once instead: each child of the body is turned into blocks as soon as its
+end tag is read, in body order, and is then discarded, so memory is bounded
+by the largest paragraph or table rather than by the document.
+
+Only the package parts needed for the conversion are read: the package and
+document relationships, the styles and numbering (indexed once, see
+``StyleIndex``) and the core properties. Images
+are saved when a paragraph first references them. lxml is installed with
+python-docx, which remains the fallback engine (see ``extract_docx``).
+"""
+
+import posixpath
+import zipfile
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from lxml import etree
+
+from app.models.blocks import (
+    Block,
+    Heading,
+    Inline,
+    InlineImage,
+    ListItem,
+    Paragraph,
+    Run,
+    Table,
+    TableCell,
+)
+from app.services.progress import CountingReader, ProgressReporter
+from app.services.storage import save_image
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_DC = "{http://purl.org/dc/elements/1.1/}"
+_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+_BLIP = "{http://schemas.openxmlformats.org/drawingml/2006/main}blip"
+
+_BODY = f"{_W}body"
+_P = f"{_W}p"
+_R_RUN = f"{_W}r"
+_TBL = f"{_W}tbl"
+_TR = f"{_W}tr"
+_TC = f"{_W}tc"
+_T = f"{_W}t"
+_SDT = f"{_W}sdt"
+_SDT_CONTENT = f"{_W}sdtContent"
+_VAL = f"{_W}val"
+
+# Relationship types (suffixes of the full type URIs)
+_OFFICE_DOCUMENT = "/officeDocument"
+_STYLES = "/styles"
+_NUMBERING = "/numbering"
+_IMAGE = "/image"
+_CORE_PROPERTIES = "/core-properties"
+
+# Paragraph children whose runs are part of the paragraph text
+_RUN_CONTAINERS = frozenset(
+    f"{_W}{name}"
+    for name in (
+        "hyperlink",
+        "ins",
+        "moveTo",
+        "smartTag",
+        "customXml",
+        "fldSimple",
+        "sdt",
+        "sdtContent",
+        "dir",
+        "bdo",
+    )
+)
+
+# Run children rendered as text, as python-docx's ``Run.text`` does
+_RUN_TEXT = {
+    f"{_W}tab": "\t",
+    f"{_W}ptab": "\t",
+    f"{_W}br": "\n",
+    f"{_W}cr": "\n",
+    f"{_W}noBreakHyphen": "-",
+}
+
+# Built-in styles stored under a lowercase name, reported by python-docx
+# under their UI name
+_UI_STYLE_NAMES = {
+    name.lower(): name
+    for name in ("Caption", "Footer", "Header", *(f"Heading {n}" for n in range(1, 10)))
+}
+
+# Number formats of bulleted (or unnumbered) list levels
+_UNNUMBERED_FORMATS = frozenset(("bullet", "none"))
+
+# Values of a toggle property (w:b, w:i) that switch it off
+_OFF = frozenset(("0", "false", "off"))
+
+# Package parts are parsed without resolving entities, like python-docx does
+_PARSER = etree.XMLParser(resolve_entities=False)
+
+# Extensions kept for saved images; anything else is saved as PNG
+_IMAGE_EXTENSIONS = frozenset(("png", "jpg", "jpeg", "gif", "bmp"))
+
+
+class _Relationship:
+    """Relationship of a package part.
+
+    Attributes:
+        type: Relationship type URI
+        target: Package part name of the target (without leading slash)
+    """
+
+    __slots__ = ("target", "type")
+
+    def __init__(self, type_: str, target: str) -> None:
+        self.type = type_
+        self.target = target
+
+
+def _read_relationships(
+    zip_ref: zipfile.ZipFile, part_name: str
+) -> dict[str, _Relationship]:
+    """Read the internal relationships of a package part.
+
+    Args:
+        zip_ref: Open package
+        part_name: Part name, e.g. "word/document.xml" ("" for the package)
+
+    Returns:
+        Mapping of relationship id to relationship (empty if none)
+    """
+    directory, name = posixpath.split(part_name)
+    rels_name = posixpath.join(directory, "_rels", f"{name}.rels")
+    try:
+        root = etree.fromstring(zip_ref.read(rels_name), _PARSER)
+    except KeyError:
+        return {}
+
+    relationships = {}
+    for rel in root.iter(_REL):
+        if rel.get("TargetMode") == "External":
+            continue
+        target = rel.get("Target", "")
+        if target.startswith("/"):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join(directory, target))
+        relationships[rel.get("Id")] = _Relationship(rel.get("Type", ""), target)
+    return relationships
+
+
+def _find_part(relationships: dict[str, _Relationship], suffix: str) -> str | None:
+    """Return the target of the first relationship of a type, if any."""
+    for rel in relationships.values():
+        if rel.type.endswith(suffix):
+            return rel.target
+    return None
+
+
+def _read_part(
+    zip_ref: zipfile.ZipFile, part_name: str | None
+) -> etree._Element | None:
+    """Parse an XML part of the package, or return None if it is missing."""
+    if part_name is None:
+        return None
+    try:
+        return etree.fromstring(zip_ref.read(part_name), _PARSER)
+    except KeyError:
+        return None
+
+
+def _int_value(element: etree._Element | None, default: int) -> int:
+    """Return the integer ``w:val`` of an element, or a default."""
+    if element is None:
+        return default
+    try:
+        return int(element.get(_VAL, default))
+    except ValueError:
+        return default
+
+
+def _level_formats(parent: etree._Element, formats: dict[int, str]) -> None:
+    """Add the numFmt of the ``w:lvl`` children of an element, by ilvl."""
+    for lvl in parent.iterchildren(f"{_W}lvl"):
+        ilvl = lvl.get(f"{_W}ilvl")
+        if ilvl is None or not ilvl.isdigit():
+            continue
+        num_fmt = lvl.find(f"{_W}numFmt")
+        formats[int(ilvl)] = (
+            num_fmt.get(_VAL, "decimal") if num_fmt is not None else "decimal"
+        )
+
+
+class StyleIndex:
+    """Paragraph styles and list numbering of a document, indexed once.
+
+    ``styles.xml`` and ``numbering.xml`` are read when the document is
+    opened, so classifying a paragraph is a few dict lookups instead of a
+    walk of the styles part per access, as python-docx does for
+    ``paragraph.style``. Used by both DOCX engines.
+
+    Attributes:
+        names: Paragraph style id to style name
+        default_style: Id of the default paragraph style
+        heading_levels: Style id to heading level, for heading styles
+        style_numbering: Style id to (numId, ilvl), for styles with numbering
+        formats: (numId, ilvl) to number format ("decimal", "bullet", ...)
+    """
+
+    def __init__(
+        self, styles: etree._Element | None, numbering: etree._Element | None
+    ) -> None:
+        """Build the indexes.
+
+        Args:
+            styles: Root of the styles part, or None if there is none
+            numbering: Root of the numbering part, or None if there is none
+        """
+        self.names: dict[str, str] = {}
+        self.default_style = ""
+        self.heading_levels: dict[str, int] = {}
+        self.style_numbering: dict[str, tuple[str, int]] = {}
+        self.formats: dict[tuple[str, int], str] = {}
+
+        based_on: dict[str, str] = {}
+        own_levels: dict[str, int | None] = {}
+        own_numbering: dict[str, tuple[str | None, int | None]] = {}
+        if styles is not None:
+            for style in styles.iterchildren(f"{_W}style"):
+                style_id = style.get(f"{_W}styleId")
+                style_type = style.get(f"{_W}type", "paragraph")
+                if style_id is None or style_type not in ("paragraph", "numbering"):
+                    continue
+                parent = style.find(f"{_W}basedOn")
+                if parent is not None:
+                    based_on[style_id] = parent.get(_VAL, "")
+                properties = style.find(f"{_W}pPr")
+                num_pr = None if properties is None else properties.find(f"{_W}numPr")
+                if num_pr is not None:
+                    num_id = num_pr.find(f"{_W}numId")
+                    own_numbering[style_id] = (
+                        None if num_id is None else num_id.get(_VAL),
+                        _int_value(num_pr.find(f"{_W}ilvl"), None),
+                    )
+                if style_type != "paragraph":
+                    continue
+
+                name_element = style.find(f"{_W}name")
+                name = (
+                    name_element.get(_VAL, style_id) if name_element is not None else ""
+                )
+                name = _UI_STYLE_NAMES.get(name, name)
+                self.names[style_id] = name
+                if style.get(f"{_W}default") in ("1", "true", "on"):
+                    self.default_style = style_id
+                # Built-in heading names win, then the outline level; level 9
+                # is body text and stops inheritance from the base style
+                level = name.removeprefix("Heading ")
+                if name.startswith("Heading ") and level.isdigit():
+                    own_levels[style_id] = int(level)
+                elif properties is not None:
+                    outline = _int_value(properties.find(f"{_W}outlineLvl"), -1)
+                    if 0 <= outline < 9:
+                        own_levels[style_id] = outline + 1
+                    elif outline >= 9:
+                        own_levels[style_id] = None
+
+        for style_id in self.names:
+            level = self._inherited(style_id, own_levels, based_on)
+            if level is not None:
+                self.heading_levels[style_id] = level
+        own_num_ids = {
+            style_id: num_id
+            for style_id, (num_id, _ilvl) in own_numbering.items()
+            if num_id is not None
+        }
+        for style_id, (_num_id, ilvl) in own_numbering.items():
+            num_id = self._inherited(style_id, own_num_ids, based_on)
+            if num_id is not None:
+                self.style_numbering[style_id] = (num_id, ilvl or 0)
+
+        if numbering is not None:
+            self._read_numbering(numbering)
+
+    @staticmethod
+    def _inherited(
+        style_id: str | None, own: dict[str, Any], based_on: dict[str, str]
+    ) -> Any:
+        """Return a style property, looked up along the basedOn chain."""
+        seen = set()
+        while style_id is not None and style_id not in seen:
+            if style_id in own:
+                return own[style_id]
+            seen.add(style_id)
+            style_id = based_on.get(style_id)
+        return None
+
+    def _read_numbering(self, numbering: etree._Element) -> None:
+        """Index the number format of every (numId, ilvl) of the numbering part."""
+        abstract: dict[str, dict[int, str]] = {}
+        links: dict[str, str] = {}
+        for abstract_num in numbering.iterchildren(f"{_W}abstractNum"):
+            abstract_id = abstract_num.get(f"{_W}abstractNumId", "")
+            _level_formats(abstract_num, abstract.setdefault(abstract_id, {}))
+            link = abstract_num.find(f"{_W}numStyleLink")
+            if link is not None:
+                links[abstract_id] = link.get(_VAL, "")
+
+        nums: dict[str, tuple[str, etree._Element]] = {}
+        for num in numbering.iterchildren(f"{_W}num"):
+            abstract_id = num.find(f"{_W}abstractNumId")
+            if abstract_id is not None:
+                nums[num.get(f"{_W}numId", "")] = (abstract_id.get(_VAL, ""), num)
+
+        for num_id, (abstract_id, num) in nums.items():
+            levels = abstract.get(abstract_id, {})
+            if abstract_id in links:
+                # Levels defined by a numbering style, through its own numId
+                linked = self.style_numbering.get(links[abstract_id])
+                if linked is not None and linked[0] in nums:
+                    levels = abstract.get(nums[linked[0]][0], levels)
+            levels = dict(levels)
+            for override in num.iterchildren(f"{_W}lvlOverride"):
+                _level_formats(override, levels)
+            for ilvl, num_fmt in levels.items():
+                self.formats[num_id, ilvl] = num_fmt
+
+    def paragraph_style(self, properties: etree._Element | None) -> str:
+        """Return the style id of a paragraph.
+
+        Args:
+            properties: ``w:pPr`` of the paragraph, if any
+
+        Returns:
+            Style id, the default paragraph style if none is set
+        """
+        if properties is not None:
+            style = properties.find(f"{_W}pStyle")
+            if style is not None:
+                return style.get(_VAL, self.default_style)
+        return self.default_style
+
+    def list_numbering(
+        self, properties: etree._Element | None, style_id: str
+    ) -> tuple[bool, int] | None:
+        """Return how a paragraph is numbered, if it is a list item.
+
+        The paragraph's ``w:numPr`` overrides the numbering of its style;
+        numId 0 removes the numbering.
+
+        Args:
+            properties: ``w:pPr`` of the paragraph, if any
+            style_id: Style id of the paragraph
+
+        Returns:
+            Tuple of (whether the list is numbered rather than bulleted,
+            nesting depth from 1), or None if the paragraph is not numbered
+        """
+        num_id, ilvl = self.style_numbering.get(style_id, (None, 0))
+        num_pr = None if properties is None else properties.find(f"{_W}numPr")
+        if num_pr is not None:
+            element = num_pr.find(f"{_W}numId")
+            if element is not None:
+                num_id = element.get(_VAL)
+            ilvl = _int_value(num_pr.find(f"{_W}ilvl"), ilvl)
+        if num_id is None or num_id == "0":
+            return None
+        num_fmt = self.formats.get((num_id, ilvl), "bullet")
+        return num_fmt not in _UNNUMBERED_FORMATS, min(max(ilvl, 0), 8) + 1
+
+
+def _read_metadata(zip_ref: zipfile.ZipFile, part_name: str | None) -> dict[str, str]:
+    """Read title, author and subject from the core properties part."""
+    metadata = {"title": "", "author": "", "subject": ""}
+    root = _read_part(zip_ref, part_name)
+    if root is None:
+        return metadata
+    for key, tag in (("title", "title"), ("author", "creator"), ("subject", "subject")):
+        element = root.find(f"{_DC}{tag}")
+        if element is not None and element.text:
+            metadata[key] = element.text
+    return metadata
+
+
+class DocxPackage:
+    """DOCX package opened for streaming.
+
+    Attributes:
+        zip_ref: Open package
+        document_part: Part name of the main document
+        relationships: Relationships of the main document
+        styles: Style and numbering index
+        metadata: Title, author and subject
+    """
+
+    def __init__(self, file_path: Path) -> None:
+        """Open a package and read the parts needed before the body.
+
+        Args:
+            file_path: Path to DOCX file
+
+        Raises:
+            ValueError: If the file is not a WordprocessingML package
+        """
+        try:
+            self.zip_ref = zipfile.ZipFile(str(file_path), "r")
+        except (OSError, zipfile.BadZipFile) as e:
+            raise ValueError(f"Not a DOCX package: {e}") from e
+        try:
+            package_rels = _read_relationships(self.zip_ref, "")
+            document_part = _find_part(package_rels, _OFFICE_DOCUMENT)
+            if document_part is None or document_part not in self.zip_ref.NameToInfo:
+                raise ValueError("Main document part not found")
+            self.document_part = document_part
+            self.relationships = _read_relationships(self.zip_ref, document_part)
+            self.styles = StyleIndex(
+                _read_part(self.zip_ref, _find_part(self.relationships, _STYLES)),
+                _read_part(self.zip_ref, _find_part(self.relationships, _NUMBERING)),
+            )
+            self.metadata = _read_metadata(
+                self.zip_ref, _find_part(package_rels, _CORE_PROPERTIES)
+            )
+        except ValueError:
+            self.zip_ref.close()
+            raise
+        except (etree.XMLSyntaxError, zipfile.BadZipFile, OSError) as e:
+            self.zip_ref.close()
+            raise ValueError(f"Invalid DOCX package: {e}") from e
+
+    def close(self) -> None:
+        """Close the package."""
+        self.zip_ref.close()
+
+
+class _ImageResolver:
+    """Saves the images of a document the first time they are referenced."""
+
+    def __init__(
+        self, package: DocxPackage, images: list[str], job_id: str | None
+    ) -> None:
+        """Initialize the resolver.
+
+        Args:
+            package: Open package
+            images: List of saved image URLs, extended in place
+            job_id: Optional job ID for organizing extracted images
+        """
+        self._package = package
+        self._images = images
+        self._job_id = job_id
+        self._urls: dict[str, str | None] = {}
+        # Several relationships may point to the same image part
+        self._targets: dict[str, str] = {}
+
+    def url(self, rel_id: str) -> str | None:
+        """Return the URL of an image relationship, saving the image if needed.
+
+        Args:
+            rel_id: Relationship id referenced by an ``a:blip``
+
+        Returns:
+            Saved image URL, or None if the relationship is not an image
+        """
+        if rel_id in self._urls:
+            return self._urls[rel_id]
+
+        url = None
+        rel = self._package.relationships.get(rel_id)
+        if rel is not None and rel.type.endswith(_IMAGE):
+            url = self._targets.get(rel.target) or self._save(rel.target)
+        self._urls[rel_id] = url
+        return url
+
+    def _save(self, target: str) -> str | None:
+        """Save an image part, or return None if it is missing."""
+        try:
+            image_bytes = self._package.zip_ref.read(target)
+        except KeyError:
+            return None
+        stem, _, ext = posixpath.basename(target).rpartition(".")
+        ext = ext.lower()
+        if ext not in _IMAGE_EXTENSIONS:
+            ext = "png"
+        url = save_image(image_bytes, ext, f"docx_{stem}", self._job_id)
+        self._images.append(url)
+        self._targets[target] = url
+        return url
+
+
+def _iter_runs(element: etree._Element) -> Iterator[etree._Element]:
+    """Yield the runs of a paragraph in order, including hyperlinks and insertions."""
+    for child in element:
+        tag = child.tag
+        if tag == _R_RUN:
+            yield child
+        elif tag in _RUN_CONTAINERS:
+            yield from _iter_runs(child)
+
+
+def _run_text(run: etree._Element) -> str:
+    """Return the text of a run, with tabs and breaks as python-docx renders them."""
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == _T:
+            if child.text:
+                parts.append(child.text)
+        elif tag in _RUN_TEXT:
+            parts.append(_RUN_TEXT[tag])
+    return "".join(parts)
+
+
+def _toggle(properties: etree._Element | None, tag: str) -> bool:
+    """Return whether a toggle property (bold, italic) is set on a run."""
+    if properties is None:
+        return False
+    element = properties.find(tag)
+    return element is not None and element.get(_VAL, "true").lower() not in _OFF
+
+
+def _paragraph_content(
+    p: etree._Element, images: _ImageResolver
+) -> tuple[str, list[Inline], bool]:
+    """Read the text and the inline content of a paragraph.
+
+    Args:
+        p: ``w:p`` element
+        images: Image resolver of the document
+
+    Returns:
+        Tuple of (plain text, runs merged by formatting and images,
+        whether the paragraph references an image)
+    """
+    text_parts = []
+    inlines: list[Inline] = []
+    seen_images = set()
+    has_images = False
+
+    for run in _iter_runs(p):
+        blips = list(run.iter(_BLIP))
+        text = _run_text(run)
+        text_parts.append(text)
+
+        if blips:
+            # Runs holding a drawing contribute the image, not their text
+            has_images = True
+            for blip in blips:
+                rel_id = blip.get(f"{_R}embed")
+                url = images.url(rel_id) if rel_id else None
+                if url is not None and url not in seen_images:
+                    seen_images.add(url)
+                    inlines.append(InlineImage(url))
+            continue
+        if not text:
+            continue
+
+        properties = run.find(f"{_W}rPr")
+        bold = _toggle(properties, f"{_W}b")
+        italic = _toggle(properties, f"{_W}i")
+        last = inlines[-1] if inlines else None
+        if type(last) is Run and last.bold == bold and last.italic == italic:
+            last.text += text
+        else:
+            inlines.append(Run(text, bold=bold, italic=italic))
+
+    return "".join(text_parts), inlines, has_images
+
+
+def _paragraph_block(
+    p: etree._Element, package: DocxPackage, images: _ImageResolver
+) -> Block | None:
+    """Convert a body paragraph to a block, with the rules of the python-docx engine.
+
+    Args:
+        p: ``w:p`` element
+        package: Open package (for the style index)
+        images: Image resolver of the document
+
+    Returns:
+        Heading, list item or paragraph block, or None for an empty paragraph
+    """
+    text, inlines, has_images = _paragraph_content(p, images)
+    stripped = text.strip()
+    if not stripped and not has_images:
+        return None
+
+    properties = p.find(f"{_W}pPr")
+    styles = package.styles
+    style_id = styles.paragraph_style(properties)
+
+    level = styles.heading_levels.get(style_id)
+    if stripped and level is not None:
+        return Heading(level, stripped)
+
+    if not stripped:
+        # Image-only paragraph
+        return Paragraph(inlines) if inlines else None
+
+    numbering = styles.list_numbering(properties, style_id)
+    if numbering is not None:
+        ordered, depth = numbering
+        return ListItem(inlines, ordered=ordered, level=depth)
+
+    if "List" in styles.names.get(style_id, ""):
+        return ListItem(inlines)
+
+    return Paragraph(inlines) if inlines else None
+
+
+def _cell_text(tc: etree._Element) -> str:
+    """Return the text of a table cell (its paragraphs joined by newlines)."""
+    paragraphs = (
+        "".join(_run_text(run) for run in _iter_runs(p)) for p in tc.iterchildren(_P)
+    )
+    return "\n".join(paragraphs).strip()
+
+
+def _grid_value(properties: etree._Element | None, tag: str) -> int:
+    """Return a grid count property (gridSpan, gridBefore) of a cell or row."""
+    if properties is None:
+        return 0
+    element = properties.find(tag)
+    if element is None:
+        return 0
+    try:
+        return int(element.get(_VAL, "0"))
+    except ValueError:
+        return 0
+
+
+def table_block(tbl: etree._Element) -> Table:
+    """Convert a table to a block, resolving merged cells.
+
+    Rows and cells are walked once, tracking the grid column of each cell,
+    so the cost is linear in the number of cells. A cell with ``gridSpan``
+    becomes a ``TableCell`` with a colspan. A vertical merge (``vMerge``)
+    becomes one ``TableCell`` with a rowspan; its continuation cells are
+    left out, as MediaWiki expects.
+
+    Also used by the python-docx engine, on the underlying ``w:tbl``.
+
+    Args:
+        tbl: ``w:tbl`` element
+
+    Returns:
+        Table block
+    """
+    rows = []
+    # Vertical merges still open, by grid column of their first cell
+    merges: dict[int, TableCell] = {}
+    for tr in tbl.iterchildren(_TR):
+        row: list[str | TableCell] = []
+        continued = set()
+        column = _grid_value(tr.find(f"{_W}trPr"), f"{_W}gridBefore")
+        for tc in tr.iterchildren(_TC):
+            properties = tc.find(f"{_W}tcPr")
+            span = max(1, _grid_value(properties, f"{_W}gridSpan"))
+            merge = None if properties is None else properties.find(f"{_W}vMerge")
+            if merge is not None and merge.get(_VAL, "continue") != "restart":
+                cell = merges.get(column)
+                if cell is not None:
+                    cell.rowspan += 1
+                    continued.add(column)
+                    column += span
+                    continue
+
+            text = _cell_text(tc)
+            if merge is not None:
+                cell = TableCell(text, colspan=span)
+                merges[column] = cell
+                continued.add(column)
+                row.append(cell)
+            elif span > 1:
+                row.append(TableCell(text, colspan=span))
+            else:
+                row.append(text)
+            column += span
+
+        # A merge ends at the first row that does not continue it
+        for start in [start for start in merges if start not in continued]:
+            del merges[start]
+        rows.append(row)
+    return Table(rows)
+
+
+def _body_blocks(
+    element: etree._Element, package: DocxPackage, images: _ImageResolver
+) -> Iterator[Block]:
+    """Convert a child of the body (or of a block content control) to blocks."""
+    tag = element.tag
+    if tag == _P:
+        block = _paragraph_block(element, package, images)
+        if block is not None:
+            yield block
+    elif tag == _TBL:
+        yield table_block(element)
+    elif tag == _SDT:
+        content = element.find(_SDT_CONTENT)
+        if content is not None:
+            for child in content:
+                yield from _body_blocks(child, package, images)
+
+
+def iter_body_blocks(
+    package: DocxPackage,
+    images: list[str],
+    job_id: str | None = None,
+    progress: ProgressReporter | None = None,
+) -> Iterator[Block]:
+    """Yield the blocks of a document in body order, parsing it once.
+
+    The package is closed when the generator finishes.
+
+    Args:
+        package: Open package
+        images: List of saved image URLs, extended while iterating
+        job_id: Optional job ID for organizing extracted images
+        progress: Optional reporter of the document bytes parsed
+
+    Yields:
+        Heading, paragraph, list and table blocks
+
+    Raises:
+        ValueError: If the document cannot be parsed
+    """
+    resolver = _ImageResolver(package, images, job_id)
+    try:
+        info = package.zip_ref.getinfo(package.document_part)
+        with package.zip_ref.open(info) as raw:
+            source = CountingReader(raw)
+            if progress is not None:
+                progress.start("bytes", info.file_size)
+            events = etree.iterparse(
+                source,
+                events=("end",),
+                tag=(_P, _TBL, _SDT),
+                resolve_entities=False,
+            )
+            for _, element in events:
+                parent = element.getparent()
+                if parent is None or parent.tag != _BODY:
+                    continue  # Nested: converted with its body-level ancestor
+                yield from _body_blocks(element, package, resolver)
+                # Drop the converted element and its tail to bound memory
+                element.clear()
+                while element.getprevious() is not None:
+                    del parent[0]
+                if progress is not None:
+                    progress.update(source.position, len(images))
+        if progress is not None:
+            progress.finish(len(images))
+    except etree.XMLSyntaxError as e:
+        raise ValueError(f"Failed to extract DOCX: {e}") from e
+    finally:
+        package.close()
@@ -0,0 +1,12 @@
+"""Errors shared by the extractors and the conversion pipeline.
+
+This module has no dependencies, so the extractors can raise these errors
+in worker processes without importing the pipeline and the web stack.
+"""
+
+
+class PageSelectionError(ValueError):
+    """Raised when a well-formed page selection matches no page of the PDF.
+
+    Unlike a failed extraction this is a client error, reported as HTTP 400.
+    """
@@ -0,0 +1,114 @@
+"""Execution backend for blocking conversion work.
+
+The extractors and the wikitext renderer are synchronous functions. This
+module lets the async routers await them without blocking the event loop:
+I/O-bound steps (saving uploads, writing output) go to a thread pool, while
+CPU-bound steps (PyMuPDF, python-docx, wikitext rendering) go to a process
+pool. Setting ``execution_mode`` to ``"sync"`` keeps the old inline behavior.
+"""
+
+import asyncio
+import multiprocessing
+import sys
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any
+
+from app.core.config import config
+
+_io_executor: ThreadPoolExecutor | None = None
+_cpu_executor: Executor | None = None
+
+
+def _get_io_executor() -> ThreadPoolExecutor:
+    """Return the shared I/O thread pool, creating it on first use.
+
+    Returns:
+        Thread pool used for blocking file operations
+    """
+    global _io_executor
+    if _io_executor is None:
+        _io_executor = ThreadPoolExecutor(
+            max_workers=config.io_pool_workers, thread_name_prefix="io"
+        )
+    return _io_executor
+
+
+def _get_cpu_executor() -> Executor:
+    """Return the shared CPU executor, creating it on first use.
+
+    A spawn-based process pool is used so workers never inherit the server's
+    threads. The PyInstaller build cannot re-import the backend package in
+    spawned children, so it falls back to a single worker thread (PyMuPDF is
+    not safe to drive from several threads at once).
+
+    Returns:
+        Executor used for extraction and rendering
+    """
+    global _cpu_executor
+    if _cpu_executor is None:
+        if getattr(sys, "frozen", False):
+            _cpu_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cpu")
+        else:
+            _cpu_executor = ProcessPoolExecutor(
+                max_workers=config.cpu_pool_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+    return _cpu_executor
+
+
+async def _run_in(executor: Executor, func: Callable[..., Any], *args: Any) -> Any:
+    """Run ``func(*args)`` in ``executor`` and await its result.
+
+    Args:
+        executor: Target executor
+        func: Function to call (must be picklable for process pools)
+        *args: Positional arguments for ``func``
+
+    Returns:
+        The function's return value
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(func, *args))
+
+
+async def run_io(func: Callable[..., Any], *args: Any) -> Any:
+    """Run a blocking I/O-bound function off the event loop.
+
+    Args:
+        func: Function to call
+        *args: Positional arguments for ``func``
+
+    Returns:
+        The function's return value
+    """
+    if config.execution_mode == "sync":
+        return func(*args)
+    return await _run_in(_get_io_executor(), func, *args)
+
+
+async def run_cpu(func: Callable[..., Any], *args: Any) -> Any:
+    """Run a CPU-bound function in the worker process pool.
+
+    Args:
+        func: Module-level function to call (arguments and result are pickled)
+        *args: Positional arguments for ``func``
+
+    Returns:
+        The function's return value
+    """
+    if config.execution_mode == "sync":
+        return func(*args)
+    return await _run_in(_get_cpu_executor(), func, *args)
+
+
+def shutdown_executors() -> None:
+    """Shut down the worker pools (called on application shutdown)."""
+    global _io_executor, _cpu_executor
+    if _io_executor is not None:
+        _io_executor.shutdown(wait=True)
+        _io_executor = None
+    if _cpu_executor is not None:
+        _cpu_executor.shutdown(wait=True, cancel_futures=True)
+        _cpu_executor = None
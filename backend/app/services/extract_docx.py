@@ -1,18 +1,41 @@
-"""DOCX extraction service using python-docx.
+"""DOCX extraction service.
 
-This module handles extraction of text and images from Word documents.
+This module handles extraction of text and images from Word documents. The
+default engine streams ``word/document.xml`` in body order (see
+``app.services.docx_stream``); the python-docx engine is kept as a fallback
+for packages the streaming reader cannot open, or when selected with
+``docx_engine``. python-docx is only imported when it is used.
 """
 
-import zipfile
+import logging
+import posixpath
+from collections.abc import Iterator
 from pathlib import Path
 
-from docx import Document
-
-from app.models.dto import ExtractedData
+from app.core.config import config
+from app.models.blocks import (
+    Block,
+    Heading,
+    Inline,
+    InlineImage,
+    ListItem,
+    Paragraph,
+    Run,
+)
+from app.models.dto import ExtractedData, ExtractedStream
+from app.services.docx_stream import (
+    DocxPackage,
+    StyleIndex,
+    iter_body_blocks,
+    table_block,
+)
+from app.services.progress import ProgressReporter
 from app.services.storage import save_image
 
+logger = logging.getLogger(__name__)
+
 
-def _extract_formatted_text(paragraph, image_map: dict) -> str:
+def _extract_formatted_text(paragraph, image_map: dict) -> list[Inline]:
     """Extract text from paragraph preserving bold and italic formatting.
 
     Args:
@@ -20,7 +43,7 @@ def _extract_formatted_text(paragraph, image_map: dict) -> str:
         image_map: Dictionary mapping rId to image filename
 
     Returns:
-        Text with formatting markers (BOLD:text, ITALIC:text, IMAGE:filename)
+        Runs (consecutive runs with the same formatting merged) and images
     """
     # Track images already processed to avoid duplicates
     images_found = set()
@@ -69,13 +92,13 @@ def _extract_formatted_text(paragraph, image_map: dict) -> str:
         run_data.append((format_type, text))
 
     # Merge consecutive runs with same formatting
-    result_parts = []
+    result_parts: list[Inline] = []
     i = 0
     while i < len(run_data):
         format_type, content = run_data[i]
 
         if format_type == "IMAGE":
-            result_parts.append(f"IMAGE:{content}")
+            result_parts.append(InlineImage(content))
             i += 1
             continue
 
@@ -88,10 +111,13 @@ def _extract_formatted_text(paragraph, image_map: dict) -> str:
 
         # Add formatted text
         full_text = "".join(accumulated_text)
-        if format_type == "NORMAL":
-            result_parts.append(full_text)
-        else:
-            result_parts.append(f"{format_type}:{full_text}")
+        result_parts.append(
+            Run(
+                full_text,
+                bold=format_type in ("BOLD", "BOLDITALIC"),
+                italic=format_type in ("ITALIC", "BOLDITALIC"),
+            )
+        )
 
         i = j
 
@@ -105,45 +131,50 @@ def _extract_formatted_text(paragraph, image_map: dict) -> str:
             if embed and embed in image_map:
                 img_filename = image_map[embed]
                 if img_filename not in images_found:
-                    result_parts.append(f"IMAGE:{img_filename}")
+                    result_parts.append(InlineImage(img_filename))
                     images_found.add(img_filename)
     except Exception:
         pass
 
-    return "".join(result_parts)
+    return result_parts
 
 
-def extract_docx(file_path: Path, job_id: str | None = None) -> ExtractedData:
-    """Extract text and images from DOCX file.
+def _numbering_element(doc):
+    """Return the root of the numbering part of a document, if it has one."""
+    try:
+        return doc.part.numbering_part.element
+    except NotImplementedError:
+        return None  # python-docx cannot create a missing numbering part
 
-    Args:
-        file_path: Path to DOCX file
-        job_id: Optional job ID for organizing extracted images
 
-    Returns:
-        ExtractedData with text, images, and metadata
-    """
-    text_content = []
-    images_list = []
-    metadata = {}
+def _iter_docx_blocks(
+    doc, image_map: dict[str, str], progress: ProgressReporter | None = None
+) -> Iterator[Block]:
+    """Yield the blocks of a loaded document.
 
-    try:
-        # Load document
-        doc = Document(str(file_path))
+    Args:
+        doc: python-docx Document object
+        image_map: Dictionary mapping rId to saved image URL
+        progress: Optional reporter of processed paragraphs and tables
 
-        # Extract metadata (core properties)
-        if hasattr(doc.core_properties, "title"):
-            metadata["title"] = doc.core_properties.title or ""
-        if hasattr(doc.core_properties, "author"):
-            metadata["author"] = doc.core_properties.author or ""
-        if hasattr(doc.core_properties, "subject"):
-            metadata["subject"] = doc.core_properties.subject or ""
+    Yields:
+        Paragraph, heading and list blocks, then tables
 
-        # First, extract all images and create a map of rId -> filename
-        image_map = _extract_images_and_create_map(file_path, doc, job_id)
+    Raises:
+        ValueError: If the document cannot be walked
+    """
+    try:
+        styles = StyleIndex(doc.styles.element, _numbering_element(doc))
+        paragraphs = doc.paragraphs
+        tables = doc.tables
+        if progress is not None:
+            progress.start("blocks", len(paragraphs) + len(tables), len(image_map))
 
         # Extract text from paragraphs with formatting
-        for para in doc.paragraphs:
+        for index, para in enumerate(paragraphs):
+            if progress is not None:
+                progress.update(index, len(image_map))
+
             # Check if paragraph has images even without text
             has_images_in_para = False
             try:
@@ -154,178 +185,193 @@ def extract_docx(file_path: Path, job_id: str | None = None) -> ExtractedData:
                 pass
 
             # Skip only if no text AND no images
-            if not para.text.strip() and not has_images_in_para:
+            text = para.text.strip()
+            if not text and not has_images_in_para:
                 continue
 
+            # Styles and numbering are looked up in the index, not via para.style
+            properties = para._p.pPr
+            style_id = styles.paragraph_style(properties)
+
             # Detect heading styles (only if there's text)
-            if para.text.strip() and para.style.name.startswith("Heading"):
-                level = para.style.name.replace("Heading", "").strip()
-                if level.isdigit():
-                    text_content.append(f"HEADING{level}:{para.text.strip()}")
-                else:
-                    text_content.append(para.text.strip())
+            level = styles.heading_levels.get(style_id)
+            if text and level is not None:
+                yield Heading(level, text)
                 continue
 
             # If paragraph has only images (no text), process it specially
-            if not para.text.strip() and has_images_in_para:
-                formatted_text = _extract_formatted_text(para, image_map)
-                if formatted_text:
-                    text_content.append(formatted_text)
+            if not text and has_images_in_para:
+                inlines = _extract_formatted_text(para, image_map)
+                if inlines:
+                    yield Paragraph(inlines)
                 continue
 
-            # Detect list items by checking numbering properties
-            # Lists are identified by the presence of numPr in paragraph properties
-            if para._p.pPr is not None and para._p.pPr.numPr is not None:
-                num_pr = para._p.pPr.numPr
-                ilvl = num_pr.ilvl  # Indentation level
-
-                # Try to determine if it's numbered or bulleted
-                # Numbered lists typically have numFmt, bulleted have bullets
-                is_numbered = False
-                try:
-                    if hasattr(num_pr, "numId") and num_pr.numId is not None:
-                        # Check the numbering definition
-                        num_id_val = num_pr.numId.val
-                        if num_id_val is not None:
-                            # Try to get numbering format from document
-                            # For simplicity, check if first char looks like number
-                            text_preview = para.text.strip()[:5]
-                            if text_preview and text_preview[0].isdigit():
-                                is_numbered = True
-                except Exception:
-                    pass
-
-                formatted_text = _extract_formatted_text(para, image_map)
-                if is_numbered:
-                    text_content.append(f"LIST_NUMBER:{formatted_text}")
-                else:
-                    text_content.append(f"LIST_BULLET:{formatted_text}")
+            # Detect list items from the numbering of the paragraph or its
+            # style; the number format tells numbered and bulleted lists apart
+            numbering = styles.list_numbering(properties, style_id)
+            if numbering is not None:
+                ordered, depth = numbering
+                inlines = _extract_formatted_text(para, image_map)
+                yield ListItem(inlines, ordered=ordered, level=depth)
                 continue
 
             # Also check for "List" style names as fallback
-            if "List" in para.style.name:
-                formatted_text = _extract_formatted_text(para, image_map)
+            if "List" in styles.names.get(style_id, ""):
+                inlines = _extract_formatted_text(para, image_map)
                 # Default to bullet for List styles
-                text_content.append(f"LIST_BULLET:{formatted_text}")
+                yield ListItem(inlines)
                 continue
 
             # Regular paragraph - extract with formatting
-            formatted_text = _extract_formatted_text(para, image_map)
-            if formatted_text:
-                text_content.append(formatted_text)
+            inlines = _extract_formatted_text(para, image_map)
+            if inlines:
+                yield Paragraph(inlines)
 
         # Extract text from tables
-        for table in doc.tables:
-            text_content.append("TABLE_START")
-            for row in table.rows:
-                row_cells = [cell.text.strip() for cell in row.cells]
-                text_content.append("ROW:" + " | ".join(row_cells))
-            text_content.append("TABLE_END")
+        for index, table in enumerate(tables):
+            if progress is not None:
+                progress.update(len(paragraphs) + index, len(image_map))
+            yield table_block(table._tbl)
 
-        # Images are now handled inline, so we keep an empty list
-        # The image_map contains all images that were saved
-        images_list = list(image_map.values())
+        if progress is not None:
+            progress.finish(len(image_map))
 
     except Exception as e:
         raise ValueError(f"Failed to extract DOCX: {str(e)}")
 
-    # Combine text
-    full_text = "\n".join(text_content)
 
-    return ExtractedData(text=full_text, images=images_list, metadata=metadata)
+def stream_docx(
+    file_path: Path,
+    job_id: str | None = None,
+    progress: ProgressReporter | None = None,
+) -> ExtractedStream:
+    """Extract a DOCX file as a stream of blocks.
+
+    With the streaming engine the document is parsed while the stream is
+    consumed, and images are saved when first referenced. Packages it cannot
+    open are handed to the python-docx engine.
+
+    Args:
+        file_path: Path to DOCX file
+        job_id: Optional job ID for organizing extracted images
+        progress: Optional reporter of the conversion progress
+
+    Returns:
+        ExtractedStream with blocks, images, and metadata
+    """
+    if config.docx_engine == "stream":
+        try:
+            package = DocxPackage(file_path)
+        except ValueError:
+            pass  # Fall back to python-docx, which reports its own error
+        else:
+            images_list: list[str] = []
+            return ExtractedStream(
+                iter_body_blocks(package, images_list, job_id, progress),
+                images_list,
+                package.metadata,
+            )
+    return _stream_docx_python_docx(file_path, job_id, progress)
+
 
+def _stream_docx_python_docx(
+    file_path: Path,
+    job_id: str | None = None,
+    progress: ProgressReporter | None = None,
+) -> ExtractedStream:
+    """Extract a DOCX file as a stream of blocks with python-docx.
 
-def _extract_images_and_create_map(
-    file_path: Path, doc, job_id: str | None = None
-) -> dict[str, str]:
-    """Extract images from DOCX and create rId -> filename map.
+    The document is loaded and its images are saved up front; paragraphs
+    and tables are converted to blocks while the stream is consumed.
 
     Args:
         file_path: Path to DOCX file
-        doc: python-docx Document object
-        job_id: Optional job ID for organizing images
+        job_id: Optional job ID for organizing extracted images
+        progress: Optional reporter of processed paragraphs and tables
 
     Returns:
-        Dictionary mapping relationship IDs to saved image filenames
+        ExtractedStream with blocks, images, and metadata
     """
-    image_map = {}
+    from docx import Document
+
+    metadata = {}
 
     try:
-        # Get relationships from document
-        rels = doc.part.rels
-
-        with zipfile.ZipFile(str(file_path), "r") as zip_ref:
-            # DOCX stores images in word/media/
-            media_files = [f for f in zip_ref.namelist() if f.startswith("word/media/")]
-
-            print(f"[DOCX DEBUG] Found {len(media_files)} media files")
-            print(f"[DOCX DEBUG] Total relationships: {len(rels)}")
-
-            # Create a map of target -> file path
-            target_to_file = {}
-            for media_file in media_files:
-                filename = media_file.split("/")[-1]
-                target_to_file[filename] = media_file
-                print(f"[DOCX DEBUG] Media file: {filename}")
-
-            # Process relationships to map rId to saved image files
-            image_rels = [r for r in rels.items() if "image" in r[1].reltype]
-            print(f"[DOCX DEBUG] Found {len(image_rels)} image relationships")
-
-            for rel_id, rel in rels.items():
-                if "image" in rel.reltype:
-                    print(f"[DOCX DEBUG] Processing image relationship: {rel_id}")
-                    try:
-                        # Get the target filename from the relationship
-                        # rel.target_ref is a string like '../media/image1.png'
-                        target_ref = (
-                            rel.target_ref
-                            if hasattr(rel, "target_ref")
-                            else rel._target
-                        )
-                        if isinstance(target_ref, str):
-                            target = target_ref.split("/")[-1]
-                        else:
-                            # If it's an object, try to get partname
-                            target = (
-                                target_ref.partname.split("/")[-1]
-                                if hasattr(target_ref, "partname")
-                                else str(target_ref).split("/")[-1]
-                            )
-
-                        if target in target_to_file:
-                            print(f"[DOCX DEBUG] Found target {target} in media files")
-                            # Read and save image
-                            image_bytes = zip_ref.read(target_to_file[target])
-                            ext = target.split(".")[-1].lower()
-                            if ext not in ["png", "jpg", "jpeg", "gif", "bmp"]:
-                                ext = "png"
-
-                            # Save with descriptive name
-                            base_name = f"docx_{target.rsplit('.', 1)[0]}"
-                            image_path = save_image(image_bytes, ext, base_name, job_id)
-
-                            # Keep the full URL path for frontend access
-                            image_map[rel_id] = image_path
-                            print(f"[DOCX DEBUG] Saved image: {image_path}")
-                        else:
-                            print(
-                                f"[DOCX DEBUG] Target {target} NOT found in media files!"
-                            )
-
-                    except Exception as e:
-                        print(
-                            f"[DOCX ERROR] Error extracting image for rel {rel_id}: {e}"
-                        )
-                        import traceback
-
-                        traceback.print_exc()
+        # Load document
+        doc = Document(str(file_path))
+
+        # Extract metadata (core properties)
+        if hasattr(doc.core_properties, "title"):
+            metadata["title"] = doc.core_properties.title or ""
+        if hasattr(doc.core_properties, "author"):
+            metadata["author"] = doc.core_properties.author or ""
+        if hasattr(doc.core_properties, "subject"):
+            metadata["subject"] = doc.core_properties.subject or ""
+
+        # First, extract all images and create a map of rId -> filename
+        image_map = _extract_images_and_create_map(doc, job_id)
 
     except Exception as e:
-        print(f"[DOCX ERROR] Error accessing DOCX images: {e}")
-        import traceback
+        raise ValueError(f"Failed to extract DOCX: {str(e)}")
+
+    # Images are handled inline; the image_map contains all images that were saved
+    images_list = list(dict.fromkeys(image_map.values()))
+
+    return ExtractedStream(
+        _iter_docx_blocks(doc, image_map, progress), images_list, metadata
+    )
+
+
+def extract_docx(file_path: Path, job_id: str | None = None) -> ExtractedData:
+    """Extract text and images from DOCX file.
 
-        traceback.print_exc()
+    Args:
+        file_path: Path to DOCX file
+        job_id: Optional job ID for organizing extracted images
+
+    Returns:
+        ExtractedData with text, images, and metadata
+    """
+    return stream_docx(file_path, job_id).collect()
+
+
+def _extract_images_and_create_map(doc, job_id: str | None = None) -> dict[str, str]:
+    """Save the images of a loaded document and map their rIds to URLs.
+
+    Image bytes come from the parts python-docx already loaded, so the
+    package is not opened again. Relationships pointing to the same part
+    share one saved image.
+
+    Args:
+        doc: python-docx Document object
+        job_id: Optional job ID for organizing images
+
+    Returns:
+        Dictionary mapping relationship IDs to saved image URLs
+    """
+    image_map = {}
+    saved: dict[str, str] = {}  # Part name -> saved image URL
+
+    for rel_id, rel in doc.part.rels.items():
+        if rel.is_external or not rel.reltype.endswith("/image"):
+            continue
+        try:
+            part = rel.target_part
+            partname = str(part.partname)
+            url = saved.get(partname)
+            if url is None:
+                stem, _, ext = posixpath.basename(partname).rpartition(".")
+                ext = ext.lower()
+                if ext not in ["png", "jpg", "jpeg", "gif", "bmp"]:
+                    ext = "png"
+                url = save_image(part.blob, ext, f"docx_{stem}", job_id)
+                saved[partname] = url
+                logger.debug("Saved image %s as %s", partname, url)
+            image_map[rel_id] = url
+        except Exception:
+            logger.warning("Could not extract DOCX image %s", rel_id, exc_info=True)
 
-    print(f"[DOCX DEBUG] Total images extracted: {len(image_map)}")
+    logger.debug(
+        "Extracted %d images for %d image relationships", len(saved), len(image_map)
+    )
     return image_map
@@ -1,122 +1,612 @@
-"""ODT extraction service using odfpy.
-
-This module handles extraction of text and images from OpenDocument Text files.
+"""ODT extraction service.
+
+This module handles extraction of text and images from OpenDocument Text
+files. ``content.xml`` is iterparsed once: the automatic styles, which come
+before the body, are indexed as soon as they are read, and each child of
+``office:text`` is turned into blocks in document order and then discarded,
+so memory is bounded by the largest paragraph, list or table rather than by
+the document. ``styles.xml`` (the named styles) and ``meta.xml`` are small
+and read up front. Images are saved when first referenced. lxml is
+installed with python-docx.
 """
 
-import base64
+import logging
+import posixpath
+import re
 import zipfile
+from collections.abc import Iterator
 from pathlib import Path
 
-from odf import teletype, text as odf_text
-from odf.opendocument import load
-
-from app.models.dto import ExtractedData
+from lxml import etree
+
+from app.models.blocks import (
+    Block,
+    Heading,
+    Inline,
+    InlineImage,
+    ListItem,
+    Paragraph,
+    Run,
+    Table,
+    TableCell,
+)
+from app.models.dto import ExtractedData, ExtractedStream
+from app.services.progress import CountingReader, ProgressReporter
 from app.services.storage import save_image
 
-
-def _extract_text_from_element(element, image_map: dict[str, str]) -> str:
-    """Extract text from ODF element with formatting markers.
-
-    Args:
-        element: ODF element to extract text from
-        image_map: Dictionary mapping image names to saved paths
-
-    Returns:
-        Text with formatting markers
+logger = logging.getLogger(__name__)
+
+_OFFICE = "{urn:oasis:names:tc:opendocument:xmlns:office:1.0}"
+_STYLE = "{urn:oasis:names:tc:opendocument:xmlns:style:1.0}"
+_TEXT = "{urn:oasis:names:tc:opendocument:xmlns:text:1.0}"
+_TABLE = "{urn:oasis:names:tc:opendocument:xmlns:table:1.0}"
+_DRAW = "{urn:oasis:names:tc:opendocument:xmlns:drawing:1.0}"
+_FO = "{urn:oasis:names:tc:opendocument:xmlns:xsl-fo-compatible:1.0}"
+_META = "{urn:oasis:names:tc:opendocument:xmlns:meta:1.0}"
+_DC = "{http://purl.org/dc/elements/1.1/}"
+_XLINK_HREF = "{http://www.w3.org/1999/xlink}href"
+
+_AUTOMATIC_STYLES = f"{_OFFICE}automatic-styles"
+_OFFICE_TEXT = f"{_OFFICE}text"
+_P = f"{_TEXT}p"
+_H = f"{_TEXT}h"
+_SPAN = f"{_TEXT}span"
+_LIST = f"{_TEXT}list"
+_LIST_ITEMS = frozenset((f"{_TEXT}list-item", f"{_TEXT}list-header"))
+_TBL = f"{_TABLE}table"
+_TABLE_ROW = f"{_TABLE}table-row"
+_TABLE_CELL = f"{_TABLE}table-cell"
+_FRAME = f"{_DRAW}frame"
+_IMAGE = f"{_DRAW}image"
+_ANNOTATION = f"{_OFFICE}annotation"
+_STYLE_NAME = f"{_TEXT}style-name"
+_NUMBERED_LEVEL = f"{_TEXT}list-level-style-number"
+
+# Inline elements rendered as text, as odfpy's ``teletype.extractText`` does
+# (text:s is a run of spaces, handled separately)
+_INLINE_TEXT = {f"{_TEXT}tab": "\t", f"{_TEXT}line-break": "\n"}
+_SPACES = f"{_TEXT}s"
+
+# Containers of table rows
+_ROW_GROUPS = frozenset(
+    f"{_TABLE}{name}" for name in ("table-header-rows", "table-rows", "table-row-group")
+)
+
+# Paragraph styles treated as headings when they have no outline level:
+# "Heading 3" (stored as "Heading_20_3"), "Heading", "Title"
+_HEADING_NAME = re.compile(r"(?:heading|title)(?:_20_| )?(\d*)", re.IGNORECASE)
+
+# Font weights rendered as bold
+_BOLD_WEIGHTS = frozenset(("bold", "600", "700", "800", "900"))
+
+# Parts are parsed without resolving entities, like the DOCX reader does
+_PARSER = etree.XMLParser(resolve_entities=False)
+
+# Package folder of the document pictures; draw:image elements may also
+# point to object previews (ObjectReplacements/) or external files
+_PICTURES = "Pictures/"
+
+# Extensions kept for saved images; anything else is saved as PNG
+_IMAGE_EXTENSIONS = frozenset(("png", "jpg", "jpeg", "gif", "bmp"))
+
+
+class _StyleIndex:
+    """Text formatting, heading levels and list types of the document styles.
+
+    Styles are registered as their parts are read (named styles from
+    ``styles.xml``, then the automatic styles of ``content.xml``) and
+    resolved through ``style:parent-style-name`` on first use.
     """
-    result = []
 
-    # Get all text from element
-    text_content = teletype.extractText(element)
-    if text_content:
-        result.append(text_content)
+    def __init__(self) -> None:
+        # (family, name) -> (bold, italic), None where the style is silent
+        self._own_format: dict[tuple[str, str], tuple[bool | None, bool | None]] = {}
+        self._own_levels: dict[str, int] = {}
+        self._parents: dict[tuple[str, str], str] = {}
+        self._formats: dict[tuple[str, str], tuple[bool | None, bool | None]] = {}
+        self._levels: dict[str, int | None] = {}
+        # List style name -> list level (from 1) -> numbered
+        self.list_styles: dict[str, dict[int, bool]] = {}
+
+    def add(self, container: etree._Element) -> None:
+        """Register the styles and list styles of a styles container.
+
+        Args:
+            container: ``office:styles`` or ``office:automatic-styles``
+        """
+        for style in container.iterchildren(f"{_STYLE}style"):
+            family = style.get(f"{_STYLE}family", "")
+            name = style.get(f"{_STYLE}name")
+            if name is None or family not in ("paragraph", "text"):
+                continue
+            key = (family, name)
+            parent = style.get(f"{_STYLE}parent-style-name")
+            if parent is not None:
+                self._parents[key] = parent
+            properties = style.find(f"{_STYLE}text-properties")
+            if properties is not None:
+                weight = properties.get(f"{_FO}font-weight")
+                font_style = properties.get(f"{_FO}font-style")
+                self._own_format[key] = (
+                    None if weight is None else weight in _BOLD_WEIGHTS,
+                    None if font_style is None else font_style != "normal",
+                )
+            if family != "paragraph":
+                continue
+            outline = style.get(f"{_STYLE}default-outline-level", "")
+            if outline.isdigit() and int(outline) > 0:
+                self._own_levels[name] = int(outline)
+                continue
+            for candidate in (style.get(f"{_STYLE}display-name", name), name):
+                match = _HEADING_NAME.fullmatch(candidate)
+                if match:
+                    self._own_levels[name] = int(match.group(1) or 1)
+                    break
+
+        for list_style in container.iterchildren(f"{_TEXT}list-style"):
+            levels = {}
+            for level_style in list_style:
+                level = level_style.get(f"{_TEXT}level", "")
+                if level.isdigit():
+                    levels[int(level)] = level_style.tag == _NUMBERED_LEVEL
+            self.list_styles[list_style.get(f"{_STYLE}name", "")] = levels
+        self._formats.clear()
+        self._levels.clear()
+
+    def text_format(
+        self, family: str, name: str | None
+    ) -> tuple[bool | None, bool | None]:
+        """Return the bold and italic settings of a style.
+
+        Args:
+            family: "paragraph" or "text"
+            name: Style name (None for no style)
+
+        Returns:
+            Tuple of (bold, italic), None where the style and its parents
+            leave the setting to the enclosing element
+        """
+        if name is None:
+            return None, None
+        key = (family, name)
+        if key in self._formats:
+            return self._formats[key]
+        bold = italic = None
+        seen = set()
+        while key not in seen and (bold is None or italic is None):
+            seen.add(key)
+            own_bold, own_italic = self._own_format.get(key, (None, None))
+            bold = own_bold if bold is None else bold
+            italic = own_italic if italic is None else italic
+            parent = self._parents.get(key)
+            if parent is None:
+                break
+            key = (family, parent)
+        self._formats[family, name] = (bold, italic)
+        return bold, italic
+
+    def heading_level(self, name: str | None) -> int | None:
+        """Return the heading level of a paragraph style, if it is a heading."""
+        if name is None:
+            return None
+        if name not in self._levels:
+            level = None
+            current: str | None = name
+            seen = set()
+            while current is not None and current not in seen:
+                if current in self._own_levels:
+                    level = self._own_levels[current]
+                    break
+                seen.add(current)
+                current = self._parents.get(("paragraph", current))
+            self._levels[name] = level
+        return self._levels[name]
+
+
+class _ImageResolver:
+    """Saves the pictures of a document the first time they are referenced."""
+
+    def __init__(
+        self, zip_ref: zipfile.ZipFile, images: list[str], job_id: str | None
+    ) -> None:
+        """Initialize the resolver.
+
+        Args:
+            zip_ref: Open package
+            images: List of saved image URLs, extended in place
+            job_id: Optional job ID for organizing extracted images
+        """
+        self._zip_ref = zip_ref
+        self._images = images
+        self._job_id = job_id
+        self._urls: dict[str, str | None] = {}
+
+    def url(self, href: str) -> str | None:
+        """Return the URL of a picture, saving it if needed.
+
+        Only parts under ``Pictures/`` are saved: the other ``draw:image``
+        targets, such as the previews in ``ObjectReplacements/``, are not
+        pictures of the document.
+
+        Args:
+            href: ``xlink:href`` of a ``draw:image``, e.g. "Pictures/a.png"
+
+        Returns:
+            Saved image URL, or None for external, missing or unreadable
+            pictures
+        """
+        if href in self._urls:
+            return self._urls[href]
+        url = None
+        part_name = posixpath.normpath(href.removeprefix("./"))
+        if part_name.startswith(_PICTURES):
+            try:
+                url = self._save(part_name)
+            except Exception:
+                logger.warning("Could not extract ODT image %s", href, exc_info=True)
+        self._urls[href] = url
+        return url
+
+    def _save(self, part_name: str) -> str | None:
+        """Save a picture part, or return None if it is missing."""
+        try:
+            image_bytes = self._zip_ref.read(part_name)
+        except KeyError:
+            return None
+        stem, ext = posixpath.splitext(posixpath.basename(part_name))
+        ext = ext.lstrip(".").lower()
+        if ext not in _IMAGE_EXTENSIONS:
+            ext = "png"
+        url = save_image(image_bytes, ext, f"odt_{stem}", self._job_id)
+        self._images.append(url)
+        return url
+
+
+class _Walker:
+    """Converts the body elements of a document to blocks."""
+
+    def __init__(self, styles: _StyleIndex, images: _ImageResolver) -> None:
+        self.styles = styles
+        self.images = images
+
+    def inlines(
+        self, paragraph: etree._Element, bold: bool, italic: bool
+    ) -> list[Inline]:
+        """Return the runs and images of a paragraph, in reading order.
+
+        Consecutive text with the same formatting is merged into one run.
+
+        Args:
+            paragraph: ``text:p`` or ``text:h`` element (or a frame)
+            bold: Whether the paragraph style is bold
+            italic: Whether the paragraph style is italic
+
+        Returns:
+            Runs and images
+        """
+        inlines: list[Inline] = []
+        self._add_inlines(paragraph, bold, italic, inlines)
+        return inlines
+
+    def _add_inlines(
+        self, element: etree._Element, bold: bool, italic: bool, inlines: list[Inline]
+    ) -> None:
+        """Append the content of an element with the enclosing formatting."""
+        _add_text(inlines, element.text, bold, italic)
+        for child in element:
+            tag = child.tag
+            if tag == _SPAN:
+                span_bold, span_italic = self.styles.text_format(
+                    "text", child.get(_STYLE_NAME)
+                )
+                self._add_inlines(
+                    child,
+                    bold if span_bold is None else span_bold,
+                    italic if span_italic is None else span_italic,
+                    inlines,
+                )
+            elif tag in _INLINE_TEXT:
+                _add_text(inlines, _INLINE_TEXT[tag], bold, italic)
+            elif tag == _SPACES:
+                _add_text(inlines, _spaces(child), bold, italic)
+            elif tag == _IMAGE:
+                href = child.get(_XLINK_HREF)
+                url = self.images.url(href) if href else None
+                if url is not None:
+                    inlines.append(InlineImage(url))
+            elif isinstance(tag, str) and tag != _ANNOTATION:
+                self._add_inlines(child, bold, italic, inlines)
+            _add_text(inlines, child.tail, bold, italic)
+
+    def paragraph_block(self, paragraph: etree._Element) -> Block | None:
+        """Convert a ``text:p`` or ``text:h`` to a heading or paragraph block.
+
+        Args:
+            paragraph: Paragraph element
+
+        Returns:
+            Heading or paragraph block, or None for an empty paragraph
+        """
+        style_name = paragraph.get(_STYLE_NAME)
+        bold, italic = self.styles.text_format("paragraph", style_name)
+        inlines = self.inlines(paragraph, bool(bold), bool(italic))
+        text = "".join(inline.text for inline in inlines if type(inline) is Run)
+        stripped = text.strip()
+
+        if paragraph.tag == _H:
+            level = paragraph.get(f"{_TEXT}outline-level", "")
+            level = int(level) if level.isdigit() and int(level) > 0 else 1
+        else:
+            level = self.styles.heading_level(style_name)
+        if stripped and level is not None:
+            return Heading(level, stripped)
+
+        if not stripped:
+            # Image-only paragraph
+            images = [inline for inline in inlines if type(inline) is InlineImage]
+            return Paragraph(images) if images else None
+        return Paragraph(inlines)
+
+    def list_blocks(
+        self, element: etree._Element, list_style: str | None, depth: int
+    ) -> Iterator[Block]:
+        """Yield the items of a ``text:list``, nested lists included.
+
+        Args:
+            element: List element
+            list_style: List style inherited from the enclosing list
+            depth: Nesting depth of the list (1 = top level)
+
+        Yields:
+            List items in document order
+        """
+        list_style = element.get(_STYLE_NAME, list_style)
+        levels = self.styles.list_styles.get(list_style or "", {})
+        ordered = levels.get(depth, False)
+        for item in element:
+            if item.tag not in _LIST_ITEMS:
+                continue
+            for child in item:
+                if child.tag == _LIST:
+                    yield from self.list_blocks(child, list_style, depth + 1)
+                elif child.tag in (_P, _H):
+                    bold, italic = self.styles.text_format(
+                        "paragraph", child.get(_STYLE_NAME)
+                    )
+                    inlines = self.inlines(child, bool(bold), bool(italic))
+                    if _has_content(inlines):
+                        yield ListItem(inlines, ordered=ordered, level=depth)
+
+    def table_block(self, table: etree._Element) -> Table:
+        """Convert a ``table:table`` to a block, with its merged cells.
+
+        Cells covered by a merged cell (``table:covered-table-cell``) are
+        left out, as MediaWiki expects.
+
+        Args:
+            table: Table element
+
+        Returns:
+            Table block
+        """
+        rows = []
+        for row in _table_rows(table):
+            cells: list[str | TableCell] = []
+            for cell in row.iterchildren(_TABLE_CELL):
+                paragraphs = cell.iter(_P, _H)
+                text = "\n".join(map(_text_content, paragraphs)).strip()
+                colspan = _span(cell, "number-columns-spanned")
+                rowspan = _span(cell, "number-rows-spanned")
+                if colspan > 1 or rowspan > 1:
+                    cells.append(TableCell(text, colspan=colspan, rowspan=rowspan))
+                else:
+                    cells.append(text)
+            rows.append(cells)
+        return Table(rows)
+
+    def body_blocks(self, element: etree._Element) -> Iterator[Block]:
+        """Convert a child of ``office:text`` (or of a section) to blocks."""
+        tag = element.tag
+        if tag in (_P, _H):
+            block = self.paragraph_block(element)
+            if block is not None:
+                yield block
+        elif tag == _LIST:
+            yield from self.list_blocks(element, None, 1)
+        elif tag == _TBL:
+            yield self.table_block(element)
+        elif tag == _FRAME:
+            # Frame anchored to the page: keep its pictures
+            images = [
+                inline
+                for inline in self.inlines(element, False, False)
+                if type(inline) is InlineImage
+            ]
+            if images:
+                yield Paragraph(images)
+        else:
+            # Sections, indexes and other containers
+            for child in element:
+                yield from self.body_blocks(child)
+
+
+def _add_text(
+    inlines: list[Inline], text: str | None, bold: bool, italic: bool
+) -> None:
+    """Append text to the last run if it has the same formatting, else a new run."""
+    if not text:
+        return
+    last = inlines[-1] if inlines else None
+    if type(last) is Run and last.bold == bold and last.italic == italic:
+        last.text += text
+    else:
+        inlines.append(Run(text, bold=bold, italic=italic))
+
+
+def _has_content(inlines: list[Inline]) -> bool:
+    """Return whether inlines hold an image or non-blank text."""
+    return any(type(inline) is InlineImage or inline.text.strip() for inline in inlines)
+
+
+def _spaces(element: etree._Element) -> str:
+    """Return the spaces a ``text:s`` element stands for."""
+    count = element.get(f"{_TEXT}c", "1")
+    return " " * int(count) if count.isdigit() else " "
+
+
+def _text_content(element: etree._Element) -> str:
+    """Return the plain text of a paragraph (frames and annotations excluded)."""
+    parts = [element.text or ""]
+    for child in element:
+        tag = child.tag
+        if tag in _INLINE_TEXT:
+            parts.append(_INLINE_TEXT[tag])
+        elif tag == _SPACES:
+            parts.append(_spaces(child))
+        elif isinstance(tag, str) and tag not in (_FRAME, _ANNOTATION):
+            parts.append(_text_content(child))
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+
+def _table_rows(element: etree._Element) -> Iterator[etree._Element]:
+    """Yield the rows of a table, including header rows and row groups."""
+    for child in element:
+        if child.tag == _TABLE_ROW:
+            yield child
+        elif child.tag in _ROW_GROUPS:
+            yield from _table_rows(child)
+
+
+def _span(cell: etree._Element, attribute: str) -> int:
+    """Return a column or row span of a table cell."""
+    value = cell.get(f"{_TABLE}{attribute}", "1")
+    return max(1, int(value)) if value.isdigit() else 1
+
+
+def _read_metadata(zip_ref: zipfile.ZipFile) -> dict[str, str]:
+    """Read title, author and subject from ``meta.xml``."""
+    metadata = {"title": "", "author": "", "subject": ""}
+    try:
+        root = etree.fromstring(zip_ref.read("meta.xml"), _PARSER)
+    except KeyError:
+        return metadata
+    for key, tag in (
+        ("title", f"{_DC}title"),
+        ("author", f"{_META}initial-creator"),
+        ("subject", f"{_DC}subject"),
+    ):
+        element = next(root.iter(tag), None)
+        if element is not None and element.text:
+            metadata[key] = element.text
+    return metadata
+
+
+def _read_styles(zip_ref: zipfile.ZipFile) -> _StyleIndex:
+    """Index the named styles of ``styles.xml``."""
+    styles = _StyleIndex()
+    try:
+        root = etree.fromstring(zip_ref.read("styles.xml"), _PARSER)
+    except KeyError:
+        return styles
+    for container in root.iterchildren(f"{_OFFICE}styles", _AUTOMATIC_STYLES):
+        styles.add(container)
+    return styles
 
-    return "".join(result)
 
+def _iter_odt_blocks(
+    zip_ref: zipfile.ZipFile,
+    styles: _StyleIndex,
+    images_list: list[str],
+    job_id: str | None = None,
+    progress: ProgressReporter | None = None,
+) -> Iterator[Block]:
+    """Yield the blocks of a document in order, parsing ``content.xml`` once.
 
-def _detect_heading_style(paragraph) -> int:
-    """Detect if paragraph is a heading and return its level.
+    The package is closed when the generator finishes.
 
     Args:
-        paragraph: ODF paragraph element
-
-    Returns:
-        Heading level (0 for normal text, 1-6 for headings)
-    """
-    # Check style name
-    style_name = paragraph.getAttribute("stylename")
-    if not style_name:
-        return 0
-
-    style_lower = style_name.lower()
-
-    # Common heading style patterns in ODT
-    if "heading" in style_lower or "title" in style_lower:
-        # Try to extract level from style name
-        if "1" in style_name or "heading_20_1" in style_lower:
-            return 1
-        elif "2" in style_name or "heading_20_2" in style_lower:
-            return 2
-        elif "3" in style_name or "heading_20_3" in style_lower:
-            return 3
-        elif "4" in style_name or "heading_20_4" in style_lower:
-            return 4
-        elif "5" in style_name or "heading_20_5" in style_lower:
-            return 5
-        elif "6" in style_name or "heading_20_6" in style_lower:
-            return 6
-        else:
-            return 1  # Default to H1 if level unclear
-
-    return 0
+        zip_ref: Open package
+        styles: Index of the named styles, completed with the automatic ones
+        images_list: List of saved image URLs, extended while iterating
+        job_id: Optional job ID for organizing extracted images
+        progress: Optional reporter of the content bytes parsed
 
+    Yields:
+        Heading, paragraph, list and table blocks
 
-def _extract_images_from_odt(
-    file_path: Path, job_id: str | None = None
-) -> dict[str, str]:
-    """Extract images from ODT file (which is a ZIP).
+    Raises:
+        ValueError: If the document cannot be parsed
+    """
+    walker = _Walker(styles, _ImageResolver(zip_ref, images_list, job_id))
+    try:
+        info = zip_ref.getinfo("content.xml")
+        with zip_ref.open(info) as raw:
+            source = CountingReader(raw)
+            if progress is not None:
+                progress.start("bytes", info.file_size)
+            events = etree.iterparse(source, events=("end",), resolve_entities=False)
+            for _, element in events:
+                if element.tag == _AUTOMATIC_STYLES:
+                    styles.add(element)
+                    element.clear()
+                    continue
+                parent = element.getparent()
+                if parent is None or parent.tag != _OFFICE_TEXT:
+                    continue  # Converted with its top-level ancestor
+                yield from walker.body_blocks(element)
+                # Drop the converted element and its tail to bound memory
+                element.clear()
+                while element.getprevious() is not None:
+                    del parent[0]
+                if progress is not None:
+                    progress.update(source.position, len(images_list))
+        if progress is not None:
+            progress.finish(len(images_list))
+    except (KeyError, etree.XMLSyntaxError, zipfile.BadZipFile) as e:
+        raise ValueError(f"Failed to extract ODT: {e}") from e
+    finally:
+        zip_ref.close()
+
+
+def stream_odt(
+    file_path: Path,
+    job_id: str | None = None,
+    progress: ProgressReporter | None = None,
+) -> ExtractedStream:
+    """Extract an ODT file as a stream of blocks.
+
+    The document is parsed while the stream is consumed, and pictures are
+    saved where they are first referenced.
 
     Args:
         file_path: Path to ODT file
-        job_id: Optional job ID for organizing images
+        job_id: Optional job ID for organizing extracted images
+        progress: Optional reporter of the content bytes parsed
 
     Returns:
-        Dictionary mapping internal image names to saved paths
-    """
-    image_map = {}
+        ExtractedStream with blocks, images, and metadata
 
+    Raises:
+        ValueError: If the file is not an OpenDocument package
+    """
     try:
-        with zipfile.ZipFile(file_path, "r") as odt_zip:
-            # List all files in Pictures directory
-            image_files = [
-                name for name in odt_zip.namelist() if name.startswith("Pictures/")
-            ]
-
-            for img_index, image_name in enumerate(image_files):
-                try:
-                    # Read image data
-                    image_bytes = odt_zip.read(image_name)
-
-                    # Determine file extension
-                    ext = Path(image_name).suffix.lstrip(".")
-                    if not ext:
-                        ext = "png"  # Default fallback
-
-                    # Generate base name
-                    base_name = f"odt_img{img_index}"
-
-                    # Save image
-                    saved_path = save_image(image_bytes, ext, base_name, job_id)
-                    image_map[image_name] = saved_path
-
-                except Exception as e:
-                    print(f"[WARN] Error extracting image {image_name}: {e}")
-                    continue
-
-    except Exception as e:
-        print(f"[WARN] Error opening ODT as ZIP: {e}")
+        zip_ref = zipfile.ZipFile(str(file_path), "r")
+    except (OSError, zipfile.BadZipFile) as e:
+        raise ValueError(f"Failed to extract ODT: {e}") from e
+    try:
+        metadata = _read_metadata(zip_ref)
+        styles = _read_styles(zip_ref)
+    except (etree.XMLSyntaxError, zipfile.BadZipFile, OSError) as e:
+        zip_ref.close()
+        raise ValueError(f"Failed to extract ODT: {e}") from e
 
-    return image_map
+    images_list: list[str] = []
+    return ExtractedStream(
+        _iter_odt_blocks(zip_ref, styles, images_list, job_id, progress),
+        images_list,
+        metadata,
+    )
 
 
 def extract_odt(file_path: Path, job_id: str | None = None) -> ExtractedData:
@@ -129,115 +619,4 @@ def extract_odt(file_path: Path, job_id: str | None = None) -> ExtractedData:
     Returns:
         ExtractedData with text, images, and metadata
     """
-    text_content = []
-    images_list = []
-    metadata = {}
-
-    try:
-        # First extract images from ZIP structure
-        image_map = _extract_images_from_odt(file_path, job_id)
-        images_list = list(image_map.values())
-
-        # Load ODT document
-        doc = load(str(file_path))
-
-        # Extract metadata
-        try:
-            meta = doc.meta
-            metadata = {
-                "title": teletype.extractText(meta.getElementsByType(odf_text.Title)[0])
-                if meta.getElementsByType(odf_text.Title)
-                else "",
-                "author": teletype.extractText(
-                    meta.getElementsByType(odf_text.InitialCreator)[0]
-                )
-                if meta.getElementsByType(odf_text.InitialCreator)
-                else "",
-                "subject": teletype.extractText(
-                    meta.getElementsByType(odf_text.Subject)[0]
-                )
-                if meta.getElementsByType(odf_text.Subject)
-                else "",
-            }
-        except Exception as e:
-            print(f"[WARN] Error extracting metadata: {e}")
-            metadata = {}
-
-        # Extract text content
-        paragraphs = doc.text.getElementsByType(odf_text.P)
-
-        for para in paragraphs:
-            # Check if paragraph is a heading
-            heading_level = _detect_heading_style(para)
-
-            # Extract text
-            para_text = teletype.extractText(para).strip()
-
-            if not para_text:
-                continue
-
-            if heading_level > 0:
-                # Mark as heading
-                text_content.append(f"HEADING{heading_level}:{para_text}")
-            else:
-                # Check for bold/italic by examining spans
-                has_formatting = False
-                spans = para.getElementsByType(odf_text.Span)
-
-                if spans:
-                    span_texts = []
-                    for span in spans:
-                        span_text = teletype.extractText(span).strip()
-                        if span_text:
-                            # Get style name to detect formatting
-                            style = span.getAttribute("stylename")
-                            if style:
-                                style_lower = style.lower()
-                                if "bold" in style_lower and "italic" in style_lower:
-                                    span_texts.append(f"BOLDITALIC:{span_text}")
-                                    has_formatting = True
-                                elif "bold" in style_lower or "strong" in style_lower:
-                                    span_texts.append(f"BOLD:{span_text}")
-                                    has_formatting = True
-                                elif (
-                                    "italic" in style_lower or "emphasis" in style_lower
-                                ):
-                                    span_texts.append(f"ITALIC:{span_text}")
-                                    has_formatting = True
-                                else:
-                                    span_texts.append(span_text)
-                            else:
-                                span_texts.append(span_text)
-
-                    if has_formatting:
-                        text_content.append("".join(span_texts))
-                    else:
-                        text_content.append(para_text)
-                else:
-                    # No spans, just add paragraph text
-                    text_content.append(para_text)
-
-        # Handle lists
-        lists = doc.text.getElementsByType(odf_text.List)
-        for lst in lists:
-            list_items = lst.getElementsByType(odf_text.ListItem)
-            for item in list_items:
-                item_text = teletype.extractText(item).strip()
-                if item_text:
-                    # Mark as list item
-                    text_content.append(f"LIST:{item_text}")
-
-        # Insert image markers at appropriate positions
-        # For ODT, we insert all images at the end as a section
-        if images_list:
-            text_content.append("\nHEADING2:Immagini\n")
-            for img_path in images_list:
-                text_content.append(f"IMAGE:{img_path}")
-
-    except Exception as e:
-        raise ValueError(f"Failed to extract ODT: {str(e)}")
-
-    # Combine all text
-    full_text = "\n".join(text_content)
-
-    return ExtractedData(text=full_text, images=images_list, metadata=metadata)
+    return stream_odt(file_path, job_id).collect()
@@ -3,14 +3,31 @@
 This module handles extraction of text and images from PDF files.
 """
 
-import re
+import logging
+from collections import Counter
+from collections.abc import Iterable, Iterator, Sequence
 from pathlib import Path
 
 import fitz  # PyMuPDF
-
-from app.models.dto import ExtractedData
+from pydantic import BaseModel, Field
+
+from app.core.config import config
+from app.models.blocks import (
+    Block,
+    Heading,
+    InlineImage,
+    PageBreak,
+    Paragraph,
+    Run,
+    Spacer,
+)
+from app.models.dto import ExtractedData, ExtractedStream
+from app.services.errors import PageSelectionError
+from app.services.progress import ProgressReporter
 from app.services.storage import save_image
 
+logger = logging.getLogger(__name__)
+
 
 def _detect_heading_level(font_size: float, base_font_size: float) -> int:
     """Detect heading level based on font size relative to base text.
@@ -44,270 +61,647 @@ def _detect_heading_level(font_size: float, base_font_size: float) -> int:
         return 0  # Normal text
 
 
-def _merge_consecutive_headings(text: str) -> str:
+def _merge_consecutive_headings(blocks: Iterable[Block]) -> Iterator[Block]:
     """Merge consecutive headings of the same level that are likely part of the same title.
 
     When a title in the PDF is split across multiple lines, it gets extracted as
-    multiple heading markers. This function merges them back together.
+    multiple headings. This generator merges them back together while the
+    blocks stream through, holding back only the heading being merged.
+    Spacers following a heading are dropped. The input blocks are not
+    modified: a merged title is a new Heading.
 
     Args:
-        text: Extracted text with HEADING markers
+        blocks: Extracted blocks
 
-    Returns:
-        Text with consecutive headings of the same level merged
+    Yields:
+        Blocks with consecutive headings of the same level merged
     """
-    lines = text.split("\n")
-    result = []
-    i = 0
-
-    while i < len(lines):
-        line = lines[i].strip()
-
-        # Check if this is a heading
-        if line.startswith("HEADING"):
-            # Extract level and text
-            match = re.match(r"HEADING(\d):(.*)", line)
-            if match:
-                level = match.group(1)
-                heading_text = match.group(2).strip()
-
-                # Look ahead for consecutive headings of the same level
-                j = i + 1
-                while j < len(lines):
-                    next_line = lines[j].strip()
-
-                    # Check if it's empty line (skip it)
-                    if not next_line:
-                        j += 1
-                        continue
-
-                    # Check if it's another heading of the same level
-                    next_match = re.match(r"HEADING(\d):(.*)", next_line)
-                    if next_match and next_match.group(1) == level:
-                        # Merge with current heading
-                        heading_text += " " + next_match.group(2).strip()
-                        j += 1
-                    else:
-                        # Different level or not a heading - stop merging
-                        break
-
-                # Add merged heading
-                result.append(f"HEADING{level}:{heading_text}")
-
-                # Skip the lines we merged
-                i = j
+    pending: list[Heading] = []
+
+    for block in blocks:
+        if pending:
+            # Skip empty lines between headings
+            if type(block) is Spacer:
+                continue
+
+            # Another heading of the same level continues the title
+            if type(block) is Heading and block.level == pending[0].level:
+                pending.append(block)
                 continue
 
-        # Not a heading or not matched - add as is
-        result.append(lines[i])
-        i += 1
+            # Different level or not a heading - stop merging
+            yield _merged_heading(pending)
+            pending = []
 
-    return "\n".join(result)
+        if type(block) is Heading:
+            pending.append(block)
+            continue
 
+        yield block
 
-def extract_pdf(file_path: Path, job_id: str | None = None) -> ExtractedData:
-    """Extract text and images from PDF file with inline image positioning.
+    if pending:
+        yield _merged_heading(pending)
+
+
+def _merged_heading(headings: list[Heading]) -> Heading:
+    """Return the heading made of consecutive same-level headings."""
+    if len(headings) == 1:
+        return headings[0]
+    return Heading(headings[0].level, " ".join(h.text for h in headings))
+
+
+def _base_font_size(histogram: Counter[float]) -> float:
+    """Compute the median font size from a size histogram.
+
+    Equivalent to sorting every span size and taking the middle element,
+    but only the distinct sizes are sorted.
 
     Args:
-        file_path: Path to PDF file
+        histogram: Mapping of font size to number of spans using it
+
+    Returns:
+        Median font size, or 12 if the document has no text
+    """
+    total = sum(histogram.values())
+    if not total:
+        return 12  # Default fallback
+
+    middle = total // 2
+    seen = 0
+    for size in sorted(histogram):
+        seen += histogram[size]
+        if seen > middle:
+            return size
+    return 12
+
+
+def _add_font_sizes(blocks: list[dict], histogram: Counter[float]) -> None:
+    """Add the font size of every text span of a page to a histogram.
+
+    Args:
+        blocks: Blocks of ``page.get_text("dict")``
+        histogram: Font size histogram updated in place
+    """
+    for block in blocks:
+        if block.get("type", 0) == 0:  # Text block
+            for line in block.get("lines", []):
+                for span in line.get("spans", []):
+                    size = span.get("size", 0)
+                    if size > 0:
+                        histogram[size] += 1
+
+
+def _analyze_page(
+    doc: fitz.Document,
+    page: fitz.Page,
+    page_num: int,
+    histogram: Counter[float],
+    images_list: list[str],
+    image_cache: dict[int, tuple[str, int]],
+    image_savings: Counter[str],
+    job_id: str | None,
+) -> list[tuple[float, str]]:
+    """Parse the layout of a page once and reduce it to compact records.
+
+    Font sizes of every span are added to ``histogram`` and the page images
+    are saved. The returned records are (font size, text) for visual lines
+    and (0, image URL) for images; heading detection happens later,
+    once the base font size of the whole document is known.
+
+    Images are memoized by xref: an image object shared by many pages (a
+    logo, a header graphic) is extracted and written once, and every later
+    page references the same URL.
+
+    Args:
+        doc: Open PDF document
+        page: Page to analyze
+        page_num: 1-based page number
+        histogram: Font size histogram updated in place
+        images_list: List of saved image URLs, extended in place
+        image_cache: Map of xref to (saved URL, byte size), updated in place
+        image_savings: Counter of avoided "writes" and "bytes", updated in place
         job_id: Optional job ID for organizing extracted images
 
     Returns:
-        ExtractedData with text, images, and metadata
+        Ordered page records
     """
-    text_content = []
-    images_list = []
-    metadata = {}
+    # Get page dimensions to detect header/footer areas
+    page_rect = page.rect
+    page_height = page_rect.height
+
+    # Define header and footer margins (in points)
+    # Typical: 50-70 points (~1.7-2.4 cm) for header/footer
+    header_margin = 70  # Top margin to exclude
+    footer_margin = 70  # Bottom margin to exclude
+
+    # Parse the page layout exactly once: text and image blocks both come
+    # from the same TextPage
+    textpage = page.get_textpage(flags=fitz.TEXTFLAGS_DICT)
+    blocks = page.get_text("dict", textpage=textpage)["blocks"]
+    del textpage
+
+    # Collect font sizes to determine what's "normal" text
+    _add_font_sizes(blocks, histogram)
+
+    # Build a map of image xrefs to saved paths
+    image_map = {}
+    image_list = page.get_images(full=True)
+    for img_index, img_info in enumerate(image_list):
+        xref = img_info[0]
+        cached = image_cache.get(xref)
+        if cached is not None:
+            # Already saved from an earlier page: reuse it
+            image_map[xref] = cached[0]
+            image_savings["writes"] += 1
+            image_savings["bytes"] += cached[1]
+            continue
+        try:
+            # Extract and save image
+            base_image = doc.extract_image(xref)
+            image_bytes = base_image["image"]
+            image_ext = base_image["ext"]
+
+            base_name = f"pdf_page{page_num}_img{img_index}"
+            image_path = save_image(image_bytes, image_ext, base_name, job_id)
+            images_list.append(image_path)
+            image_map[xref] = image_path
+            image_cache[xref] = (image_path, len(image_bytes))
+
+        except Exception:
+            logger.warning(
+                "Could not extract PDF image %d from page %d",
+                img_index,
+                page_num,
+                exc_info=True,
+            )
+            continue
+
+    # Sort blocks by vertical position (top to bottom, left to right)
+    sorted_blocks = sorted(blocks, key=lambda b: (b["bbox"][1], b["bbox"][0]))
+
+    # Process blocks in order
+    records: list[tuple[float, str]] = []
+    for block in sorted_blocks:
+        block_type = block.get("type", 0)
+        bbox = block.get("bbox", [0, 0, 0, 0])
+
+        # Check if block is in header or footer area
+        block_top = bbox[1]  # y0 coordinate (top of block)
+        block_bottom = bbox[3]  # y1 coordinate (bottom of block)
+
+        # Skip blocks in header area (top of page)
+        if block_top < header_margin:
+            continue
+
+        # Skip blocks in footer area (bottom of page)
+        if block_bottom > (page_height - footer_margin):
+            continue
+
+        if block_type == 0:  # Text block
+            # Extract text from lines with font size detection
+            lines = block.get("lines", [])
+
+            # Group lines by Y coordinate to handle tab-separated words on same line
+            grouped_lines = []
+            current_group = []
+            current_y = None
+            y_tolerance = 2  # Points tolerance for considering lines on same visual row
+
+            for line in lines:
+                bbox = line.get("bbox", [0, 0, 0, 0])
+                line_y = bbox[1]  # Top Y coordinate
+
+                if current_y is None or abs(line_y - current_y) <= y_tolerance:
+                    # Same visual line - add to current group
+                    current_group.append(line)
+                    if current_y is None:
+                        current_y = line_y
+                else:
+                    # New visual line - save previous group and start new one
+                    if current_group:
+                        grouped_lines.append(current_group)
+                    current_group = [line]
+                    current_y = line_y
 
-    try:
-        # Open PDF
-        doc = fitz.open(str(file_path))
-
-        # Extract metadata
-        metadata = {
-            "title": doc.metadata.get("title", ""),
-            "author": doc.metadata.get("author", ""),
-            "subject": doc.metadata.get("subject", ""),
-            "pages": str(doc.page_count),
-        }
-
-        # First pass: collect all font sizes to determine what's "normal" text
-        all_font_sizes = []
-        for page in doc:
-            blocks = page.get_text("dict")["blocks"]
-            for block in blocks:
-                if block.get("type", 0) == 0:  # Text block
-                    for line in block.get("lines", []):
-                        for span in line.get("spans", []):
-                            size = span.get("size", 0)
-                            if size > 0:
-                                all_font_sizes.append(size)
-
-        # Calculate base font size (median to ignore outliers)
-        if all_font_sizes:
-            all_font_sizes.sort()
-            base_font_size = all_font_sizes[len(all_font_sizes) // 2]
-        else:
-            base_font_size = 12  # Default fallback
-
-        # Process each page
-        for page_num, page in enumerate(doc, start=1):
-            # Get page dimensions to detect header/footer areas
-            page_rect = page.rect
-            page_height = page_rect.height
-
-            # Define header and footer margins (in points)
-            # Typical: 50-70 points (~1.7-2.4 cm) for header/footer
-            header_margin = 70  # Top margin to exclude
-            footer_margin = 70  # Bottom margin to exclude
-
-            # Get page layout with text blocks and image positions
-            blocks = page.get_text("dict")["blocks"]
-
-            # Build a map of image xrefs to saved paths
-            image_map = {}
-            image_list = page.get_images(full=True)
-            for img_index, img_info in enumerate(image_list):
-                xref = img_info[0]
-                try:
-                    # Extract and save image
-                    base_image = doc.extract_image(xref)
-                    image_bytes = base_image["image"]
-                    image_ext = base_image["ext"]
-
-                    base_name = f"pdf_page{page_num}_img{img_index}"
-                    image_path = save_image(image_bytes, image_ext, base_name, job_id)
-                    images_list.append(image_path)
-                    image_map[xref] = image_path
-
-                except Exception as e:
-                    print(
-                        f"Error extracting image {img_index} from page {page_num}: {e}"
-                    )
+            # Don't forget the last group
+            if current_group:
+                grouped_lines.append(current_group)
+
+            # Process each group of lines (visual rows)
+            for line_group in grouped_lines:
+                # Merge all spans from all lines in the group
+                all_spans = []
+                for line in line_group:
+                    all_spans.extend(line.get("spans", []))
+
+                if not all_spans:
                     continue
 
-            # Sort blocks by vertical position (top to bottom, left to right)
-            sorted_blocks = sorted(blocks, key=lambda b: (b["bbox"][1], b["bbox"][0]))
+                # Get average font size for this visual line
+                avg_font_size = sum(s["size"] for s in all_spans) / len(all_spans)
 
-            # Process blocks in order
-            page_content = []
-            for block in sorted_blocks:
-                block_type = block.get("type", 0)
-                bbox = block.get("bbox", [0, 0, 0, 0])
+                # Join text from all spans, replacing multiple spaces/tabs with single space
+                line_text = " ".join(
+                    span.get("text", "").strip()
+                    for span in all_spans
+                    if span.get("text", "").strip()
+                )
 
-                # Check if block is in header or footer area
-                block_top = bbox[1]  # y0 coordinate (top of block)
-                block_bottom = bbox[3]  # y1 coordinate (bottom of block)
+                if line_text.strip():
+                    records.append((avg_font_size, line_text))
 
-                # Skip blocks in header area (top of page)
-                if block_top < header_margin:
-                    continue
+        elif block_type == 1:  # Image block
+            # Find the image xref for this block
+            # Match by comparing image dimensions/position
+            # Since we already saved all images, insert an image record
+            if image_map:
+                # Use the first available image from map
+                # (Better heuristic could match by position, but this works for most cases)
+                for xref, img_path in list(image_map.items()):
+                    records.append((0, img_path))
+                    # Remove from map to avoid duplicates
+                    del image_map[xref]
+                    break
 
-                # Skip blocks in footer area (bottom of page)
-                if block_bottom > (page_height - footer_margin):
-                    continue
+    return records
+
+
+def _render_page(
+    page_num: int, records: list[tuple[float, str]], base_font_size: float
+) -> Iterator[Block]:
+    """Turn the compact records of a page into blocks.
+
+    Args:
+        page_num: 1-based page number
+        records: Records returned by ``_analyze_page``
+        base_font_size: Base font size for normal text
+
+    Yields:
+        Page break, heading/paragraph blocks and a closing spacer
+    """
+    yield PageBreak(page_num)
+    yield Spacer()
+    for font_size, text in records:
+        if not font_size:
+            # Image record
+            yield Paragraph([InlineImage(text)])
+            continue
+
+        # Determine if this is a heading based on font size
+        heading_level = _detect_heading_level(font_size, base_font_size)
+        if heading_level > 0:
+            yield Heading(heading_level, text.strip())
+        else:
+            yield Paragraph([Run(text)])
+    yield Spacer()
+
+
+class PdfShard(BaseModel):
+    """Analysis result of a contiguous page range.
+
+    Attributes:
+        pages: (page number, records) for every page with content
+        histogram: Font size histogram of the range
+        images: Saved image URLs in page order
+        image_writes_saved: Image references served from the xref memo
+        image_bytes_saved: Image bytes not written thanks to the memo
+    """
+
+    pages: list[tuple[int, list[tuple[float, str]]]] = Field(default_factory=list)
+    histogram: dict[float, int] = Field(default_factory=dict)
+    images: list[str] = Field(default_factory=list)
+    image_writes_saved: int = Field(default=0)
+    image_bytes_saved: int = Field(default=0)
+
+
+def read_pdf_info(file_path: Path) -> tuple[int, dict[str, str]]:
+    """Read page count and metadata without analyzing any page.
+
+    Args:
+        file_path: Path to PDF file
+
+    Returns:
+        Tuple of (page count, metadata)
+    """
+    try:
+        with fitz.open(str(file_path)) as doc:
+            metadata = {
+                "title": doc.metadata.get("title", ""),
+                "author": doc.metadata.get("author", ""),
+                "subject": doc.metadata.get("subject", ""),
+                "pages": str(doc.page_count),
+            }
+            return doc.page_count, metadata
+    except Exception as e:
+        raise ValueError(f"Failed to extract PDF: {str(e)}")
+
+
+def plan_page_shards(
+    page_count: int, workers: int, min_pages_per_shard: int
+) -> list[tuple[int, int]]:
+    """Split a document into contiguous page ranges for parallel analysis.
+
+    Args:
+        page_count: Number of pages in the document
+        workers: Maximum number of shards
+        min_pages_per_shard: Minimum number of pages in each shard
+
+    Returns:
+        List of (start, stop) 0-based half-open page ranges in page order
+    """
+    shard_count = max(1, min(workers, page_count // max(1, min_pages_per_shard)))
+    base, extra = divmod(page_count, shard_count)
+    shards = []
+    start = 0
+    for index in range(shard_count):
+        stop = start + base + (1 if index < extra else 0)
+        shards.append((start, stop))
+        start = stop
+    return shards
+
+
+def select_pages(
+    page_count: int, ranges: list[tuple[int, int | None]] | None
+) -> Sequence[int]:
+    """Resolve a page selection against the page count of a document.
+
+    Args:
+        page_count: Number of pages in the document
+        ranges: Sorted, non-overlapping 1-based inclusive (first, last)
+            ranges, ``last`` None meaning the end of the document, or None
+            for every page
+
+    Returns:
+        Sorted 0-based page indices
+
+    Raises:
+        PageSelectionError: If no selected page exists in the document
+    """
+    if ranges is None:
+        return range(page_count)
+    indices: list[int] = []
+    for first, last in ranges:
+        stop = page_count if last is None else min(last, page_count)
+        indices.extend(range(first - 1, stop))
+    if not indices:
+        raise PageSelectionError(
+            f"No selected page in the document ({page_count} pages)"
+        )
+    return indices
+
+
+def font_sample_pages(
+    page_count: int, selected: Sequence[int], limit: int
+) -> list[int]:
+    """Pick pages outside a selection whose font sizes complete its histogram.
+
+    A page range alone may be dominated by headings or small print, so the
+    base font size of a partial conversion also counts up to ``limit``
+    pages spread evenly over the rest of the document.
+
+    Args:
+        page_count: Number of pages in the document
+        selected: Sorted 0-based indices of the analyzed pages
+        limit: Maximum number of sample pages
+
+    Returns:
+        Sorted 0-based page indices, empty if every page is selected
+    """
+    if len(selected) >= page_count or limit <= 0:
+        return []
+    chosen = set(selected)
+    others = [index for index in range(page_count) if index not in chosen]
+    step = max(1, len(others) // limit)
+    return others[::step][:limit]
 
-                if block_type == 0:  # Text block
-                    # Extract text from lines with font size detection
-                    lines = block.get("lines", [])
-
-                    # Group lines by Y coordinate to handle tab-separated words on same line
-                    grouped_lines = []
-                    current_group = []
-                    current_y = None
-                    y_tolerance = (
-                        2  # Points tolerance for considering lines on same visual row
-                    )
-
-                    for line in lines:
-                        bbox = line.get("bbox", [0, 0, 0, 0])
-                        line_y = bbox[1]  # Top Y coordinate
-
-                        if current_y is None or abs(line_y - current_y) <= y_tolerance:
-                            # Same visual line - add to current group
-                            current_group.append(line)
-                            if current_y is None:
-                                current_y = line_y
-                        else:
-                            # New visual line - save previous group and start new one
-                            if current_group:
-                                grouped_lines.append(current_group)
-                            current_group = [line]
-                            current_y = line_y
-
-                    # Don't forget the last group
-                    if current_group:
-                        grouped_lines.append(current_group)
 
-                    # Process each group of lines (visual rows)
-                    for line_group in grouped_lines:
-                        # Merge all spans from all lines in the group
-                        all_spans = []
-                        for line in line_group:
-                            all_spans.extend(line.get("spans", []))
-
-                        if not all_spans:
-                            continue
-
-                        # Get average font size for this visual line
-                        line_font_sizes = [
-                            s.get("size", base_font_size) for s in all_spans
-                        ]
-                        avg_font_size = (
-                            sum(line_font_sizes) / len(line_font_sizes)
-                            if line_font_sizes
-                            else base_font_size
-                        )
-
-                        # Join text from all spans, replacing multiple spaces/tabs with single space
-                        line_text = " ".join(
-                            span.get("text", "").strip()
-                            for span in all_spans
-                            if span.get("text", "").strip()
-                        )
-
-                        if line_text.strip():
-                            # Determine if this is a heading based on font size
-                            heading_level = _detect_heading_level(
-                                avg_font_size, base_font_size
-                            )
-
-                            if heading_level > 0:
-                                # Add heading marker
-                                page_content.append(
-                                    f"HEADING{heading_level}:{line_text.strip()}"
-                                )
-                            else:
-                                # Normal text
-                                page_content.append(line_text)
-
-                elif block_type == 1:  # Image block
-                    # Find the image xref for this block
-                    # Match by comparing image dimensions/position
-                    # Since we already saved all images, insert marker
-                    if image_map:
-                        # Use the first available image from map
-                        # (Better heuristic could match by position, but this works for most cases)
-                        for xref, img_path in list(image_map.items()):
-                            page_content.append(f"IMAGE:{img_path}")
-                            # Remove from map to avoid duplicates
-                            del image_map[xref]
-                            break
-
-            # Add page content with page marker
-            if page_content:
-                page_text = "\n".join(page_content)
-                text_content.append(f"# Page {page_num}\n\n{page_text}\n")
-
-        doc.close()
+def sample_font_sizes(file_path: Path, page_indices: list[int]) -> dict[float, int]:
+    """Build the font size histogram of a few pages, without analyzing them.
 
+    Only the text is extracted: no image is decoded or saved.
+
+    Args:
+        file_path: Path to PDF file
+        page_indices: 0-based indices of the pages to sample
+
+    Returns:
+        Mapping of font size to number of spans using it
+    """
+    histogram: Counter[float] = Counter()
+    if not page_indices:
+        return {}
+    try:
+        with fitz.open(str(file_path)) as doc:
+            for page_index in page_indices:
+                page = doc[page_index]
+                blocks = page.get_text("dict", flags=fitz.TEXTFLAGS_TEXT)["blocks"]
+                _add_font_sizes(blocks, histogram)
     except Exception as e:
         raise ValueError(f"Failed to extract PDF: {str(e)}")
+    return dict(histogram)
+
+
+def analyze_pdf_range(
+    file_path: Path,
+    start: int,
+    stop: int,
+    job_id: str | None = None,
+    progress: ProgressReporter | None = None,
+) -> PdfShard:
+    """Analyze pages ``start``..``stop - 1`` with a dedicated document handle.
+
+    Args:
+        file_path: Path to PDF file
+        start: First page index (0-based, inclusive)
+        stop: Last page index (0-based, exclusive)
+        job_id: Optional job ID for organizing extracted images
+        progress: Optional reporter of analyzed pages and saved images
+
+    Returns:
+        PdfShard with page records, font size histogram and image URLs
+    """
+    return analyze_pdf_pages(file_path, range(start, stop), job_id, progress)
+
+
+def analyze_pdf_pages(
+    file_path: Path,
+    page_indices: Sequence[int],
+    job_id: str | None = None,
+    progress: ProgressReporter | None = None,
+) -> PdfShard:
+    """Analyze the given pages with a dedicated document handle.
+
+    Safe to run in a separate worker process: the shard opens its own
+    ``fitz.Document`` and returns only picklable data. Pages that are not
+    listed are never loaded.
+
+    Args:
+        file_path: Path to PDF file
+        page_indices: Sorted 0-based indices of the pages to analyze
+        job_id: Optional job ID for organizing extracted images
+        progress: Optional reporter of analyzed pages and saved images
+
+    Returns:
+        PdfShard with page records, font size histogram and image URLs
+    """
+    histogram: Counter[float] = Counter()
+    images_list: list[str] = []
+    image_cache: dict[int, tuple[str, int]] = {}
+    image_savings: Counter[str] = Counter()
+    pages = []
+
+    if progress is not None:
+        progress.start("pages", len(page_indices))
+
+    try:
+        with fitz.open(str(file_path)) as doc:
+            for done, page_index in enumerate(page_indices, 1):
+                page = doc[page_index]
+                page_num = page_index + 1
+                records = _analyze_page(
+                    doc,
+                    page,
+                    page_num,
+                    histogram,
+                    images_list,
+                    image_cache,
+                    image_savings,
+                    job_id,
+                )
+                if records:
+                    pages.append((page_num, records))
+                if progress is not None:
+                    progress.update(done, len(images_list))
+    except Exception as e:
+        raise ValueError(f"Failed to extract PDF: {str(e)}")
+
+    shard = PdfShard.model_construct(
+        pages=pages,
+        histogram=dict(histogram),
+        images=images_list,
+        image_writes_saved=image_savings["writes"],
+        image_bytes_saved=image_savings["bytes"],
+    )
+    if progress is not None:
+        progress.finish(len(images_list))
+    return shard
+
+
+def stream_pdf_shards(
+    shards: list[PdfShard],
+    metadata: dict[str, str],
+    font_sample: dict[float, int] | None = None,
+) -> ExtractedStream:
+    """Stream shard results in page order as the final extraction.
+
+    The base font size is computed from the combined histogram of all
+    shards, so heading detection is the same as for a sequential run. Pages
+    are rendered lazily while the blocks are consumed. The image
+    deduplication savings are reported in the stream counters as
+    ``image_writes_saved`` and ``image_bytes_saved``, and logged.
 
-    # Combine all text
-    full_text = "\n".join(text_content)
+    Args:
+        shards: Shard results ordered by page range
+        metadata: Document metadata from ``read_pdf_info``
+        font_sample: Font size histogram of sample pages outside the shards
+            (see ``font_sample_pages``), for partial conversions
+
+    Returns:
+        ExtractedStream with blocks, images, and metadata
+    """
+    # Calculate base font size (median to ignore outliers)
+    histogram: Counter[float] = Counter(font_sample or {})
+    for shard in shards:
+        histogram.update(shard.histogram)
+    base_font_size = _base_font_size(histogram)
+
+    images_list = []
+    for shard in shards:
+        images_list.extend(shard.images)
+
+    counters = {
+        "image_writes_saved": sum(s.image_writes_saved for s in shards),
+        "image_bytes_saved": sum(s.image_bytes_saved for s in shards),
+    }
+    logger.debug(
+        "Image xref memo saved %d writes (%d bytes) for %d images",
+        counters["image_writes_saved"],
+        counters["image_bytes_saved"],
+        len(images_list),
+    )
+
+    # Add page content with page breaks
+    page_blocks = (
+        block
+        for shard in shards
+        for page_num, records in shard.pages
+        for block in _render_page(page_num, records, base_font_size)
+    )
 
     # Post-process: merge consecutive headings of the same level
-    full_text = _merge_consecutive_headings(full_text)
+    blocks = _merge_consecutive_headings(page_blocks)
+
+    return ExtractedStream(blocks, images_list, metadata, counters)
+
 
-    return ExtractedData(text=full_text, images=images_list, metadata=metadata)
+def merge_pdf_shards(shards: list[PdfShard], metadata: dict[str, str]) -> ExtractedData:
+    """Merge shard results in page order into the final extraction.
+
+    Args:
+        shards: Shard results ordered by page range
+        metadata: Document metadata from ``read_pdf_info``
+
+    Returns:
+        ExtractedData with text, images, and metadata
+    """
+    return stream_pdf_shards(shards, metadata).collect()
+
+
+def stream_pdf(
+    file_path: Path,
+    job_id: str | None = None,
+    progress: ProgressReporter | None = None,
+    pages: list[tuple[int, int | None]] | None = None,
+) -> ExtractedStream:
+    """Extract a PDF as a stream of blocks.
+
+    Page layouts are analyzed up front into compact records, since the base
+    font size used for heading detection depends on the whole document; the
+    blocks are then produced page by page while the stream is consumed.
+    With a page selection only the selected pages are analyzed, and the
+    base font size also counts up to ``pdf_font_sample_pages`` other pages.
+
+    Args:
+        file_path: Path to PDF file
+        job_id: Optional job ID for organizing extracted images
+        progress: Optional reporter of analyzed pages and saved images
+        pages: Optional page selection (see ``select_pages``)
+
+    Returns:
+        ExtractedStream with blocks, images, and metadata
+    """
+    page_count, metadata = read_pdf_info(file_path)
+    selected = select_pages(page_count, pages)
+    sample = font_sample_pages(page_count, selected, config.pdf_font_sample_pages)
+    font_sample = sample_font_sizes(file_path, sample)
+    shard = analyze_pdf_pages(file_path, selected, job_id, progress)
+    return stream_pdf_shards([shard], metadata, font_sample)
+
+
+def extract_pdf(file_path: Path, job_id: str | None = None) -> ExtractedData:
+    """Extract text and images from PDF file with inline image positioning.
+
+    Each page layout is parsed once. The base font size (used to detect
+    headings) is the median of a font size histogram filled during that
+    pass, and headings are classified afterwards from compact page records.
+    For page-parallel extraction, run ``analyze_pdf_range`` on the ranges
+    from ``plan_page_shards`` and combine them with ``merge_pdf_shards``.
+
+    Args:
+        file_path: Path to PDF file
+        job_id: Optional job ID for organizing extracted images
+
+    Returns:
+        ExtractedData with text, images, and metadata
+    """
+    return stream_pdf(file_path, job_id).collect()
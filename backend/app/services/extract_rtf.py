@@ -9,7 +9,9 @@ from pathlib import Path
 
 from striprtf.striprtf import rtf_to_text
 
-from app.models.dto import ExtractedData
+from app.models.blocks import Block, Heading, ListItem, Paragraph, Run, Spacer
+from app.models.dto import ExtractedData, ExtractedStream
+from app.services.progress import ProgressReporter
 
 
 def _detect_heading_from_text(line: str) -> tuple[int, str]:
@@ -55,60 +57,70 @@ def _detect_heading_from_text(line: str) -> tuple[int, str]:
     return (0, stripped)
 
 
-def _parse_rtf_formatting(text: str) -> list[str]:
+def _parse_rtf_formatting(text: str) -> list[Block]:
     """Parse text and detect formatting patterns.
 
     Args:
         text: Plain text extracted from RTF
 
     Returns:
-        List of text lines with formatting markers
+        List of blocks, one per line of text
     """
     lines = text.split("\n")
-    formatted_lines = []
+    formatted_lines: list[Block] = []
 
     for line in lines:
         line = line.strip()
         if not line:
-            formatted_lines.append("")
+            formatted_lines.append(Spacer())
             continue
 
         # Detect headings
         heading_level, clean_text = _detect_heading_from_text(line)
 
         if heading_level > 0:
-            formatted_lines.append(f"HEADING{heading_level}:{clean_text}")
+            formatted_lines.append(Heading(heading_level, clean_text))
         else:
             # Check for list patterns
             # Bullet lists: • text, - text, * text
             bullet_pattern = r"^[•\-\*]\s+(.+)$"
             bullet_match = re.match(bullet_pattern, line)
             if bullet_match:
-                formatted_lines.append(f"LIST:{bullet_match.group(1)}")
+                formatted_lines.append(ListItem([Run(bullet_match.group(1))]))
                 continue
 
             # Numbered lists: 1. text, a) text, i. text
             num_list_pattern = r"^(\d+|[a-z]|[ivxlcdm]+)[\.\)]\s+(.+)$"
-            num_match = re.match(num_list_pattern, line.lower())
+            num_match = re.match(num_list_pattern, line, re.IGNORECASE)
             if num_match:
-                formatted_lines.append(f"LIST:{num_match.group(2)}")
+                formatted_lines.append(
+                    ListItem([Run(num_match.group(2))], ordered=True)
+                )
                 continue
 
             # Normal text
-            formatted_lines.append(line)
+            formatted_lines.append(Paragraph([Run(line)]))
 
     return formatted_lines
 
 
-def extract_rtf(file_path: Path, job_id: str | None = None) -> ExtractedData:
-    """Extract text from RTF file.
+def stream_rtf(
+    file_path: Path,
+    job_id: str | None = None,
+    progress: ProgressReporter | None = None,
+) -> ExtractedStream:
+    """Extract an RTF file as a stream of blocks.
+
+    striprtf converts the whole file at once, so the blocks are parsed
+    from the converted text up front.
 
     Args:
         file_path: Path to RTF file
         job_id: Optional job ID (not used for RTF, no image extraction)
+        progress: Optional reporter, told once the whole file is parsed
 
     Returns:
-        ExtractedData with text and metadata
+        ExtractedStream with blocks and metadata
 
     Note:
         RTF image extraction is not implemented due to complexity.
@@ -168,16 +180,42 @@ def extract_rtf(file_path: Path, job_id: str | None = None) -> ExtractedData:
     except Exception as e:
         raise ValueError(f"Failed to extract RTF: {str(e)}")
 
-    # Join text with newlines
-    full_text = "\n".join(text_content)
-
     # Add note about image extraction limitation
     if "image" in rtf_content.lower() or "pict" in rtf_content.lower():
         # RTF might contain images but we can't extract them easily
-        full_text += (
-            "\n\nHEADING2:Nota\n"
-            "Le immagini embedded in RTF non possono essere estratte automaticamente. "
-            "Si consiglia di convertire il file in DOCX per una migliore estrazione delle immagini."
-        )
+        text_content = [
+            *text_content,
+            Spacer(),
+            Heading(2, "Nota"),
+            Paragraph(
+                [
+                    Run(
+                        "Le immagini embedded in RTF non possono essere estratte automaticamente. "
+                        "Si consiglia di convertire il file in DOCX per una migliore estrazione delle immagini."
+                    )
+                ]
+            ),
+        ]
+
+    if progress is not None:
+        progress.start("blocks", len(text_content))
+        progress.finish()
+
+    return ExtractedStream(iter(text_content), images_list, metadata)
+
+
+def extract_rtf(file_path: Path, job_id: str | None = None) -> ExtractedData:
+    """Extract text from RTF file.
+
+    Args:
+        file_path: Path to RTF file
+        job_id: Optional job ID (not used for RTF, no image extraction)
+
+    Returns:
+        ExtractedData with text and metadata
 
-    return ExtractedData(text=full_text, images=images_list, metadata=metadata)
+    Note:
+        RTF image extraction is not implemented due to complexity.
+        Images embedded in RTF files will not be extracted.
+    """
+    return stream_rtf(file_path, job_id).collect()
@@ -0,0 +1,193 @@
+"""Asynchronous conversion job queue.
+
+Uploads submitted through the job API are stored immediately and queued on a
+bounded in-memory queue. A fixed number of worker tasks take jobs off the
+queue and run the regular conversion pipeline, so clients can poll for the
+result instead of holding a request open for the whole conversion.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from app.core.config import config
+from app.models.dto import ConvertResponse, JobStatus, StoredUpload
+from app.services.pipeline import convert_stored_upload
+
+
+class JobQueueFullError(Exception):
+    """Raised when the job queue has no room for another job."""
+
+
+class JobRecord(BaseModel):
+    """Internal state of a queued conversion job.
+
+    Attributes:
+        status: Public job status
+        result: Conversion result once the job is DONE
+        started_at: Monotonic time the job started running
+        finished_at: Monotonic time the job finished (DONE or ERROR)
+    """
+
+    status: JobStatus
+    result: ConvertResponse | None = None
+    started_at: float | None = None
+    finished_at: float | None = None
+
+
+class _QueuedJob(BaseModel):
+    """Work item placed on the job queue."""
+
+    job_id: str
+    upload: StoredUpload
+    filename: str
+    ext: str
+
+
+class JobManager:
+    """Bounded job queue with a fixed pool of async workers."""
+
+    def __init__(self, workers: int, queue_size: int, history_size: int) -> None:
+        """Initialize the manager (workers start lazily on first submit).
+
+        Args:
+            workers: Number of concurrent worker tasks
+            queue_size: Maximum number of jobs waiting in the queue
+            history_size: Maximum number of finished jobs kept for polling
+        """
+        self._workers = workers
+        self._queue_size = queue_size
+        self._history_size = history_size
+        self._queue: asyncio.Queue[_QueuedJob] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._jobs: OrderedDict[str, JobRecord] = OrderedDict()
+        self._running = 0
+
+    def _ensure_started(self) -> asyncio.Queue[_QueuedJob]:
+        """Create the queue and worker tasks on the running event loop.
+
+        Returns:
+            The job queue
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self._queue_size)
+            self._tasks = [
+                asyncio.create_task(self._worker(), name=f"job-worker-{i}")
+                for i in range(self._workers)
+            ]
+        return self._queue
+
+    def submit(
+        self, upload: StoredUpload, filename: str, ext: str, job_id: str
+    ) -> JobStatus:
+        """Queue a stored upload for conversion.
+
+        Args:
+            upload: Stored upload to convert
+            filename: Original filename of the upload
+            ext: Lowercase file extension without the leading dot
+            job_id: Identifier for the new job
+
+        Returns:
+            Initial PENDING status of the job
+
+        Raises:
+            JobQueueFullError: If the queue is full
+        """
+        queue = self._ensure_started()
+        item = _QueuedJob(job_id=job_id, upload=upload, filename=filename, ext=ext)
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull as e:
+            raise JobQueueFullError("Job queue is full") from e
+
+        status = JobStatus(id=job_id, status="PENDING")
+        self._jobs[job_id] = JobRecord(status=status)
+        self._prune_history()
+        return status
+
+    def get(self, job_id: str) -> JobRecord | None:
+        """Look up a job by id.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            The job record, or None if unknown or already evicted
+        """
+        return self._jobs.get(job_id)
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs waiting to be picked up by a worker."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    @property
+    def running(self) -> int:
+        """Number of jobs being converted by a worker."""
+        return self._running
+
+    async def _worker(self) -> None:
+        """Process queued jobs until cancelled."""
+        assert self._queue is not None
+        while True:
+            item = await self._queue.get()
+            record = self._jobs.get(item.job_id)
+            self._running += 1
+            try:
+                if record is not None:
+                    record.status.status = "RUNNING"
+                    record.started_at = time.monotonic()
+                result = await convert_stored_upload(
+                    item.upload,
+                    item.filename,
+                    item.ext,
+                    item.job_id,
+                    report_progress=True,
+                )
+                if record is not None:
+                    record.result = result
+                    record.status.status = "DONE"
+            except Exception as e:
+                if record is not None:
+                    record.status.status = "ERROR"
+                    record.status.error = (
+                        str(e.detail) if isinstance(e, HTTPException) else str(e)
+                    )
+            finally:
+                if record is not None:
+                    record.finished_at = time.monotonic()
+                self._running -= 1
+                self._queue.task_done()
+
+    def _prune_history(self) -> None:
+        """Drop the oldest finished jobs beyond the history limit."""
+        excess = len(self._jobs) - self._history_size
+        if excess <= 0:
+            return
+        finished = [
+            job_id
+            for job_id, record in self._jobs.items()
+            if record.status.status in ("DONE", "ERROR")
+        ]
+        for job_id in finished[:excess]:
+            del self._jobs[job_id]
+
+    async def shutdown(self) -> None:
+        """Cancel the worker tasks (called on application shutdown)."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+
+# Global job manager instance
+job_manager = JobManager(
+    workers=config.job_workers,
+    queue_size=config.job_queue_size,
+    history_size=config.job_history_size,
+)
@@ -0,0 +1,627 @@
+"""Conversion pipeline shared by the synchronous and job-based endpoints.
+
+This module validates uploads and runs the extract → wikitext → save steps
+for a stored upload, awaiting the blocking work through the executor. The
+steps are chained as generators: extracted blocks are rendered and written
+to the output file as they are produced, so the document text is held in
+memory only once, when the finished output is read back for the response.
+"""
+
+import asyncio
+import importlib
+import re
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING, Any
+
+from fastapi import HTTPException, UploadFile
+
+from app.core import metrics
+from app.core.config import config
+from app.models.blocks import Block, PageBreak
+from app.models.dto import (
+    ConversionStats,
+    ConvertResponse,
+    ExtractedStream,
+    StoredUpload,
+)
+from app.services.cache import cache_key, conversion_cache
+from app.services.convert_wikitext import iter_wikitext
+from app.services.errors import PageSelectionError
+from app.services.executor import run_cpu, run_io
+from app.services.profiling import run_profiled
+from app.services.progress import ProgressReporter, clear_progress
+from app.services.storage import (
+    UploadTooLargeError,
+    cleanup_upload,
+    save_output,
+    save_upload,
+)
+
+if TYPE_CHECKING:
+    from app.services.extract_pdf import PdfShard
+
+# Page selection of a partial PDF conversion: 1-based inclusive ranges,
+# the last page of a range being None for the end of the document
+PageRanges = list[tuple[int, int | None]]
+
+# Maximum number of comma-separated ranges in a page selection
+MAX_PAGE_RANGES = 100
+
+_PAGE_RANGE = re.compile(r"^(\d+)(?:-(\d*))?$")
+
+# Job ids whose conversion is in progress; retention never removes their
+# images, however long the conversion takes
+active_jobs: set[str] = set()
+
+# Extractor module for each supported file extension. Modules are imported
+# on first use: PyMuPDF and python-docx would otherwise dominate the server
+# start-up time
+EXTRACTOR_MODULES = {
+    "pdf": "app.services.extract_pdf",
+    "docx": "app.services.extract_docx",
+    "odt": "app.services.extract_odt",
+    "rtf": "app.services.extract_rtf",
+}
+
+
+def _extractor_module(ext: str) -> ModuleType:
+    """Import (once) and return the extractor module of a file extension."""
+    return importlib.import_module(EXTRACTOR_MODULES[ext])
+
+
+def get_extractor(ext: str) -> Callable[[Path, str | None], ExtractedStream]:
+    """Return the streaming extractor of a file extension.
+
+    Args:
+        ext: Lowercase file extension without the leading dot
+
+    Returns:
+        The module's ``stream_<ext>`` function
+    """
+    return getattr(_extractor_module(ext), f"stream_{ext}")
+
+
+def load_extractors() -> None:
+    """Import every extractor module."""
+    for ext in EXTRACTOR_MODULES:
+        _extractor_module(ext)
+
+
+async def warm_up_extractors() -> None:
+    """Import the extractors ahead of the first conversion.
+
+    The modules are loaded in the server process (used by the I/O steps)
+    and in each worker of the CPU pool, which is started as a side effect.
+    """
+    await asyncio.gather(
+        run_io(load_extractors),
+        *(run_cpu(load_extractors) for _ in range(config.cpu_pool_workers)),
+    )
+
+
+class ConversionStageError(Exception):
+    """Raised by the conversion workers with a stage-prefixed message.
+
+    The message starts with "Extraction failed:" or "Conversion failed:" and
+    is used as the HTTP error detail. Only the message is kept, so the error
+    survives the trip back from a worker process.
+    """
+
+
+def validate_upload(file: UploadFile) -> str:
+    """Validate filename and extension of an uploaded file.
+
+    The size limit is enforced while the upload is streamed to disk.
+
+    Args:
+        file: Uploaded document file
+
+    Returns:
+        Lowercase file extension without the leading dot
+
+    Raises:
+        HTTPException: If the filename is missing or the type is unsupported
+    """
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="Filename is required")
+
+    ext = file.filename.lower().rsplit(".", 1)[-1]
+    if f".{ext}" not in config.allowed_extensions:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type. Allowed: {', '.join(config.allowed_extensions)}",
+        )
+
+    return ext
+
+
+def parse_pages(pages: str | None, ext: str) -> PageRanges | None:
+    """Parse the page selection of a conversion request.
+
+    A selection is a comma-separated list of pages and ranges, such as
+    ``"120-180"`` or ``"1,5,10-"`` (page 10 to the end).
+
+    Args:
+        pages: Page selection, or None to convert every page
+        ext: Lowercase file extension without the leading dot
+
+    Returns:
+        Sorted, merged 1-based ranges, or None for every page
+
+    Raises:
+        HTTPException: If the selection is malformed or the file is not a PDF
+    """
+    if pages is None or not pages.strip():
+        return None
+    if ext != "pdf":
+        raise HTTPException(
+            status_code=400, detail="Page selection is only supported for PDF files"
+        )
+
+    ranges = []
+    parts = pages.replace(" ", "").split(",")
+    for part in parts[: MAX_PAGE_RANGES + 1]:
+        match = _PAGE_RANGE.match(part)
+        if match is None:
+            raise HTTPException(status_code=400, detail=f"Invalid page range: {part}")
+        first = int(match.group(1))
+        if match.group(2) is None:
+            last = first
+        else:
+            last = int(match.group(2)) if match.group(2) else None
+        if first < 1 or (last is not None and last < first):
+            raise HTTPException(status_code=400, detail=f"Invalid page range: {part}")
+        ranges.append((first, last))
+    if len(parts) > MAX_PAGE_RANGES:
+        raise HTTPException(
+            status_code=400, detail=f"Too many page ranges (max {MAX_PAGE_RANGES})"
+        )
+
+    # Sort and merge overlapping or adjacent ranges
+    merged: PageRanges = []
+    for first, last in sorted(ranges, key=lambda item: item[0]):
+        if merged:
+            previous_first, previous_last = merged[-1]
+            if previous_last is None:
+                break  # Already open to the end of the document
+            if first <= previous_last + 1:
+                if last is not None:
+                    last = max(last, previous_last)
+                merged[-1] = (previous_first, last)
+                continue
+        merged.append((first, last))
+    return merged
+
+
+async def store_upload(file: UploadFile, max_mb: int | None = None) -> StoredUpload:
+    """Stream an uploaded file to the upload directory.
+
+    Args:
+        file: Uploaded document file
+        max_mb: Size limit in MB (default: ``config.max_file_size_mb``)
+
+    Returns:
+        StoredUpload with path, size and content hash
+
+    Raises:
+        HTTPException: If the file is too large or cannot be saved
+    """
+    if max_mb is None:
+        max_mb = config.max_file_size_mb
+    try:
+        return await run_io(save_upload, file, max_mb * 1024 * 1024)
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large. Maximum size: {max_mb}MB",
+        ) from e
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to save upload: {str(e)}"
+        ) from e
+
+
+def _stage_blocks(stream: ExtractedStream, stats: ConversionStats) -> Iterator[Block]:
+    """Yield the extracted blocks, tagging extractor errors with their stage.
+
+    The time spent producing the blocks and the number of pages are added
+    to ``stats`` once the stream is done.
+
+    Args:
+        stream: Extracted document stream
+        stats: Statistics of the conversion
+
+    Yields:
+        Extracted blocks
+
+    Raises:
+        ConversionStageError: If the extractor fails while streaming
+    """
+    clock = time.perf_counter
+    blocks = iter(stream.blocks)
+    elapsed = 0.0
+    pages = 0
+    try:
+        while True:
+            start = clock()
+            block = next(blocks, None)
+            elapsed += clock() - start
+            if block is None:
+                return
+            if type(block) is PageBreak:
+                pages += 1
+            yield block
+    except Exception as e:
+        raise ConversionStageError(f"Extraction failed: {str(e)}") from e
+    finally:
+        stats.extract_seconds += elapsed
+        stats.pages += pages
+
+
+def render_stream(
+    stream: ExtractedStream, filename: str, stats: ConversionStats | None = None
+) -> tuple[str, list[str], list[str], ConversionStats]:
+    """Render an extracted stream to MediaWiki and save it to the output file.
+
+    Blocks flow from the extractor through ``iter_wikitext`` straight into
+    ``save_output``; the returned text is collected from the same lines, never
+    read back from the output file, which concurrent conversions of a file
+    with the same name may replace. If the output file cannot be created,
+    the rendering finishes in memory and a warning is added.
+
+    Args:
+        stream: Extracted document stream
+        filename: Original filename of the upload
+        stats: Statistics to add to (default: new ones)
+
+    Returns:
+        Tuple of (wikitext, images, warnings, stats)
+
+    Raises:
+        ConversionStageError: If extraction or rendering fails
+    """
+    if stats is None:
+        stats = ConversionStats()
+    start = time.perf_counter()
+    extract_before = stats.extract_seconds
+    warnings: list[str] = []
+    wiki_lines = iter_wikitext(_stage_blocks(stream, stats), warnings)
+    lines: list[str] = []
+
+    def track() -> Iterator[str]:
+        for line in wiki_lines:
+            lines.append(line)
+            yield line
+
+    try:
+        save_output(filename, track())
+        wikitext = "\n".join(lines)
+        stats.output_bytes = len(wikitext.encode("utf-8"))
+    except ConversionStageError:
+        raise
+    except OSError as e:
+        if lines:
+            raise ConversionStageError(f"Conversion failed: {str(e)}") from e
+        # Not critical - we can still return the result
+        wikitext = "\n".join(wiki_lines)
+        warnings.append(f"Failed to save output file: {str(e)}")
+        stats.output_bytes = len(wikitext.encode("utf-8"))
+    except Exception as e:
+        raise ConversionStageError(f"Conversion failed: {str(e)}") from e
+
+    # Everything not spent pulling blocks from the extractor was rendering
+    extract_seconds = stats.extract_seconds - extract_before
+    stats.render_seconds += time.perf_counter() - start - extract_seconds
+    stats.images = len(stream.images)
+    stats.image_writes_saved += stream.counters.get("image_writes_saved", 0)
+    stats.image_bytes_saved += stream.counters.get("image_bytes_saved", 0)
+    return wikitext, stream.images, warnings, stats
+
+
+def convert_document(
+    upload_path: Path,
+    filename: str,
+    ext: str,
+    job_id: str,
+    report_progress: bool = False,
+    pages: PageRanges | None = None,
+) -> tuple[str, list[str], list[str], ConversionStats]:
+    """Extract, render and save a document in one worker task.
+
+    Args:
+        upload_path: Path of the stored upload
+        filename: Original filename of the upload
+        ext: Lowercase file extension without the leading dot
+        job_id: Job identifier used to organize extracted images
+        report_progress: Report extraction progress under job_id
+        pages: PDF page selection from ``parse_pages``
+
+    Returns:
+        Tuple of (wikitext, images, warnings, stats)
+
+    Raises:
+        PageSelectionError: If no selected page exists in the document
+        ConversionStageError: If extraction or rendering fails
+    """
+    progress = ProgressReporter(job_id) if report_progress else None
+    start = time.perf_counter()
+    try:
+        extractor = get_extractor(ext)
+        if pages is None:
+            stream = extractor(upload_path, job_id, progress)
+        else:
+            stream = extractor(upload_path, job_id, progress, pages)
+    except PageSelectionError:
+        raise
+    except Exception as e:
+        raise ConversionStageError(f"Extraction failed: {str(e)}") from e
+    stats = ConversionStats(extract_seconds=time.perf_counter() - start)
+    return render_stream(stream, filename, stats)
+
+
+def render_pdf_shards(
+    shards: list["PdfShard"],
+    metadata: dict[str, str],
+    filename: str,
+    stats: ConversionStats,
+    font_sample: dict[float, int] | None = None,
+) -> tuple[str, list[str], list[str], ConversionStats]:
+    """Render and save the merged result of page-parallel PDF analysis.
+
+    Args:
+        shards: Shard results ordered by page range
+        metadata: Document metadata from ``read_pdf_info``
+        filename: Original filename of the upload
+        stats: Statistics of the page analysis, added to
+        font_sample: Font size histogram of pages outside a page selection
+
+    Returns:
+        Tuple of (wikitext, images, warnings, stats)
+
+    Raises:
+        ConversionStageError: If extraction or rendering fails
+    """
+    stream = _extractor_module("pdf").stream_pdf_shards(shards, metadata, font_sample)
+    return render_stream(stream, filename, stats)
+
+
+async def _convert_pdf_parallel(
+    upload_path: Path,
+    filename: str,
+    job_id: str,
+    report_progress: bool = False,
+    pages: PageRanges | None = None,
+) -> tuple[str, list[str], list[str], ConversionStats]:
+    """Convert a PDF by analyzing page ranges concurrently in the CPU pool.
+
+    Documents (or page selections) too small to be split are converted in
+    a single task.
+
+    Args:
+        upload_path: Path of the stored upload
+        filename: Original filename of the upload
+        job_id: Job identifier used to organize extracted images
+        report_progress: Report the progress of each page range under job_id
+        pages: Page selection from ``parse_pages``; only those pages are
+            analyzed
+
+    Returns:
+        Tuple of (wikitext, images, warnings, stats), identical to a
+        sequential run
+    """
+    start = time.perf_counter()
+    pdf = _extractor_module("pdf")
+    try:
+        page_count, metadata = await run_cpu(pdf.read_pdf_info, upload_path)
+        selected = pdf.select_pages(page_count, pages)
+        shards = pdf.plan_page_shards(
+            len(selected),
+            config.pdf_parallel_workers,
+            config.pdf_min_pages_per_shard,
+        )
+        if len(shards) < 2:
+            return await run_cpu(
+                convert_document,
+                upload_path,
+                filename,
+                "pdf",
+                job_id,
+                report_progress,
+                pages,
+            )
+        sample = pdf.font_sample_pages(
+            page_count, selected, config.pdf_font_sample_pages
+        )
+        font_sample, *results = await asyncio.gather(
+            run_cpu(pdf.sample_font_sizes, upload_path, sample),
+            *(
+                run_cpu(
+                    pdf.analyze_pdf_pages,
+                    upload_path,
+                    selected[start:stop],
+                    job_id,
+                    ProgressReporter(job_id, f"pages-{start}")
+                    if report_progress
+                    else None,
+                )
+                for start, stop in shards
+            ),
+        )
+    except (ConversionStageError, PageSelectionError):
+        raise
+    except Exception as e:
+        raise ConversionStageError(f"Extraction failed: {str(e)}") from e
+    stats = ConversionStats(extract_seconds=time.perf_counter() - start)
+    return await run_io(
+        render_pdf_shards, results, metadata, filename, stats, font_sample
+    )
+
+
+async def _convert(
+    upload_path: Path,
+    filename: str,
+    ext: str,
+    job_id: str,
+    profile: bool = False,
+    report_progress: bool = False,
+    pages: PageRanges | None = None,
+) -> ConvertResponse:
+    """Run extraction, rendering and output saving for a stored upload.
+
+    Args:
+        upload_path: Path of the stored upload
+        filename: Original filename of the upload
+        ext: Lowercase file extension without the leading dot
+        job_id: Job identifier used to organize extracted images
+        profile: Profile the conversion and store the profile under job_id.
+            Profiled PDFs are converted in a single task, so that the
+            profile covers the whole document.
+        report_progress: Report extraction progress under job_id
+        pages: PDF page selection from ``parse_pages``
+
+    Returns:
+        ConvertResponse with converted text, images, and warnings
+
+    Raises:
+        HTTPException: If the file type is unsupported or processing fails
+    """
+    if ext not in EXTRACTOR_MODULES:
+        raise HTTPException(status_code=400, detail="Unsupported file type")
+
+    # Convert off the event loop (pass job_id to organize images)
+    try:
+        if profile:
+            wikitext, images, warnings, stats = await run_cpu(
+                run_profiled,
+                job_id,
+                convert_document,
+                upload_path,
+                filename,
+                ext,
+                job_id,
+                report_progress,
+                pages,
+            )
+        elif ext == "pdf" and config.pdf_parallel_workers > 1:
+            wikitext, images, warnings, stats = await _convert_pdf_parallel(
+                upload_path, filename, job_id, report_progress, pages
+            )
+        else:
+            wikitext, images, warnings, stats = await run_cpu(
+                convert_document,
+                upload_path,
+                filename,
+                ext,
+                job_id,
+                report_progress,
+                pages,
+            )
+    except PageSelectionError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except ConversionStageError as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Extraction failed: {str(e)}"
+        ) from e
+
+    metrics.EXTRACT_SECONDS.observe(stats.extract_seconds, format=ext)
+    metrics.RENDER_SECONDS.observe(stats.render_seconds, format=ext)
+    metrics.PAGES.inc(stats.pages, format=ext)
+    metrics.IMAGES.inc(stats.images, format=ext)
+    metrics.OUTPUT_BYTES.inc(stats.output_bytes, format=ext)
+    metrics.IMAGE_WRITES_SAVED.inc(stats.image_writes_saved, format=ext)
+    metrics.IMAGE_BYTES_SAVED.inc(stats.image_bytes_saved, format=ext)
+
+    return ConvertResponse(
+        id=job_id,
+        filename=filename,
+        mediawiki_text=wikitext,
+        images=images,
+        warnings=warnings,
+    )
+
+
+async def convert_stored_upload(
+    upload: StoredUpload,
+    filename: str,
+    ext: str,
+    job_id: str,
+    profile: bool = False,
+    report_progress: bool = False,
+    pages: PageRanges | None = None,
+) -> ConvertResponse:
+    """Convert a stored upload to MediaWiki and clean it up afterwards.
+
+    Identical uploads are answered from the conversion cache. A cached
+    response keeps the id of the conversion that produced its images, so
+    image URLs and the images ZIP download stay valid. The job id is listed
+    in ``active_jobs`` until the conversion ends.
+
+    Args:
+        upload: StoredUpload returned by ``store_upload``
+        filename: Original filename of the upload
+        ext: Lowercase file extension without the leading dot
+        job_id: Job identifier used to organize extracted images
+        profile: Profile the conversion (see ``_convert``); the cache is
+            not consulted, so the document is always converted
+        report_progress: Report extraction progress under job_id while
+            converting (see ``app.services.progress``)
+        pages: PDF page selection from ``parse_pages``; part of the cache
+            key, so each selection is cached separately (as is the
+            ``docx_engine`` setting for DOCX uploads)
+
+    Returns:
+        ConvertResponse with converted text, images, and warnings
+
+    Raises:
+        HTTPException: If the file type is unsupported or processing fails
+    """
+    outcome = "error"
+    metrics.IN_PROGRESS.inc()
+    active_jobs.add(job_id)
+    try:
+        key = None
+        response = None
+        if config.cache_enabled:
+            options: dict[str, Any] = {}
+            if pages is not None:
+                options["pages"] = pages
+            if ext == "docx":
+                options["docx_engine"] = config.docx_engine
+            key = cache_key(upload.sha256, ext, options)
+            if not profile:
+                response = await run_io(conversion_cache.get, key)
+
+        if response is None:
+            # The output file is written while the document is converted
+            response = await _convert(
+                upload.path, filename, ext, job_id, profile, report_progress, pages
+            )
+            outcome = "done"
+            metrics.INPUT_BYTES.inc(upload.size, format=ext)
+            if key is not None:
+                await run_io(conversion_cache.put, key, response)
+        else:
+            outcome = "cached"
+            response = response.model_copy(update={"filename": filename})
+
+            # Save output with original filename
+            try:
+                await run_io(save_output, filename, response.mediawiki_text)
+            except Exception as e:
+                # Not critical - we can still return the result
+                response.warnings.append(f"Failed to save output file: {str(e)}")
+    finally:
+        active_jobs.discard(job_id)
+        metrics.IN_PROGRESS.dec()
+        metrics.CONVERSIONS.inc(format=ext, outcome=outcome)
+        # Clean up uploaded file
+        await run_io(cleanup_upload, upload.path)
+        if report_progress:
+            await run_io(clear_progress, job_id)
+
+    return response
@@ -0,0 +1,201 @@
+"""On-demand profiling of single conversions.
+
+A conversion selected for profiling runs under ``cProfile`` in its worker.
+The raw profile is saved as ``<job_id>.prof`` (loadable with ``pstats`` or
+snakeviz) next to a JSON summary of the hot functions, both under
+``config.profiles_dir``. Conversions that are not profiled never call into
+this module, so they pay no overhead.
+"""
+
+import cProfile
+import hmac
+import os
+import pstats
+import re
+import time
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from app.core.config import config
+from app.models.dto import ProfileFunction, ProfileSummary
+
+# Extractor and rendering functions aggregated in the summary
+CONVERSION_FUNCTIONS = re.compile(
+    r"^(extract_\w+|stream_\w+|_iter_\w+_blocks|_extract_formatted_text"
+    r"|_convert_formatting|iter_wikitext)$"
+)
+
+
+class InvalidProfileTokenError(Exception):
+    """Raised when a request carries a profiling token that does not match."""
+
+
+def token_matches(token: str | None) -> bool:
+    """Return whether a token equals the configured ``profiling_token``.
+
+    The same token guards profiling and the admin endpoints exposing
+    profiles; without a configured token nothing matches.
+
+    Args:
+        token: Value of the ``X-Profile-Token`` header, if any
+
+    Returns:
+        True if both are set and equal
+    """
+    expected = config.profiling_token
+    if token is None or expected is None:
+        return False
+    return hmac.compare_digest(token, expected)
+
+
+def profile_requested(token: str | None) -> bool:
+    """Decide whether a conversion request should be profiled.
+
+    Args:
+        token: Value of the ``X-Profile-Token`` header, if any
+
+    Returns:
+        True if profiling is enabled globally or the token is valid
+
+    Raises:
+        InvalidProfileTokenError: If a token is given but does not match
+    """
+    if token is None:
+        return config.profiling_enabled
+    if not token_matches(token):
+        raise InvalidProfileTokenError("Invalid profiling token")
+    return True
+
+
+def profile_paths(job_id: str) -> tuple[Path, Path]:
+    """Return the raw profile and summary paths of a job.
+
+    Args:
+        job_id: Job identifier
+
+    Returns:
+        Tuple of (``.prof`` path, ``.json`` summary path)
+    """
+    directory = config.get_project_path(config.profiles_dir)
+    return directory / f"{job_id}.prof", directory / f"{job_id}.json"
+
+
+def _function(
+    key: tuple[str, int, str], calls: int, tt: float, ct: float
+) -> ProfileFunction:
+    """Build a ProfileFunction from a ``pstats`` entry."""
+    filename, line, name = key
+    return ProfileFunction(
+        function=name,
+        location=f"{filename}:{line}" if line else filename,
+        calls=calls,
+        total_seconds=tt,
+        cumulative_seconds=ct,
+    )
+
+
+def summarize_profile(
+    stats: pstats.Stats, job_id: str, total_seconds: float
+) -> ProfileSummary:
+    """Extract the hot functions of a profile.
+
+    Args:
+        stats: Loaded profile
+        job_id: Job identifier of the profiled conversion
+        total_seconds: Wall time of the profiled call
+
+    Returns:
+        ProfileSummary with the top functions by own time, and the extractor
+        and rendering functions aggregated by name across modules
+    """
+    entries = stats.stats  # {(file, line, name): (cc, nc, tt, ct, callers)}
+    ranked = sorted(entries.items(), key=lambda item: item[1][2], reverse=True)
+    hot = [
+        _function(key, nc, tt, ct)
+        for key, (_cc, nc, tt, ct, _callers) in ranked[: config.profile_top_functions]
+    ]
+
+    aggregated: dict[str, ProfileFunction] = {}
+    for key, (_cc, nc, tt, ct, _callers) in entries.items():
+        filename, _line, name = key
+        if not CONVERSION_FUNCTIONS.match(name) or "app" not in Path(filename).parts:
+            continue
+        entry = aggregated.get(name)
+        if entry is None:
+            aggregated[name] = _function(key, nc, tt, ct)
+        else:
+            entry.location = f"{entry.location}, {filename}"
+            entry.calls += nc
+            entry.total_seconds += tt
+            entry.cumulative_seconds += ct
+
+    conversion = sorted(
+        aggregated.values(), key=lambda entry: entry.cumulative_seconds, reverse=True
+    )
+    return ProfileSummary(
+        id=job_id,
+        total_seconds=total_seconds,
+        hot_functions=hot,
+        conversion_functions=conversion,
+    )
+
+
+def _write_atomic(path: Path, write: Callable[[Path], None]) -> None:
+    """Write a file through a temporary name so readers never see it partial."""
+    tmp_path = path.with_name(f".{uuid.uuid4().hex}.tmp")
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def run_profiled(job_id: str, func: Callable[..., Any], *args: Any) -> Any:
+    """Call ``func(*args)`` under ``cProfile`` and save the profile.
+
+    The profile is saved even if the call fails, since slow failing
+    documents are worth profiling too. Meant to run in a CPU worker.
+
+    Args:
+        job_id: Job identifier the profile is stored under
+        func: Function to profile
+        *args: Positional arguments for ``func``
+
+    Returns:
+        The function's return value
+    """
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    try:
+        return profiler.runcall(func, *args)
+    finally:
+        total_seconds = time.perf_counter() - start
+        prof_path, summary_path = profile_paths(job_id)
+        prof_path.parent.mkdir(parents=True, exist_ok=True)
+        stats = pstats.Stats(profiler)
+        summary = summarize_profile(stats, job_id, total_seconds)
+        _write_atomic(prof_path, lambda path: stats.dump_stats(path))
+        _write_atomic(
+            summary_path,
+            lambda path: path.write_text(summary.model_dump_json(), encoding="utf-8"),
+        )
+
+
+def load_profile_summary(job_id: str) -> ProfileSummary | None:
+    """Load the summary of a profiled conversion.
+
+    Args:
+        job_id: Job identifier
+
+    Returns:
+        The summary, or None if the job was not profiled
+    """
+    _, summary_path = profile_paths(job_id)
+    try:
+        data = summary_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+    return ProfileSummary.model_validate_json(data)
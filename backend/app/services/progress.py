@@ -0,0 +1,156 @@
+"""Progress reporting of running conversions.
+
+Extractors run in worker processes, so progress travels through small JSON
+files: a ``ProgressReporter`` handed to an extractor rewrites its file at
+most once per ``config.progress_interval_ms``, and the job events endpoint
+reads and sums the files of a job. A conversion split into page ranges uses
+one reporter (one file, or channel) per range.
+
+On the extractor side an update is a clock read and a comparison unless a
+write is due, so reporting stays off the hot path.
+"""
+
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import BinaryIO
+
+from pydantic import BaseModel
+
+from app.core.config import config
+
+
+class ProgressCounts(BaseModel):
+    """Progress of a conversion, summed over its channels.
+
+    Attributes:
+        unit: What ``done`` and ``total`` count ("pages", "blocks" or "bytes")
+        done: Units processed so far
+        total: Units in the document
+        images: Images saved so far
+    """
+
+    unit: str = ""
+    done: int = 0
+    total: int = 0
+    images: int = 0
+
+
+def _progress_dir(job_id: str) -> Path:
+    """Return the directory holding the progress files of a job."""
+    return config.get_project_path(config.progress_dir) / job_id
+
+
+class ProgressReporter:
+    """Throttled progress writer for one extractor (or page range)."""
+
+    def __init__(self, job_id: str, channel: str = "main") -> None:
+        """Initialize the reporter.
+
+        Args:
+            job_id: Job whose progress is reported
+            channel: Name of this reporter's file, unique within the job
+        """
+        self.path = _progress_dir(job_id) / f"{channel}.json"
+        self.interval = config.progress_interval_ms / 1000
+        self.unit = ""
+        self.total = 0
+        self._next_write = 0.0
+
+    def start(self, unit: str, total: int, images: int = 0) -> None:
+        """Announce the amount of work and write the first update.
+
+        Args:
+            unit: What is counted ("pages", "blocks" or "bytes")
+            total: Number of units to process
+            images: Images already saved
+        """
+        self.unit = unit
+        self.total = total
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._write(0, images)
+
+    def update(self, done: int, images: int = 0) -> None:
+        """Report progress, writing it only if the throttle interval elapsed.
+
+        Args:
+            done: Units processed so far
+            images: Images saved so far
+        """
+        if time.monotonic() >= self._next_write:
+            self._write(done, images)
+
+    def finish(self, images: int = 0) -> None:
+        """Report that all units were processed.
+
+        Args:
+            images: Images saved
+        """
+        self._write(self.total, images)
+
+    def _write(self, done: int, images: int) -> None:
+        """Replace the progress file with the given counts."""
+        self._next_write = time.monotonic() + self.interval
+        data = {"unit": self.unit, "done": done, "total": self.total, "images": images}
+        tmp_path = self.path.with_name(f".{uuid.uuid4().hex}.tmp")
+        try:
+            tmp_path.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # Progress is informative only: never fail the conversion
+            tmp_path.unlink(missing_ok=True)
+
+
+class CountingReader:
+    """File wrapper counting the bytes read, for progress reporting."""
+
+    __slots__ = ("position", "raw")
+
+    def __init__(self, raw: BinaryIO) -> None:
+        self.raw = raw
+        self.position = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(size)
+        self.position += len(data)
+        return data
+
+
+def read_progress(job_id: str) -> ProgressCounts | None:
+    """Read the progress of a job.
+
+    Args:
+        job_id: Job identifier
+
+    Returns:
+        Counts summed over the job's channels, or None if nothing was
+        reported (yet, or any more)
+    """
+    counts = None
+    try:
+        paths = list(_progress_dir(job_id).glob("*.json"))
+    except OSError:
+        return None
+    for path in paths:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if counts is None:
+            counts = ProgressCounts(unit=data["unit"])
+        counts.done += data["done"]
+        counts.total += data["total"]
+        counts.images += data["images"]
+    return counts
+
+
+def clear_progress(job_id: str) -> None:
+    """Delete the progress files of a finished job.
+
+    Args:
+        job_id: Job identifier
+    """
+    shutil.rmtree(_progress_dir(job_id), ignore_errors=True)
@@ -0,0 +1,298 @@
+"""Retention of extracted images and MediaWiki outputs.
+
+Nothing else ever deletes ``images_dir/<job_id>/``, the ``.wiki`` files of
+``output_dir`` or the profiles of ``profiles_dir``. The retention manager
+removes them in the background according to two policies, both disabled
+by default:
+
+- age: job image directories, outputs and profiles older than
+  ``retention_max_age_hours`` are removed;
+- quota: while the images (shared store included), outputs and profiles
+  take more than ``retention_max_mb``, the oldest entries are removed first.
+
+A sweep lists the candidates in one pass of the I/O pool and then deletes
+them in batches of ``retention_batch_size``, yielding to the event loop
+between batches, so it never stalls request handling. Job images are
+released with ``release_job_images``, so blobs shared with other jobs are
+kept. The images of conversions still in progress are never removed.
+Cached conversions whose images were removed miss on their next lookup.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Literal
+
+from pydantic import BaseModel
+
+from app.core.config import config
+from app.core.metrics import RETENTION_FREED_BYTES
+from app.models.dto import RetentionStats
+from app.services.executor import run_io
+from app.services.pipeline import active_jobs
+from app.services.storage import IMAGE_STORE_DIR, release_job_images
+
+logger = logging.getLogger(__name__)
+
+# Entries modified more recently are never removed, so outputs and the
+# images of conversions that were just returned survive quota pressure
+MIN_AGE_SECONDS = 600
+
+
+class _Candidate(BaseModel):
+    """Job image directory, output or profile file that a sweep may remove.
+
+    Attributes:
+        kind: "images" for a job image directory, "output" for a .wiki file,
+            "profile" for a .prof profile or its .json summary
+        path: Path of the directory or file
+        mtime: Last modification time
+        size: Bytes freed by removing it (blobs shared with other jobs excluded)
+    """
+
+    kind: Literal["images", "output", "profile"]
+    path: Path
+    mtime: float
+    size: int
+
+
+def _tree_size(path: Path) -> int:
+    """Return the total size of the regular files below a directory."""
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.stat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def scan_storage() -> tuple[list[_Candidate], int]:
+    """List the removable entries and measure the disk space they use.
+
+    Job directories hold hard links into the image store, so the space used
+    by images is the size of the store plus any plain copies, and removing a
+    job frees the blobs no other job links to.
+
+    Returns:
+        Tuple of (candidates oldest first, bytes used by images, outputs
+        and profiles)
+    """
+    candidates = []
+    used = 0
+
+    images_path = config.get_project_path(config.images_dir)
+    if images_path.is_dir():
+        used += _tree_size(images_path / IMAGE_STORE_DIR)
+        for entry in os.scandir(images_path):
+            if entry.name == IMAGE_STORE_DIR or not entry.is_dir():
+                continue
+            size = 0
+            for image in os.scandir(entry.path):
+                try:
+                    stat = image.stat()
+                except OSError:
+                    continue
+                if stat.st_nlink == 1:
+                    used += stat.st_size  # Plain copy, outside the store
+                if stat.st_nlink <= 2:
+                    size += stat.st_size  # Only referenced by this job
+            candidates.append(
+                _Candidate(
+                    kind="images",
+                    path=Path(entry.path),
+                    mtime=entry.stat().st_mtime,
+                    size=size,
+                )
+            )
+
+    for kind, directory, suffixes in (
+        ("output", config.output_dir, (".wiki",)),
+        ("profile", config.profiles_dir, (".prof", ".json")),
+    ):
+        path = config.get_project_path(directory)
+        if not path.is_dir():
+            continue
+        for entry in os.scandir(path):
+            if not entry.name.endswith(suffixes) or not entry.is_file():
+                continue
+            stat = entry.stat()
+            used += stat.st_size
+            candidates.append(
+                _Candidate(
+                    kind=kind,
+                    path=Path(entry.path),
+                    mtime=stat.st_mtime,
+                    size=stat.st_size,
+                )
+            )
+
+    candidates.sort(key=lambda candidate: candidate.mtime)
+    return candidates, used
+
+
+def remove_candidates(candidates: list[_Candidate]) -> tuple[int, int, int]:
+    """Delete a batch of job image directories, output and profile files.
+
+    Args:
+        candidates: Entries to remove
+
+    Returns:
+        Tuple of (image directories removed, outputs and profiles removed,
+        bytes freed)
+    """
+    jobs = outputs = freed = 0
+    for candidate in candidates:
+        if candidate.kind == "images":
+            bytes_freed = release_job_images(candidate.path.name)
+            jobs += 1
+        else:
+            try:
+                candidate.path.unlink()
+            except FileNotFoundError:
+                continue
+            bytes_freed = candidate.size
+            outputs += 1
+        freed += bytes_freed
+        RETENTION_FREED_BYTES.inc(bytes_freed, kind=candidate.kind)
+    return jobs, outputs, freed
+
+
+class RetentionManager:
+    """Background scheduler of retention sweeps."""
+
+    def __init__(
+        self, max_age_hours: int, max_mb: int, interval_seconds: int, batch_size: int
+    ) -> None:
+        """Initialize the manager (the scheduler starts with ``start``).
+
+        Args:
+            max_age_hours: Maximum age of an entry in hours (0 disables)
+            max_mb: Maximum size of images, outputs and profiles in MB
+                (0 disables)
+            interval_seconds: Time between two scheduled sweeps
+            batch_size: Entries deleted per step of a sweep
+        """
+        self._max_age_seconds = max_age_hours * 3600
+        self._max_bytes = max_mb * 1024 * 1024
+        self._interval = interval_seconds
+        self._batch_size = batch_size
+        self._task: asyncio.Task | None = None
+        self._lock: asyncio.Lock | None = None
+        self._stats = RetentionStats(
+            max_age_hours=max_age_hours, max_bytes=self._max_bytes
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether at least one policy is configured."""
+        return bool(self._max_age_seconds or self._max_bytes)
+
+    def start(self) -> None:
+        """Start the periodic sweeps on the running event loop, if enabled."""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._scheduler(), name="retention")
+
+    async def _scheduler(self) -> None:
+        """Sweep every ``interval_seconds`` until cancelled."""
+        while True:
+            try:
+                await self.sweep()
+            except Exception:
+                # Retry on the next run rather than stopping the scheduler
+                logger.exception("Retention sweep failed")
+            await asyncio.sleep(self._interval)
+
+    def _select(self, candidates: list[_Candidate], used: int) -> list[_Candidate]:
+        """Pick the entries a sweep removes.
+
+        Args:
+            candidates: Removable entries, oldest first
+            used: Bytes currently used by images, outputs and profiles
+
+        Returns:
+            Expired entries, then the oldest others until under quota; the
+            image directories of running conversions are skipped
+        """
+        now = time.time()
+        selected = []
+        for candidate in candidates:
+            age = now - candidate.mtime
+            if age < MIN_AGE_SECONDS:
+                break  # Sorted by mtime: every following entry is newer
+            if candidate.kind == "images" and candidate.path.name in active_jobs:
+                continue
+            expired = self._max_age_seconds and age > self._max_age_seconds
+            if expired or (self._max_bytes and used > self._max_bytes):
+                selected.append(candidate)
+                used -= candidate.size
+        return selected
+
+    async def sweep(self) -> RetentionStats:
+        """Run one sweep now (waiting for a running sweep to finish first).
+
+        Blobs shared by several jobs are freed with the last of them, so
+        under quota pressure a sweep may free a little less than needed;
+        the next sweep makes up for it.
+
+        Returns:
+            Statistics including the outcome of this sweep
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            self._stats.running = True
+            start = time.perf_counter()
+            jobs = outputs = freed = 0
+            try:
+                candidates, used = await run_io(scan_storage)
+                selected = self._select(candidates, used)
+                for i in range(0, len(selected), self._batch_size):
+                    batch = selected[i : i + self._batch_size]
+                    removed_jobs, removed_outputs, batch_freed = await run_io(
+                        remove_candidates, batch
+                    )
+                    jobs += removed_jobs
+                    outputs += removed_outputs
+                    freed += batch_freed
+                    await asyncio.sleep(0)
+            finally:
+                self._stats.running = False
+                self._stats.sweeps += 1
+                self._stats.last_sweep_at = time.time()
+                self._stats.last_sweep_seconds = time.perf_counter() - start
+                self._stats.last_jobs_removed = jobs
+                self._stats.last_outputs_removed = outputs
+                self._stats.last_bytes_freed = freed
+                self._stats.jobs_removed += jobs
+                self._stats.outputs_removed += outputs
+                self._stats.bytes_freed += freed
+            self._stats.bytes = max(used - freed, 0)
+            return self.stats()
+
+    def stats(self) -> RetentionStats:
+        """Return the sweep counters and the last measured disk usage.
+
+        Returns:
+            RetentionStats snapshot
+        """
+        return self._stats.model_copy()
+
+    async def shutdown(self) -> None:
+        """Cancel the scheduler (called on application shutdown)."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+# Global retention manager instance
+retention_manager = RetentionManager(
+    max_age_hours=config.retention_max_age_hours,
+    max_mb=config.retention_max_mb,
+    interval_seconds=config.retention_interval_seconds,
+    batch_size=config.retention_batch_size,
+)
@@ -4,13 +4,27 @@ This module handles all file operations including uploads, image saving,
 and output storage with proper sanitization and collision prevention.
 """
 
+import hashlib
+import os
 import re
 import uuid
+from collections.abc import Iterable
 from pathlib import Path
+from typing import BinaryIO
 
 from fastapi import UploadFile
 
 from app.core.config import config
+from app.models.dto import StoredUpload
+
+# Chunk size used when streaming uploads to disk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Content-addressed image store, inside the images directory
+IMAGE_STORE_DIR = "_store"
+
+# Job image reference names: <base>-<sha256>.<ext>
+_REFERENCE_NAME = re.compile(r"^.*-(?P<digest>[0-9a-f]{64})\.(?P<ext>\w+)$")
 
 
 def sanitize_filename(filename: str) -> str:
@@ -39,28 +53,131 @@ def generate_job_id() -> str:
     return str(uuid.uuid4())
 
 
-def save_upload(file: UploadFile) -> Path:
-    """Save uploaded file to upload directory.
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured size limit."""
+
+
+def save_upload(file: UploadFile, max_bytes: int | None = None) -> StoredUpload:
+    """Stream uploaded file to upload directory in fixed-size chunks.
+
+    The SHA-256 of the content is computed in the same pass, and the copy
+    aborts as soon as ``max_bytes`` is exceeded, so memory use stays
+    constant regardless of the upload size.
 
     Args:
         file: FastAPI UploadFile object
+        max_bytes: Optional size limit in bytes
+
+    Returns:
+        StoredUpload with the saved path, size and content hash
+
+    Raises:
+        UploadTooLargeError: If the upload exceeds ``max_bytes``
+    """
+    return save_stream(file.file, file.filename or "upload", max_bytes)
+
+
+def save_stream(
+    source: BinaryIO, original_name: str, max_bytes: int | None = None
+) -> StoredUpload:
+    """Copy a binary stream to the upload directory in fixed-size chunks.
+
+    Args:
+        source: Readable binary stream (upload body, archive member, ...)
+        original_name: Original filename, sanitized for the stored name
+        max_bytes: Optional size limit in bytes
 
     Returns:
-        Absolute path to saved file
+        StoredUpload with the saved path, size and content hash
+
+    Raises:
+        UploadTooLargeError: If the stream exceeds ``max_bytes``
     """
     job_id = generate_job_id()
-    original_name = file.filename or "upload"
     safe_name = sanitize_filename(original_name)
 
     # Add job_id prefix to avoid collisions
     filename = f"{job_id}_{safe_name}"
     upload_path = config.get_absolute_path(config.upload_dir) / filename
 
-    # Save file
-    with upload_path.open("wb") as buffer:
-        buffer.write(file.file.read())
+    digest = hashlib.sha256()
+    size = 0
+
+    # Save file chunk by chunk
+    try:
+        with upload_path.open("wb") as buffer:
+            while chunk := source.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise UploadTooLargeError(
+                        f"Upload exceeds the limit of {max_bytes} bytes"
+                    )
+                digest.update(chunk)
+                buffer.write(chunk)
+    except BaseException:
+        upload_path.unlink(missing_ok=True)
+        raise
+
+    return StoredUpload(path=upload_path, size=size, sha256=digest.hexdigest())
 
-    return upload_path
+
+def _blob_path(digest: str, extension: str) -> Path:
+    """Return the content-addressed store path of an image.
+
+    Blobs are fanned out over two directory levels (e.g. ``ab/cd/abcd....png``)
+    so no single directory grows unbounded.
+
+    Args:
+        digest: SHA-256 hex digest of the image bytes
+        extension: Lowercase file extension
+
+    Returns:
+        Absolute path of the blob
+    """
+    store_path = config.get_project_path(config.images_dir) / IMAGE_STORE_DIR
+    return store_path / digest[:2] / digest[2:4] / f"{digest}.{extension}"
+
+
+def _write_blob(blob_path: Path, image_bytes: bytes) -> None:
+    """Atomically write a blob (concurrent writers produce the same content).
+
+    Args:
+        blob_path: Target blob path
+        image_bytes: Image binary data
+    """
+    blob_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = blob_path.with_name(f"{blob_path.name}.{uuid.uuid4().hex}.tmp")
+    with tmp_path.open("wb") as f:
+        f.write(image_bytes)
+    os.replace(tmp_path, blob_path)
+
+
+def _link_blob(blob_path: Path, file_path: Path, image_bytes: bytes) -> None:
+    """Create a job reference to a blob, storing the blob first if needed.
+
+    References are hard links, so the blob's link count is its reference
+    count. Filesystems without hard links get a plain copy instead.
+
+    Args:
+        blob_path: Content-addressed blob path
+        file_path: Reference path inside the job directory
+        image_bytes: Image binary data (written if the blob is missing)
+    """
+    for _ in range(2):
+        if not blob_path.exists():
+            _write_blob(blob_path, image_bytes)
+        try:
+            os.link(blob_path, file_path)
+            return
+        except FileExistsError:
+            return  # Same content already referenced under this name
+        except FileNotFoundError:
+            continue  # Blob released concurrently, write it again
+        except OSError:
+            break  # No hard link support
+
+    with file_path.open("wb") as f:
+        f.write(image_bytes)
 
 
 def save_image(
@@ -69,7 +186,11 @@ def save_image(
     base_name: str = "img",
     job_id: str | None = None,
 ) -> str:
-    """Save image bytes to images directory.
+    """Save image bytes to the content-addressed image store.
+
+    The bytes are stored once under their SHA-256 and the job directory only
+    receives a reference named after the content hash, so identical images
+    across jobs share disk space and every URL always serves the same bytes.
 
     Args:
         image_bytes: Image binary data
@@ -78,12 +199,13 @@ def save_image(
         job_id: Optional job ID to organize images in subdirectories
 
     Returns:
-        Relative path for frontend access (e.g., '/immagini/job_id/img-uuid.png')
+        Relative path for frontend access (e.g., '/immagini/job_id/img-<sha256>.png')
     """
-    # Generate unique filename with full UUID for guaranteed uniqueness
-    unique_id = str(uuid.uuid4())
+    # Name the file after its content so identical images share one blob
+    digest = hashlib.sha256(image_bytes).hexdigest()
+    ext = extension.lower()
     safe_base = sanitize_filename(base_name)
-    filename = f"{safe_base}-{unique_id}.{extension.lower()}"
+    filename = f"{safe_base}-{digest}.{ext}"
 
     # Save to images directory (in project root)
     images_path = config.get_project_path(config.images_dir)
@@ -98,20 +220,97 @@ def save_image(
         file_path = images_path / filename
         relative_url = f"/immagini/{filename}"
 
-    # Write image to disk
-    with file_path.open("wb") as f:
-        f.write(image_bytes)
+    # Reference the shared blob from the job directory
+    _link_blob(_blob_path(digest, ext), file_path, image_bytes)
 
     # Return relative URL for frontend
     return relative_url
 
 
-def save_output(original_filename: str, wikitext: str) -> Path:
+def image_refcount(image_path: Path) -> int:
+    """Return how many job references share the blob behind an image.
+
+    Args:
+        image_path: Image file inside a job directory
+
+    Returns:
+        Number of references (0 if the image is not a store reference)
+    """
+    match = _REFERENCE_NAME.match(image_path.name)
+    if not match:
+        return 0
+    blob_path = _blob_path(match.group("digest"), match.group("ext"))
+    try:
+        return blob_path.stat().st_nlink - 1
+    except FileNotFoundError:
+        return 0
+
+
+def release_job_images(job_id: str) -> int:
+    """Delete a job's image references and every blob no other job uses.
+
+    Args:
+        job_id: Job whose images should be removed
+
+    Returns:
+        Number of bytes freed on disk
+    """
+    job_images_path = config.get_project_path(config.images_dir) / job_id
+    if not job_images_path.is_dir():
+        return 0
+
+    freed = 0
+    for image_path in job_images_path.iterdir():
+        match = _REFERENCE_NAME.match(image_path.name)
+        try:
+            size = image_path.stat().st_size
+            image_path.unlink()
+        except FileNotFoundError:
+            continue
+        if not match:
+            freed += size
+            continue
+
+        blob_path = _blob_path(match.group("digest"), match.group("ext"))
+        try:
+            if blob_path.stat().st_nlink <= 1:
+                # Last reference gone: drop the blob
+                blob_path.unlink()
+                freed += size
+        except FileNotFoundError:
+            freed += size  # Copied reference, no shared blob
+
+    try:
+        job_images_path.rmdir()
+    except OSError:
+        pass
+    return freed
+
+
+def image_url_to_path(image_url: str) -> Path:
+    """Resolve an image URL returned by ``save_image`` to its file on disk.
+
+    Args:
+        image_url: Relative URL such as '/immagini/job_id/img-uuid.png'
+
+    Returns:
+        Absolute path of the image file
+    """
+    relative = image_url.removeprefix("/immagini/")
+    return config.get_project_path(config.images_dir) / relative
+
+
+def save_output(original_filename: str, wikitext: str | Iterable[str]) -> Path:
     """Save converted MediaWiki text to output directory.
 
+    The text may be given as an iterable of lines, which are written as they
+    are produced instead of being joined in memory first. The file is
+    written under a temporary name and moved into place once complete, so
+    readers never see a partial output.
+
     Args:
         original_filename: Original filename (e.g., 'pippo.pdf')
-        wikitext: MediaWiki formatted text
+        wikitext: MediaWiki formatted text, or its lines without newlines
 
     Returns:
         Absolute path to saved output file
@@ -124,9 +323,23 @@ def save_output(original_filename: str, wikitext: str) -> Path:
     # Save to output directory (in project root)
     output_path = config.get_project_path(config.output_dir)
     file_path = output_path / filename
+    tmp_path = file_path.with_name(f"{filename}.{uuid.uuid4().hex}.tmp")
 
-    with file_path.open("w", encoding="utf-8") as f:
-        f.write(wikitext)
+    try:
+        with tmp_path.open("w", encoding="utf-8") as f:
+            if isinstance(wikitext, str):
+                f.write(wikitext)
+            else:
+                first = True
+                for line in wikitext:
+                    if not first:
+                        f.write("\n")
+                    f.write(line)
+                    first = False
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
     return file_path
 
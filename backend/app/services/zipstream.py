@@ -0,0 +1,87 @@
+"""Streaming ZIP archive writer.
+
+``zipfile`` can write to a non-seekable stream (entry sizes then follow the
+data in a descriptor), so an archive can be sent while it is being built:
+each entry is read in chunks, and the compressed bytes are handed out as
+soon as enough of them have accumulated. Memory use is bounded by the chunk
+size, whatever the total size of the archive.
+"""
+
+import zipfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+# Size of the file reads and of the chunks handed to the client
+ZIP_CHUNK_SIZE = 256 * 1024
+
+# Formats that are already compressed: stored as-is instead of re-deflated
+STORED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".zip", ".gz"}
+
+
+class _ChunkSink:
+    """Write-only, non-seekable file object collecting the archive bytes."""
+
+    def __init__(self) -> None:
+        """Initialize an empty sink."""
+        self._chunks: list[bytes] = []
+        self.pending = 0
+
+    def write(self, data: bytes) -> int:
+        """Buffer bytes written by ``zipfile``.
+
+        Args:
+            data: Archive bytes
+
+        Returns:
+            Number of bytes written
+        """
+        self._chunks.append(bytes(data))
+        self.pending += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        """No-op: bytes are handed out by ``drain``."""
+
+    def drain(self) -> bytes:
+        """Return and clear the buffered bytes.
+
+        Returns:
+            Bytes written since the last drain
+        """
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        self.pending = 0
+        return data
+
+
+def iter_zip(files: Iterable[Path]) -> Iterator[bytes]:
+    """Build a ZIP archive of the given files, yielding it chunk by chunk.
+
+    Files are stored under their name, without directories. Already
+    compressed formats (see ``STORED_EXTENSIONS``) are stored, everything
+    else is deflated.
+
+    Args:
+        files: Files to archive
+
+    Yields:
+        Consecutive chunks of the archive
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode="w") as archive:
+        for path in files:
+            info = zipfile.ZipInfo.from_file(path, arcname=path.name)
+            if path.suffix.lower() in STORED_EXTENSIONS:
+                info.compress_type = zipfile.ZIP_STORED
+            else:
+                info.compress_type = zipfile.ZIP_DEFLATED
+
+            with path.open("rb") as source, archive.open(info, "w") as entry:
+                while chunk := source.read(ZIP_CHUNK_SIZE):
+                    entry.write(chunk)
+                    if sink.pending >= ZIP_CHUNK_SIZE:
+                        yield sink.drain()
+
+    # Central directory, written when the archive is closed
+    if sink.pending:
+        yield sink.drain()
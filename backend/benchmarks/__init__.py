@@ -0,0 +1,4 @@
+"""Performance benchmarks for the conversion backend.
+
+Run from the backend directory, e.g. ``uv run python -m benchmarks.bench_pdf_layout``.
+"""
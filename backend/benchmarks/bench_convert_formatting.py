@@ -0,0 +1,88 @@
+"""Benchmark: scaling of inline formatting rendering.
+
+Times ``_convert_formatting`` on paragraphs of growing size (up to 100 KB,
+the size of table-heavy DOCX exports) and reports the time per KB. For a
+linear renderer the time per KB stays flat as the paragraph doubles.
+
+Usage:
+    uv run python -m benchmarks.bench_convert_formatting [--max-kb 100]
+"""
+
+import argparse
+import timeit
+
+from app.models.blocks import Inline, InlineImage, Run
+from app.services.convert_wikitext import _convert_formatting
+
+# Representative run mix: plain text, formatted runs and inline images
+_RUNS: list[Inline] = [
+    Run("Plain text describing the part number and its tolerances. "),
+    Run("Warning: ", bold=True),
+    Run("see appendix B ", italic=True),
+    Run("Important ", bold=True, italic=True),
+    InlineImage("/immagini/job/docx_image1-0123456789abcdef.png"),
+    Run("More plain text, with punctuation: colons, commas; and quotes. "),
+]
+
+
+def build_paragraph(size_bytes: int, formatted: bool = True) -> list[Inline]:
+    """Build the inlines of a paragraph of roughly ``size_bytes`` characters.
+
+    Args:
+        size_bytes: Target paragraph length
+        formatted: Whether to include formatted runs and images
+
+    Returns:
+        Paragraph inlines
+    """
+    runs = _RUNS if formatted else [_RUNS[0]]
+    parts = []
+    length = 0
+    index = 0
+    while length < size_bytes:
+        run = runs[index % len(runs)]
+        parts.append(run)
+        length += len(run.text) if isinstance(run, Run) else len(run.url)
+        index += 1
+    return parts
+
+
+def time_per_call(inlines: list[Inline], repeat: int) -> float:
+    """Return the best time of one ``_convert_formatting`` call in seconds."""
+    return min(
+        timeit.repeat(lambda: _convert_formatting(inlines), number=1, repeat=repeat)
+    )
+
+
+def main() -> None:
+    """Run the benchmark and print a scaling table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-kb", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sizes_kb = []
+    size = args.max_kb
+    while size >= 12:
+        sizes_kb.insert(0, size)
+        size //= 2
+
+    for formatted in (True, False):
+        label = "formatted runs" if formatted else "plain text"
+        print(f"{label}:")
+        print(f"  {'size':>8}  {'time':>10}  {'per KB':>10}")
+        per_kb = []
+        for size_kb in sizes_kb:
+            inlines = build_paragraph(size_kb * 1024, formatted)
+            elapsed = time_per_call(inlines, args.repeat)
+            per_kb.append(elapsed / size_kb)
+            print(
+                f"  {size_kb:>6}KB  {elapsed * 1000:>8.2f}ms  {per_kb[-1] * 1e6:>8.1f}us"
+            )
+        print(
+            f"  per-KB ratio largest/smallest: {per_kb[-1] / per_kb[0]:.2f} (1.0 = linear)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark: application import time against a budget.
+
+Imports ``app.main`` in fresh interpreters and checks that the cold import
+stays under a time budget and does not load any document library: PyMuPDF,
+python-docx, lxml and striprtf are imported by the extractors on first use
+(or by the ``preload_extractors`` warm-up), never at start-up. The cost of
+that deferred import is reported too.
+
+Exits with status 1 if the budget is exceeded or a document library is
+imported eagerly, so it can run as a check.
+
+Usage:
+    uv run python -m benchmarks.bench_import_time [--budget-ms 1000] [--repeat 5]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# Top-level modules that must not be loaded by importing the application
+HEAVY_MODULES = ["fitz", "pymupdf", "docx", "striprtf", "lxml"]
+
+# Runs in the child interpreter; prints the measurements as JSON
+_CHILD_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+import_s = time.perf_counter() - start
+loaded = [name for name in {heavy!r} if name in sys.modules]
+from app.services.pipeline import load_extractors
+start = time.perf_counter()
+load_extractors()
+extractors_s = time.perf_counter() - start
+print(json.dumps({{"import_s": import_s, "extractors_s": extractors_s, "loaded": loaded}}))
+"""
+
+
+def measure_once() -> dict:
+    """Import the application in a fresh interpreter.
+
+    Returns:
+        Dict with the import time, the extractor import time and the heavy
+        modules loaded by the application import
+    """
+    backend_dir = Path(__file__).resolve().parent.parent
+    completed = subprocess.run(
+        [sys.executable, "-c", _CHILD_SCRIPT.format(heavy=HEAVY_MODULES)],
+        cwd=backend_dir,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    """Run the benchmark, print the results and enforce the budget."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    runs = [measure_once() for _ in range(args.repeat)]
+    import_ms = statistics.median(run["import_s"] for run in runs) * 1000
+    extractors_ms = statistics.median(run["extractors_s"] for run in runs) * 1000
+    loaded = sorted({name for run in runs for name in run["loaded"]})
+
+    print(f"import app.main:       {import_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"deferred extractors:   {extractors_ms:.0f} ms")
+    print(f"eager heavy modules:   {', '.join(loaded) or 'none'}")
+
+    failed = False
+    if import_ms > args.budget_ms:
+        print("FAIL: import time over budget")
+        failed = True
+    if loaded:
+        print("FAIL: document libraries imported at start-up")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark: single-pass PDF layout analysis.
+
+Builds a synthetic PDF (500 pages by default) and compares the cost of
+``extract_pdf``, which parses each page layout once, with the cost of the
+previous two-pass approach, which ran ``page.get_text("dict")`` on every
+page once more just to collect font sizes.
+
+Usage:
+    uv run python -m benchmarks.bench_pdf_layout [--pages 500] [--repeat 3]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+from app.core.config import config
+from app.services.extract_pdf import extract_pdf
+
+
+def build_pdf(path: Path, pages: int) -> None:
+    """Write a synthetic text-heavy PDF with headings on every page.
+
+    Args:
+        path: Output file path
+        pages: Number of pages
+    """
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 100), f"Chapter {page_num}", fontsize=20)
+        page.insert_text((72, 130), f"Section {page_num}.1", fontsize=14)
+        y = 160
+        while y < 740:
+            page.insert_text(
+                (72, y),
+                "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do",
+                fontsize=11,
+            )
+            y += 14
+    doc.save(str(path))
+    doc.close()
+
+
+def time_extract(path: Path, repeat: int) -> float:
+    """Return the median wall time of ``extract_pdf`` in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract_pdf(path)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def time_extra_pass(path: Path, repeat: int) -> float:
+    """Return the median wall time of the removed font-size pass in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        doc = fitz.open(str(path))
+        for page in doc:
+            page.get_text("dict")
+        doc.close()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Keep benchmark images/output out of the project directories
+        config.project_root = Path(tmp)
+        pdf_path = Path(tmp) / "bench.pdf"
+        build_pdf(pdf_path, args.pages)
+
+        single_pass = time_extract(pdf_path, args.repeat)
+        extra_pass = time_extra_pass(pdf_path, args.repeat)
+
+    two_pass = single_pass + extra_pass
+    print(f"pages:                 {args.pages}")
+    print(f"single-pass extract:   {single_pass:.3f}s")
+    print(f"two-pass (previous):   {two_pass:.3f}s")
+    print(f"speedup:               {two_pass / single_pass:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""Benchmark: per-stage timings with stored baselines.
+
+Generates the synthetic corpus (see ``benchmarks.corpus``) and times each
+conversion stage on its own: ``save_upload``, every ``extract_*``,
+``_merge_consecutive_headings``, ``to_wikitext`` for every format,
+``save_image`` and ``save_output``. Results are written as JSON, together
+with the library versions they were measured with, so a run after a
+dependency upgrade can be compared against a saved baseline.
+
+Usage:
+    uv run python -m benchmarks.bench_stages run [--output results.json]
+        [--repeat 5] [--pages 20] [--images 10] [--table-density 0.2]
+    uv run python -m benchmarks.bench_stages compare BASELINE CURRENT
+        [--threshold 0.15]
+"""
+
+import argparse
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime
+from importlib import metadata
+from pathlib import Path
+
+from fastapi import UploadFile
+
+from app.core.config import config
+from app.models.blocks import Block, Heading, PageBreak, Paragraph, Run, Spacer
+from app.services.convert_wikitext import to_wikitext
+from app.services.extract_docx import extract_docx
+from app.services.extract_odt import extract_odt
+from app.services.extract_pdf import _merge_consecutive_headings, extract_pdf
+from app.services.extract_rtf import extract_rtf
+from app.services.storage import save_image, save_output, save_upload
+from benchmarks.corpus import (
+    CorpusSpec,
+    add_spec_arguments,
+    build_corpus,
+    make_png,
+    spec_from_arguments,
+)
+
+# Libraries whose upgrades the baselines should expose
+TRACKED_PACKAGES = ["pymupdf", "python-docx", "lxml", "striprtf", "pydantic"]
+
+# Extractor for each corpus format
+EXTRACTORS = {
+    "pdf": extract_pdf,
+    "docx": extract_docx,
+    "odt": extract_odt,
+    "rtf": extract_rtf,
+}
+
+
+def time_stage(stage: Callable[[], object], repeat: int) -> dict:
+    """Time a stage several times.
+
+    Args:
+        stage: Callable running the stage once
+        repeat: Number of timed runs
+
+    Returns:
+        Dict with the median and minimum wall time in seconds and all runs
+    """
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stage()
+        runs.append(time.perf_counter() - start)
+    return {"median_s": statistics.median(runs), "min_s": min(runs), "runs": runs}
+
+
+def _heading_blocks(spec: CorpusSpec) -> list[Block]:
+    """Return PDF-like blocks with every heading split over two lines."""
+    blocks: list[Block] = []
+    for page_num in range(spec.pages):
+        blocks.append(PageBreak(page_num))
+        blocks.append(Spacer())
+        blocks.append(Heading(1, f"Chapter {page_num} of the"))
+        blocks.append(Spacer())
+        blocks.append(Heading(1, "synthetic benchmark corpus"))
+        blocks.extend(
+            Paragraph([Run(f"Paragraph {number}")])
+            for number in range(spec.paragraphs_per_page)
+        )
+        blocks.append(Spacer())
+    return blocks
+
+
+def _save_images(images: list[bytes]) -> None:
+    """Save images under a new job, so every image is linked again."""
+    job_id = uuid.uuid4().hex
+    for image in images:
+        save_image(image, "png", job_id=job_id)
+
+
+def _package_versions() -> dict[str, str]:
+    """Return the installed versions of ``TRACKED_PACKAGES``."""
+    versions = {}
+    for package in TRACKED_PACKAGES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = "not installed"
+    return versions
+
+
+def run_benchmarks(spec: CorpusSpec, repeat: int) -> dict:
+    """Time every stage on a freshly generated corpus.
+
+    Args:
+        spec: Corpus shape
+        repeat: Number of timed runs per stage
+
+    Returns:
+        Results with ``meta`` (environment, corpus shape) and ``stages``
+    """
+    stages: dict[str, dict] = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Keep benchmark uploads/images/output out of the project directories
+        config.base_dir = Path(tmp)
+        config.project_root = Path(tmp)
+        config.ensure_directories()
+        corpus = build_corpus(Path(tmp) / "corpus", spec)
+
+        for ext, path in corpus.items():
+            data = path.read_bytes()
+            stages[f"save_upload[{ext}]"] = time_stage(
+                lambda data=data, ext=ext: save_upload(
+                    UploadFile(file=io.BytesIO(data), filename=f"corpus.{ext}")
+                ),
+                repeat,
+            )
+
+        extracted = {}
+        for ext, path in corpus.items():
+            extractor = EXTRACTORS[ext]
+            stages[f"extract_{ext}"] = time_stage(
+                lambda extractor=extractor, path=path: extractor(path), repeat
+            )
+            extracted[ext] = extractor(path)
+
+        heading_blocks = _heading_blocks(spec)
+        stages["_merge_consecutive_headings"] = time_stage(
+            lambda: list(_merge_consecutive_headings(heading_blocks)), repeat
+        )
+
+        wikitexts = {}
+        for ext, data in extracted.items():
+            stages[f"to_wikitext[{ext}]"] = time_stage(
+                lambda data=data: to_wikitext(data), repeat
+            )
+            wikitexts[ext] = to_wikitext(data)[0]
+
+        images = [make_png(index) for index in range(max(spec.images, 1))]
+        stages["save_image"] = time_stage(lambda: _save_images(images), repeat)
+
+        largest = max(wikitexts.values(), key=len)
+        stages["save_output"] = time_stage(
+            lambda: save_output("corpus.pdf", largest), repeat
+        )
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "packages": _package_versions(),
+            "repeat": repeat,
+            "corpus": spec.model_dump(),
+        },
+        "stages": stages,
+    }
+
+
+def compare_results(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """Print a stage-by-stage comparison of two result files.
+
+    Stages are compared on their median time; a stage slower than the
+    baseline by more than ``threshold`` (a fraction) is a regression.
+
+    Args:
+        baseline: Results of the reference run
+        current: Results of the run being checked
+        threshold: Tolerated relative slowdown
+
+    Returns:
+        Names of the regressed stages
+    """
+    if baseline["meta"]["corpus"] != current["meta"]["corpus"]:
+        print("warning: the runs used different corpus settings")
+    for package, version in current["meta"]["packages"].items():
+        previous = baseline["meta"]["packages"].get(package)
+        if previous != version:
+            print(f"note: {package} {previous} -> {version}")
+
+    regressions = []
+    print(f"{'stage':<32} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name, result in current["stages"].items():
+        reference = baseline["stages"].get(name)
+        if reference is None:
+            print(f"{name:<32} {'-':>10} {result['median_s']:>9.4f}s {'new':>7}")
+            continue
+        ratio = result["median_s"] / max(reference["median_s"], 1e-9)
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(
+            f"{name:<32} {reference['median_s']:>9.4f}s "
+            f"{result['median_s']:>9.4f}s {ratio:>6.2f}x{flag}"
+        )
+    return regressions
+
+
+def main() -> None:
+    """Run the benchmarks or compare two result files."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="time every stage")
+    run_parser.add_argument("--output", type=Path, default=Path("bench_stages.json"))
+    run_parser.add_argument("--repeat", type=int, default=5)
+    add_spec_arguments(run_parser)
+
+    compare_parser = commands.add_parser("compare", help="compare against a baseline")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.15)
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = run_benchmarks(spec_from_arguments(args), args.repeat)
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        for name, result in results["stages"].items():
+            print(f"{name:<32} {result['median_s']:>9.4f}s")
+        print(f"results written to {args.output}")
+        return
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    current = json.loads(args.current.read_text(encoding="utf-8"))
+    regressions = compare_results(baseline, current, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} stage(s) regressed: {', '.join(regressions)}")
+        sys.exit(1)
+    print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
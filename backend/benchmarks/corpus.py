@@ -0,0 +1,376 @@
+"""Synthetic document corpus for the benchmarks.
+
+Generates PDF, DOCX, ODT and RTF files with the same logical content: a
+number of pages (sections for the flow formats), headings split across two
+lines, formatted paragraphs, bullet lists, embedded images and tables. The
+generator is deterministic, so two runs with the same ``CorpusSpec`` time
+the same documents.
+
+Usage:
+    uv run python -m benchmarks.corpus OUTPUT_DIR [--pages 20] [--images 10]
+        [--table-density 0.2]
+"""
+
+import argparse
+import io
+import random
+import zipfile
+from pathlib import Path
+
+import docx
+import fitz  # PyMuPDF
+from docx.shared import Inches
+from pydantic import BaseModel, Field
+
+# Vocabulary of the generated text
+_TEXT = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua ut enim ad minim "
+    "veniam quis nostrud exercitation ullamco laboris nisi aliquip"
+)
+_WORDS = _TEXT.split()
+
+ODT_MEDIA_TYPE = "application/vnd.oasis.opendocument.text"
+
+# Namespaces declared on the root of the generated ODT parts
+_ODT_NAMESPACES = (
+    " ".join(
+        f'xmlns:{prefix}="urn:oasis:names:tc:opendocument:xmlns:{name}:1.0"'
+        for prefix, name in [
+            ("office", "office"),
+            ("style", "style"),
+            ("text", "text"),
+            ("table", "table"),
+            ("draw", "drawing"),
+            ("fo", "xsl-fo-compatible"),
+            ("svg", "svg-compatible"),
+        ]
+    )
+    + ' xmlns:xlink="http://www.w3.org/1999/xlink"'
+)
+
+
+class CorpusSpec(BaseModel):
+    """Shape of the generated documents.
+
+    Attributes:
+        pages: Number of pages (PDF) or sections (DOCX, ODT, RTF)
+        paragraphs_per_page: Body paragraphs per page or section
+        images: Number of distinct embedded images
+        table_density: Fraction of pages or sections carrying a table
+        table_rows: Rows per table
+        seed: Random seed for the generated text
+    """
+
+    pages: int = Field(default=20, ge=1)
+    paragraphs_per_page: int = Field(default=30, ge=1)
+    images: int = Field(default=10, ge=0)
+    table_density: float = Field(default=0.2, ge=0, le=1)
+    table_rows: int = Field(default=8, ge=1)
+    seed: int = Field(default=42)
+
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+    """Return a pseudo-random sentence."""
+    text = " ".join(rng.choice(_WORDS) for _ in range(words))
+    return text.capitalize() + "."
+
+
+def make_png(index: int, size: int = 64) -> bytes:
+    """Return a distinct PNG image for ``index``."""
+    pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, size, size), False)
+    pixmap.set_rect(
+        pixmap.irect, ((index * 53) % 256, (index * 97) % 256, (index * 31) % 256)
+    )
+    pixmap.set_pixel(index % size, (index // size) % size, (0, 0, 0))
+    return pixmap.tobytes("png")
+
+
+def _has_table(spec: CorpusSpec, page: int) -> bool:
+    """Return whether the given page or section carries a table."""
+    return spec.table_density > 0 and (
+        int((page + 1) * spec.table_density) > int(page * spec.table_density)
+    )
+
+
+def _image_pages(spec: CorpusSpec) -> dict[int, list[int]]:
+    """Spread the images evenly over the pages.
+
+    Returns:
+        Mapping of page index to the image indexes placed on it
+    """
+    placement: dict[int, list[int]] = {}
+    for index in range(spec.images):
+        placement.setdefault(index * spec.pages // spec.images, []).append(index)
+    return placement
+
+
+def build_pdf(path: Path, spec: CorpusSpec) -> None:
+    """Write a synthetic PDF.
+
+    Args:
+        path: Output file path
+        spec: Corpus shape
+    """
+    rng = random.Random(spec.seed)
+    images = _image_pages(spec)
+    doc = fitz.open()
+    for page_num in range(spec.pages):
+        page = doc.new_page()
+        page.insert_text((72, 90), f"Chapter {page_num} of the", fontsize=20)
+        page.insert_text((72, 115), "synthetic benchmark corpus", fontsize=20)
+        y = 145.0
+        for index in images.get(page_num, []):
+            page.insert_image(fitz.Rect(72, y, 136, y + 64), stream=make_png(index))
+            y += 72
+        if _has_table(spec, page_num):
+            for row in range(spec.table_rows):
+                for col in range(4):
+                    page.insert_text(
+                        (72 + col * 120, y),
+                        f"R{row}C{col} {rng.choice(_WORDS)}",
+                        fontsize=10,
+                    )
+                y += 13
+            y += 8
+        for _ in range(spec.paragraphs_per_page):
+            if y > 740:
+                break
+            page.insert_text((72, y), _sentence(rng, 10), fontsize=11)
+            y += 14
+    doc.save(str(path))
+    doc.close()
+
+
+def build_docx(path: Path, spec: CorpusSpec) -> None:
+    """Write a synthetic DOCX.
+
+    Args:
+        path: Output file path
+        spec: Corpus shape
+    """
+    rng = random.Random(spec.seed)
+    images = _image_pages(spec)
+    document = docx.Document()
+    for section in range(spec.pages):
+        document.add_heading(f"Chapter {section}", level=1)
+        for index in images.get(section, []):
+            document.add_picture(io.BytesIO(make_png(index)), width=Inches(0.5))
+        for number in range(spec.paragraphs_per_page):
+            if number % 10 == 9:
+                document.add_paragraph(_sentence(rng, 6), style="List Bullet")
+                continue
+            paragraph = document.add_paragraph(_sentence(rng) + " ")
+            paragraph.add_run(_sentence(rng, 3)).bold = True
+            paragraph.add_run(" " + _sentence(rng, 3)).italic = True
+        if _has_table(spec, section):
+            doc_table = document.add_table(rows=spec.table_rows, cols=4)
+            for row_index, row in enumerate(doc_table.rows):
+                for col_index, cell in enumerate(row.cells):
+                    cell.text = f"R{row_index}C{col_index} {rng.choice(_WORDS)}"
+    document.save(str(path))
+
+
+def build_odt(path: Path, spec: CorpusSpec) -> None:
+    """Write a synthetic ODT.
+
+    The package is written directly: ``content.xml`` with the body and an
+    automatic bold style, ``styles.xml`` with the heading style, the
+    pictures and the manifest.
+
+    Args:
+        path: Output file path
+        spec: Corpus shape
+    """
+    rng = random.Random(spec.seed)
+    images = _image_pages(spec)
+    pictures: dict[str, bytes] = {}
+    body: list[str] = []
+
+    for section in range(spec.pages):
+        body.append(
+            f'<text:p text:style-name="Heading_20_1">Chapter {section}</text:p>'
+        )
+        for index in images.get(section, []):
+            name = f"Pictures/img{index}.png"
+            pictures[name] = make_png(index)
+            body.append(
+                '<text:p><draw:frame svg:width="1cm" svg:height="1cm" '
+                f'text:anchor-type="as-char"><draw:image xlink:href="{name}"/>'
+                "</draw:frame></text:p>"
+            )
+        bullets = []
+        for number in range(spec.paragraphs_per_page):
+            if number % 10 == 9:
+                bullets.append(
+                    f"<text:list-item><text:p>{_sentence(rng, 6)}</text:p>"
+                    "</text:list-item>"
+                )
+                continue
+            body.append(
+                f"<text:p>{_sentence(rng)} "
+                f'<text:span text:style-name="Bold">{_sentence(rng, 3)}</text:span>'
+                "</text:p>"
+            )
+        body.append(f"<text:list>{''.join(bullets)}</text:list>")
+        if _has_table(spec, section):
+            rows = []
+            for row_index in range(spec.table_rows):
+                cells = "".join(
+                    '<table:table-cell office:value-type="string"><text:p>'
+                    f"R{row_index}C{col_index} {rng.choice(_WORDS)}"
+                    "</text:p></table:table-cell>"
+                    for col_index in range(4)
+                )
+                rows.append(f"<table:table-row>{cells}</table:table-row>")
+            body.append(
+                '<table:table><table:table-column table:number-columns-repeated="4"/>'
+                f"{''.join(rows)}</table:table>"
+            )
+
+    content = (
+        f'<?xml version="1.0" encoding="UTF-8"?>'
+        f'<office:document-content {_ODT_NAMESPACES} office:version="1.2">'
+        "<office:automatic-styles>"
+        '<style:style style:name="Bold" style:family="text">'
+        '<style:text-properties fo:font-weight="bold"/></style:style>'
+        "</office:automatic-styles>"
+        f"<office:body><office:text>{''.join(body)}</office:text></office:body>"
+        "</office:document-content>"
+    )
+    styles = (
+        f'<?xml version="1.0" encoding="UTF-8"?>'
+        f'<office:document-styles {_ODT_NAMESPACES} office:version="1.2">'
+        '<office:styles><style:style style:name="Heading_20_1" '
+        'style:display-name="Heading 1" style:family="paragraph" '
+        'style:default-outline-level="1"/></office:styles>'
+        "</office:document-styles>"
+    )
+    entries = "".join(
+        f'<manifest:file-entry manifest:full-path="{name}" '
+        f'manifest:media-type="{media_type}"/>'
+        for name, media_type in [
+            ("/", ODT_MEDIA_TYPE),
+            ("content.xml", "text/xml"),
+            ("styles.xml", "text/xml"),
+            *((name, "image/png") for name in pictures),
+        ]
+    )
+    manifest = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<manifest:manifest xmlns:manifest="'
+        'urn:oasis:names:tc:opendocument:xmlns:manifest:1.0" manifest:version="1.2">'
+        f"{entries}</manifest:manifest>"
+    )
+
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as odt_zip:
+        # The mimetype comes first and uncompressed, as the format requires
+        odt_zip.writestr("mimetype", ODT_MEDIA_TYPE, compress_type=zipfile.ZIP_STORED)
+        odt_zip.writestr("content.xml", content)
+        odt_zip.writestr("styles.xml", styles)
+        for name, data in pictures.items():
+            odt_zip.writestr(name, data, compress_type=zipfile.ZIP_STORED)
+        odt_zip.writestr("META-INF/manifest.xml", manifest)
+
+
+def build_rtf(path: Path, spec: CorpusSpec) -> None:
+    """Write a synthetic RTF.
+
+    Args:
+        path: Output file path
+        spec: Corpus shape
+    """
+    rng = random.Random(spec.seed)
+    images = _image_pages(spec)
+    parts = [r"{\rtf1\ansi\deff0{\fonttbl{\f0 Times New Roman;}}"]
+    parts.append(r"{\info{\title Benchmark corpus}{\author benchmarks}}")
+    for section in range(spec.pages):
+        parts.append(rf"\pard\b CHAPTER {section}\b0\par")
+        for index in images.get(section, []):
+            parts.append(
+                r"{\pict\pngblip\picw64\pich64 " + make_png(index).hex() + "}\\par"
+            )
+        for number in range(spec.paragraphs_per_page):
+            if number % 10 == 9:
+                parts.append(rf"- {_sentence(rng, 6)}\par")
+                continue
+            parts.append(rf"{_sentence(rng)} {{\b {_sentence(rng, 3)}}}\par")
+        if _has_table(spec, section):
+            for row_index in range(spec.table_rows):
+                cells = "".join(
+                    rf"\pard\intbl R{row_index}C{col} {rng.choice(_WORDS)}\cell"
+                    for col in range(4)
+                )
+                parts.append(
+                    r"\trowd\cellx2000\cellx4000\cellx6000\cellx8000" + cells + r"\row"
+                )
+    parts.append("}")
+    path.write_text("\n".join(parts), encoding="ascii")
+
+
+# Corpus builder for each supported file extension
+BUILDERS = {
+    "pdf": build_pdf,
+    "docx": build_docx,
+    "odt": build_odt,
+    "rtf": build_rtf,
+}
+
+
+def build_corpus(directory: Path, spec: CorpusSpec) -> dict[str, Path]:
+    """Write one document per format.
+
+    Args:
+        directory: Output directory (created if missing)
+        spec: Corpus shape
+
+    Returns:
+        Mapping of file extension to generated file
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for ext, builder in BUILDERS.items():
+        path = directory / f"corpus.{ext}"
+        builder(path, spec)
+        paths[ext] = path
+    return paths
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the ``CorpusSpec`` options to a command line parser."""
+    defaults = CorpusSpec()
+    parser.add_argument("--pages", type=int, default=defaults.pages)
+    parser.add_argument(
+        "--paragraphs-per-page", type=int, default=defaults.paragraphs_per_page
+    )
+    parser.add_argument("--images", type=int, default=defaults.images)
+    parser.add_argument("--table-density", type=float, default=defaults.table_density)
+    parser.add_argument("--table-rows", type=int, default=defaults.table_rows)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def spec_from_arguments(args: argparse.Namespace) -> CorpusSpec:
+    """Build a ``CorpusSpec`` from parsed ``add_spec_arguments`` options."""
+    return CorpusSpec(
+        pages=args.pages,
+        paragraphs_per_page=args.paragraphs_per_page,
+        images=args.images,
+        table_density=args.table_density,
+        table_rows=args.table_rows,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    """Write the corpus to a directory."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output_dir", type=Path)
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+
+    for ext, path in build_corpus(args.output_dir, spec_from_arguments(args)).items():
+        print(f"{ext:>5}: {path} ({path.stat().st_size / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
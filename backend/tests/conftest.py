@@ -0,0 +1,26 @@
+"""Shared test fixtures."""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import config
+from app.main import app
+
+
+@pytest.fixture
+def project_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Run conversions inline, uncached, with outputs under a temporary root."""
+    monkeypatch.setattr(config, "project_root", tmp_path)
+    monkeypatch.setattr(config, "execution_mode", "sync")
+    monkeypatch.setattr(config, "cache_enabled", False)
+    return tmp_path
+
+
+@pytest.fixture
+def client(project_root: Path) -> Iterator[TestClient]:
+    """Test client of the application, with its lifespan running."""
+    with TestClient(app) as test_client:
+        yield test_client
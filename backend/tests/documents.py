@@ -0,0 +1,92 @@
+"""Builders of small test documents."""
+
+import io
+import zipfile
+
+import docx
+import fitz  # PyMuPDF
+
+_ODT_NAMESPACES = (
+    'xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+    'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" '
+    'xmlns:draw="urn:oasis:names:tc:opendocument:xmlns:drawing:1.0" '
+    'xmlns:xlink="http://www.w3.org/1999/xlink"'
+)
+
+
+def make_png(index: int, size: int = 64) -> bytes:
+    """Return a distinct PNG image for ``index``."""
+    pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, size, size), False)
+    pixmap.set_rect(
+        pixmap.irect, ((index * 53) % 256, (index * 97) % 256, (index * 31) % 256)
+    )
+    pixmap.set_pixel(index % size, (index // size) % size, (0, 0, 0))
+    return pixmap.tobytes("png")
+
+
+def make_pdf(pages: int, image: bytes | None = None) -> bytes:
+    """Build a PDF with one line of text per page.
+
+    Args:
+        pages: Number of pages
+        image: Optional PNG placed on every page, stored once (one xref)
+
+    Returns:
+        PDF file content
+    """
+    doc = fitz.open()
+    xref = 0
+    for page_num in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 90), f"Text of page {page_num + 1}", fontsize=11)
+        if image is not None:
+            rect = fitz.Rect(72, 120, 136, 184)
+            if xref:
+                page.insert_image(rect, xref=xref)
+            else:
+                xref = page.insert_image(rect, stream=image)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def make_odt(paragraphs: list[str], parts: dict[str, bytes] | None = None) -> bytes:
+    """Build an ODT whose body is the given paragraphs.
+
+    Args:
+        paragraphs: Inner XML of each ``text:p``
+        parts: Extra package parts, such as pictures, by name
+
+    Returns:
+        ODT file content
+    """
+    body = "".join(f"<text:p>{paragraph}</text:p>" for paragraph in paragraphs)
+    content = (
+        f'<office:document-content {_ODT_NAMESPACES} office:version="1.2">'
+        f"<office:body><office:text>{body}</office:text></office:body>"
+        "</office:document-content>"
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as odt_zip:
+        odt_zip.writestr("mimetype", "application/vnd.oasis.opendocument.text")
+        odt_zip.writestr("content.xml", content)
+        for name, data in (parts or {}).items():
+            odt_zip.writestr(name, data)
+    return buffer.getvalue()
+
+
+def make_docx(paragraphs: list[str]) -> bytes:
+    """Build a DOCX with one paragraph per string.
+
+    Args:
+        paragraphs: Paragraph texts
+
+    Returns:
+        DOCX file content
+    """
+    document = docx.Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
@@ -0,0 +1,54 @@
+"""Admin endpoints guarded by the profiling token."""
+
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import config
+from app.services.profiling import profile_paths
+from app.services.retention import scan_storage
+
+TOKEN = "secret-token"
+
+
+@pytest.fixture
+def profile(project_root: Path, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Store a fake profile and configure the admin token."""
+    monkeypatch.setattr(config, "profiling_token", TOKEN)
+    prof_path, _ = profile_paths("job-1")
+    prof_path.parent.mkdir(parents=True)
+    prof_path.write_bytes(b"profile")
+    return "job-1"
+
+
+def test_profile_download_requires_token(client: TestClient, profile: str) -> None:
+    url = f"/api/admin/profiles/{profile}/download"
+
+    assert client.get(url).status_code == 403
+    assert client.get(url, headers={"X-Profile-Token": "wrong"}).status_code == 403
+    response = client.get(url, headers={"X-Profile-Token": TOKEN})
+    assert response.status_code == 200
+    assert response.content == b"profile"
+
+
+def test_profiles_are_retention_candidates(profile: str) -> None:
+    prof_path, _ = profile_paths(profile)
+
+    candidates, used = scan_storage()
+
+    assert [(c.kind, c.path) for c in candidates] == [("profile", prof_path)]
+    assert used == len(b"profile")
+
+
+def test_retention_sweep_requires_token(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(config, "profiling_token", TOKEN)
+
+    assert client.post("/api/admin/retention/sweep").status_code == 403
+    response = client.post(
+        "/api/admin/retention/sweep", headers={"X-Profile-Token": TOKEN}
+    )
+    assert response.status_code == 200
+    assert response.json()["sweeps"] >= 1
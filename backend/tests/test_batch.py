@@ -0,0 +1,136 @@
+"""Batch conversion of files and ZIP archives."""
+
+import io
+import zipfile
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import config
+from tests.documents import make_pdf
+
+MB = 1024 * 1024
+
+
+def _zip(members: dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def _post_zip(client: TestClient, archive: bytes) -> httpx.Response:
+    return client.post(
+        "/api/convert/batch",
+        files={"files": ("batch.zip", archive, "application/zip")},
+    )
+
+
+def _errors(response: httpx.Response) -> dict[str, str | None]:
+    return {item["filename"]: item["error"] for item in response.json()["items"]}
+
+
+def test_zip_members_are_converted_in_order(client: TestClient) -> None:
+    archive = _zip(
+        {
+            "docs/a.pdf": make_pdf(1),
+            "docs/notes.txt": b"plain text",
+            "__MACOSX/docs/._a.pdf": b"resource fork",
+            ".hidden.pdf": b"hidden",
+            "b.pdf": make_pdf(2),
+        }
+    )
+
+    response = _post_zip(client, archive)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["filename"] for item in body["items"]] == [
+        "a.pdf",
+        "notes.txt",
+        "b.pdf",
+    ]
+    assert [item["status"] for item in body["items"]] == ["DONE", "ERROR", "DONE"]
+    assert body["items"][1]["error"] == "Unsupported file type"
+    assert (body["succeeded"], body["failed"]) == (2, 1)
+
+
+def test_member_over_the_file_limit_is_an_item_error(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(config, "max_file_size_mb", 1)
+    archive = _zip({"big.pdf": b"\0" * (MB + 1), "small.pdf": make_pdf(1)})
+
+    response = _post_zip(client, archive)
+
+    assert response.status_code == 200
+    errors = _errors(response)
+    assert errors["big.pdf"] == "File too large. Maximum size: 1MB"
+    assert errors["small.pdf"] is None
+
+
+def test_members_over_the_total_limit_are_item_errors(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(config, "max_file_size_mb", 1)
+    monkeypatch.setattr(config, "batch_max_total_mb", 2)
+    padding = b"\0" * (MB * 9 // 10)
+    archive = _zip({"a.rtf": padding, "b.rtf": padding, "c.rtf": padding})
+
+    response = _post_zip(client, archive)
+
+    assert response.status_code == 200
+    errors = _errors(response)
+    assert errors["c.rtf"] == "Batch too large. Maximum size: 2MB"
+    for name in ("a.rtf", "b.rtf"):
+        assert "Batch too large" not in (errors[name] or "")
+
+
+def test_invalid_archive_is_rejected(client: TestClient) -> None:
+    response = _post_zip(client, b"not a zip archive")
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid ZIP archive"
+
+
+def test_archive_with_too_many_files_is_rejected(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(config, "batch_max_files", 2)
+    archive = _zip({f"{index}.pdf": make_pdf(1) for index in range(3)})
+
+    response = _post_zip(client, archive)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Too many files. Maximum: 2"
+
+
+def test_too_many_files_are_rejected(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(config, "batch_max_files", 2)
+    files = [
+        ("files", (f"{index}.pdf", make_pdf(1), "application/pdf"))
+        for index in range(3)
+    ]
+
+    response = client.post("/api/convert/batch", files=files)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Too many files. Maximum: 2"
+
+
+def test_unsupported_file_does_not_fail_the_batch(client: TestClient) -> None:
+    files = [
+        ("files", ("a.pdf", make_pdf(1), "application/pdf")),
+        ("files", ("b.exe", b"MZ", "application/octet-stream")),
+    ]
+
+    response = client.post("/api/convert/batch", files=files)
+
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["status"] for item in items] == ["DONE", "ERROR"]
+    assert items[1]["error"].startswith("Unsupported file type")
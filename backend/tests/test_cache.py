@@ -0,0 +1,119 @@
+"""Conversion cache keys and LRU eviction."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import config
+from app.models.dto import ConvertResponse
+from app.services import pipeline
+from app.services.cache import ConversionCache, cache_key
+from app.services.storage import image_url_to_path, save_image
+from tests.documents import make_docx
+
+
+def _response(job_id: str, images: list[str] | None = None) -> ConvertResponse:
+    return ConvertResponse(
+        id=job_id,
+        filename="doc.pdf",
+        mediawiki_text=f"Text of {job_id}",
+        images=images or [],
+    )
+
+
+def test_key_separates_options_extension_and_content() -> None:
+    key = cache_key("abc", "pdf")
+
+    assert cache_key("abc", "pdf", {}) == key
+    assert cache_key("abc", "pdf", {"pages": [(1, 2)]}) != key
+    assert cache_key("abc", "pdf", {"pages": [(1, 3)]}) != cache_key(
+        "abc", "pdf", {"pages": [(1, 2)]}
+    )
+    assert cache_key("abc", "docx") != key
+    assert cache_key("abd", "pdf") != key
+
+
+def test_hit_returns_stored_response(project_root: Path) -> None:
+    cache = ConversionCache(project_root / "cache", 1024 * 1024, 10)
+    response = _response("job-1")
+
+    cache.put("key-1", response)
+
+    assert cache.get("key-1") == response
+    assert cache.get("key-2") is None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+
+def test_least_recently_used_entry_is_evicted_by_count(project_root: Path) -> None:
+    cache = ConversionCache(project_root / "cache", 1024 * 1024, 2)
+    cache.put("key-1", _response("job-1"))
+    cache.put("key-2", _response("job-2"))
+    assert cache.get("key-1") is not None  # key-2 becomes the oldest
+
+    cache.put("key-3", _response("job-3"))
+
+    assert cache.get("key-2") is None
+    assert cache.get("key-1") is not None
+    assert cache.get("key-3") is not None
+    assert cache.stats().evictions == 1
+
+
+def test_entries_are_evicted_by_size_including_images(project_root: Path) -> None:
+    image = save_image(b"x" * 4000, "png", "img", "job-1")
+    cache = ConversionCache(project_root / "cache", 6000, 10)
+    cache.put("key-1", _response("job-1", [image]))
+
+    cache.put("key-2", _response("job-2", [image]))
+
+    stats = cache.stats()
+    assert stats.entries == 1
+    assert stats.evictions == 1
+    assert stats.bytes <= 6000
+    assert cache.get("key-2") is not None
+
+
+def test_entry_with_deleted_images_misses(project_root: Path) -> None:
+    image = save_image(b"image bytes", "png", "img", "job-1")
+    cache = ConversionCache(project_root / "cache", 1024 * 1024, 10)
+    cache.put("key-1", _response("job-1", [image]))
+
+    shutil.rmtree(image_url_to_path(image).parent)
+
+    assert cache.get("key-1") is None
+    stats = cache.stats()
+    assert (stats.misses, stats.entries, stats.bytes) == (1, 0, 0)
+
+
+def test_index_is_rebuilt_from_disk(project_root: Path) -> None:
+    directory = project_root / "cache"
+    ConversionCache(directory, 1024 * 1024, 10).put("key-1", _response("job-1"))
+
+    reopened = ConversionCache(directory, 1024 * 1024, 10)
+
+    assert reopened.get("key-1") == _response("job-1")
+
+
+def test_docx_engine_is_part_of_the_key(
+    client: TestClient, project_root: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = ConversionCache(project_root / "cache", 1024 * 1024, 10)
+    monkeypatch.setattr(pipeline, "conversion_cache", cache)
+    monkeypatch.setattr(config, "cache_enabled", True)
+    document = make_docx(["Cached paragraph"])
+
+    def convert(engine: str) -> None:
+        monkeypatch.setattr(config, "docx_engine", engine)
+        response = client.post(
+            "/api/convert", files={"file": ("doc.docx", document, "application/zip")}
+        )
+        assert response.status_code == 200
+
+    convert("stream")
+    convert("python-docx")
+    convert("stream")
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 2, 2)
@@ -0,0 +1,68 @@
+"""DOCX tables with merged cells."""
+
+import docx
+from docx.oxml.ns import qn
+
+from app.models.blocks import TableCell
+from app.services.docx_stream import table_block
+
+
+def _merged_table() -> docx.table.Table:
+    """Build a 4x3 table with horizontal, vertical and leading-grid merges.
+
+    ::
+
+        | A0 (2 columns)  | C0 |
+        | A1 (2 rows) | B1 | C1 |
+        |             | B2 (2 rows) | C2 |
+        | (gridBefore)|             | C3 |
+    """
+    table = docx.Document().add_table(rows=4, cols=3)
+    table.cell(0, 0).merge(table.cell(0, 1)).text = "A0"
+    table.cell(1, 0).merge(table.cell(2, 0)).text = "A1"
+    table.cell(2, 1).merge(table.cell(3, 1)).text = "B2"
+    for row, column in ((0, 2), (1, 1), (1, 2), (2, 2), (3, 2)):
+        table.cell(row, column).text = f"{'ABC'[column]}{row}"
+
+    # The last row starts at grid column 1: its first cell is replaced
+    # by a w:gridBefore in the row properties
+    tr = table.rows[3]._tr
+    tr.remove(tr.tc_lst[0])
+    tr_pr = tr.get_or_add_trPr()
+    tr_pr.insert(0, tr_pr.makeelement(qn("w:gridBefore"), {qn("w:val"): "1"}))
+    return table
+
+
+def _cells(row: list[str | TableCell]) -> list[tuple[str, int, int]]:
+    return [
+        (cell, 1, 1)
+        if isinstance(cell, str)
+        else (cell.text, cell.colspan, cell.rowspan)
+        for cell in row
+    ]
+
+
+def test_merged_cells_become_spans() -> None:
+    block = table_block(_merged_table()._tbl)
+
+    assert [_cells(row) for row in block.rows] == [
+        [("A0", 2, 1), ("C0", 1, 1)],
+        [("A1", 1, 2), ("B1", 1, 1), ("C1", 1, 1)],
+        [("B2", 1, 2), ("C2", 1, 1)],
+        [("C3", 1, 1)],
+    ]
+
+
+def test_merge_ends_at_the_first_row_not_continuing_it() -> None:
+    table = docx.Document().add_table(rows=3, cols=2)
+    table.cell(0, 0).merge(table.cell(1, 0)).text = "A0"
+    for row, column in ((0, 1), (1, 1), (2, 0), (2, 1)):
+        table.cell(row, column).text = f"{'AB'[column]}{row}"
+
+    block = table_block(table._tbl)
+
+    assert [_cells(row) for row in block.rows] == [
+        [("A0", 1, 2), ("B0", 1, 1)],
+        [("B1", 1, 1)],
+        [("A2", 1, 1), ("B2", 1, 1)],
+    ]
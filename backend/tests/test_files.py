@@ -0,0 +1,29 @@
+"""Downloads of converted files and images."""
+
+import io
+import zipfile
+
+from fastapi.testclient import TestClient
+
+from tests.documents import make_pdf, make_png
+
+
+def test_images_are_downloaded_as_zip(client: TestClient) -> None:
+    pdf = make_pdf(2, image=make_png(1))
+    job_id = client.post(
+        "/api/convert", files={"file": ("images.pdf", pdf, "application/pdf")}
+    ).json()["id"]
+
+    response = client.get(f"/api/files/images/{job_id}/download-all")
+
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        names = archive.namelist()
+        assert len(names) == 1
+        assert archive.read(names[0]) == make_png(1)
+
+
+def test_unknown_job_has_no_images(client: TestClient) -> None:
+    response = client.get("/api/files/images/unknown-job/download-all")
+
+    assert response.status_code == 404
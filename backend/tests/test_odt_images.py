@@ -0,0 +1,60 @@
+"""ODT picture extraction."""
+
+from pathlib import Path
+
+import pytest
+
+from app.services import extract_odt
+from tests.documents import make_odt, make_png
+
+
+def _image(href: str) -> str:
+    return f'<draw:frame><draw:image xlink:href="{href}"/></draw:frame>'
+
+
+def test_only_pictures_are_saved(project_root: Path) -> None:
+    odt = project_root / "pictures.odt"
+    odt.write_bytes(
+        make_odt(
+            [_image("Pictures/photo.JPG"), _image("./ObjectReplacements/Object 1")],
+            {
+                "Pictures/photo.JPG": make_png(1),
+                "ObjectReplacements/Object 1": b"preview",
+            },
+        )
+    )
+
+    data = extract_odt.extract_odt(odt, "job-1")
+
+    assert len(data.images) == 1
+    assert data.images[0].endswith(".jpg")
+
+
+def test_unknown_extension_is_saved_as_png(project_root: Path) -> None:
+    odt = project_root / "drawing.odt"
+    odt.write_bytes(
+        make_odt([_image("Pictures/drawing.svm")], {"Pictures/drawing.svm": b"svm"})
+    )
+
+    data = extract_odt.extract_odt(odt, "job-1")
+
+    assert len(data.images) == 1
+    assert data.images[0].endswith(".png")
+
+
+def test_failed_picture_is_skipped(
+    project_root: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def fail(*args: object) -> str:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(extract_odt, "save_image", fail)
+    odt = project_root / "failing.odt"
+    odt.write_bytes(
+        make_odt(["Before", _image("Pictures/a.png")], {"Pictures/a.png": make_png(1)})
+    )
+
+    data = extract_odt.extract_odt(odt, "job-1")
+
+    assert data.images == []
+    assert data.blocks
@@ -0,0 +1,38 @@
+"""PDF page selections outside the document."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import config
+from tests.documents import make_pdf
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_selection_past_the_end_is_a_client_error(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, workers: int
+) -> None:
+    monkeypatch.setattr(config, "pdf_parallel_workers", workers)
+    monkeypatch.setattr(config, "pdf_min_pages_per_shard", 1)
+    pdf = make_pdf(3)
+
+    response = client.post(
+        "/api/convert",
+        params={"pages": "50"},
+        files={"file": ("short.pdf", pdf, "application/pdf")},
+    )
+
+    assert response.status_code == 400
+    assert "No selected page" in response.json()["detail"]
+
+
+def test_selection_inside_the_document_converts(client: TestClient) -> None:
+    response = client.post(
+        "/api/convert",
+        params={"pages": "2-50"},
+        files={"file": ("short.pdf", make_pdf(3), "application/pdf")},
+    )
+
+    assert response.status_code == 200
+    text = response.json()["mediawiki_text"]
+    assert "Text of page 2" in text
+    assert "Text of page 1" not in text
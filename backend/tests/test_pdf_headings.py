@@ -0,0 +1,25 @@
+"""Merging of PDF titles split across lines."""
+
+from app.models.blocks import Heading, Paragraph, Run, Spacer
+from app.services.extract_pdf import _merge_consecutive_headings
+
+
+def test_merge_leaves_input_blocks_unchanged() -> None:
+    blocks = [
+        Heading(1, "Annual"),
+        Spacer(),
+        Heading(1, "report"),
+        Paragraph([Run("Body")]),
+        Heading(2, "Scope"),
+    ]
+
+    first = list(_merge_consecutive_headings(blocks))
+    second = list(_merge_consecutive_headings(blocks))
+
+    assert repr(first) == repr(second)
+    assert [repr(block) for block in first] == [
+        "Heading(1, 'Annual report')",
+        "Paragraph([Run('Body', bold=False, italic=False)])",
+        "Heading(2, 'Scope')",
+    ]
+    assert blocks[0].text == "Annual"
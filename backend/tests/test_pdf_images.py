@@ -0,0 +1,31 @@
+"""PDF image deduplication by xref."""
+
+import re
+
+from fastapi.testclient import TestClient
+
+from tests.documents import make_pdf, make_png
+
+
+def _sample(metrics: str, name: str) -> float:
+    """Return the value of a metric sample for the pdf format (0 if absent)."""
+    match = re.search(rf'^{name}{{format="pdf"}} (\S+)$', metrics, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_xref_memo_savings_reach_metrics(client: TestClient) -> None:
+    before = client.get("/api/metrics").text
+    image = make_png(1)
+    pdf = make_pdf(4, image=image)
+
+    response = client.post(
+        "/api/convert", files={"file": ("shared.pdf", pdf, "application/pdf")}
+    )
+
+    assert response.status_code == 200
+    assert len(set(response.json()["images"])) == 1
+    after = client.get("/api/metrics").text
+    writes = "conversion_image_writes_saved_total"
+    saved_bytes = "conversion_image_bytes_saved_total"
+    assert _sample(after, writes) - _sample(before, writes) == 3
+    assert _sample(after, saved_bytes) - _sample(before, saved_bytes) > 0
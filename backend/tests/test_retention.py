@@ -0,0 +1,58 @@
+"""Retention sweeps of job images, outputs and profiles."""
+
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from app.services import retention
+from app.services.pipeline import active_jobs
+from app.services.retention import RetentionManager
+from app.services.storage import image_url_to_path, save_image
+
+
+def _age(path: Path, hours: float) -> None:
+    mtime = time.time() - hours * 3600
+    os.utime(path, (mtime, mtime))
+
+
+def test_running_conversion_keeps_its_images(
+    project_root: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    running = image_url_to_path(save_image(b"running", "png", "img", "job-1")).parent
+    done = image_url_to_path(save_image(b"done", "png", "img", "job-2")).parent
+    _age(running, 2)
+    _age(done, 2)
+    monkeypatch.setattr(retention, "active_jobs", active_jobs | {"job-1"})
+    manager = RetentionManager(1, 0, 600, 50)
+
+    stats = asyncio.run(manager.sweep())
+
+    assert stats.last_jobs_removed == 1
+    assert running.is_dir()
+    assert not done.exists()
+
+
+def test_failed_sweep_is_logged(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    def fail() -> None:
+        raise OSError("disk unavailable")
+
+    async def run_once() -> None:
+        task = asyncio.create_task(manager._scheduler())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    monkeypatch.setattr(retention, "scan_storage", fail)
+    manager = RetentionManager(1, 0, 600, 50)
+
+    with caplog.at_level(logging.ERROR, logger="app.services.retention"):
+        asyncio.run(run_once())
+
+    assert "Retention sweep failed" in caplog.text
+    assert "disk unavailable" in caplog.text
@@ -0,0 +1,90 @@
+"""Request body size limits of the upload endpoints."""
+
+from collections.abc import Iterator
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.limits import UploadSizeLimitMiddleware
+from app.main import app
+
+LIMIT = 1000
+
+_BOUNDARY = "limit-test"
+
+_HEADERS = {"content-type": f"multipart/form-data; boundary={_BOUNDARY}"}
+
+
+def _multipart(size: int) -> bytes:
+    return (
+        (
+            f"--{_BOUNDARY}\r\n"
+            'Content-Disposition: form-data; name="file"; filename="big.pdf"\r\n'
+            "Content-Type: application/pdf\r\n\r\n"
+        ).encode()
+        + b"x" * size
+        + f"\r\n--{_BOUNDARY}--\r\n".encode()
+    )
+
+
+def _chunked(body: bytes, chunk_size: int = 256) -> Iterator[bytes]:
+    for start in range(0, len(body), chunk_size):
+        yield body[start : start + chunk_size]
+
+
+@pytest.fixture
+def limited_client(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> TestClient:
+    """Client of the application with a small limit on /api/convert."""
+    limits = next(
+        middleware.kwargs["limits"]
+        for middleware in app.user_middleware
+        if middleware.cls is UploadSizeLimitMiddleware
+    )
+    monkeypatch.setitem(limits, "/api/convert", LIMIT)
+    return client
+
+
+def test_oversized_content_length_is_rejected(limited_client: TestClient) -> None:
+    response = limited_client.post(
+        "/api/convert", content=_multipart(5 * LIMIT), headers=_HEADERS
+    )
+
+    assert response.status_code == 413
+    assert response.json()["detail"].startswith("File too large")
+
+
+def test_oversized_chunked_body_is_rejected(limited_client: TestClient) -> None:
+    response = limited_client.post(
+        "/api/convert", content=_chunked(_multipart(5 * LIMIT)), headers=_HEADERS
+    )
+
+    assert "content-length" not in response.request.headers
+    assert response.status_code == 413
+    assert response.json()["detail"].startswith("File too large")
+
+
+def test_small_chunked_body_reaches_the_app(limited_client: TestClient) -> None:
+    response = limited_client.post(
+        "/api/convert", content=_chunked(_multipart(10)), headers=_HEADERS
+    )
+
+    # Not a PDF: rejected by the converter, not by the size limit
+    assert response.status_code != 413
+
+
+def test_app_failing_on_the_cut_off_body_still_gets_413() -> None:
+    raw_app = FastAPI()
+
+    @raw_app.post("/raw")
+    async def raw(request: Request) -> dict[str, int]:
+        return {"size": len(await request.body())}
+
+    raw_app.add_middleware(UploadSizeLimitMiddleware, limits={"/raw": LIMIT})
+
+    with TestClient(raw_app) as raw_client:
+        response = raw_client.post(
+            "/raw", content=_chunked(b"x" * 5 * LIMIT), headers=_HEADERS
+        )
+
+    assert response.status_code == 413